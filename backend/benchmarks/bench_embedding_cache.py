@@ -0,0 +1,74 @@
+# backend/benchmarks/bench_embedding_cache.py
+#
+# Skill-match latency with and without the persistent embedding cache, and a
+# parity check that cached embeddings equal freshly encoded ones.
+#
+#   python backend/benchmarks/bench_embedding_cache.py --jds 200
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.embedding_cache import EmbeddingCache
+from utils.matcher import MODEL_NAME, encode
+
+SKILLS = [
+    "Python", "PyTorch", "TensorFlow", "AWS", "GCP", "Docker", "Kubernetes", "NLP",
+    "SQL", "Spark", "Airflow", "MLOps", "Computer Vision", "LLM fine-tuning", "Go",
+    "React", "TypeScript", "PostgreSQL", "Kafka", "Terraform",
+]
+RESUME = (
+    "Machine learning engineer with 6 years of experience building NLP models in "
+    "PyTorch and deploying them on AWS with Docker and Kubernetes."
+)
+
+
+def skill_match(encode_fn, skills) -> np.ndarray:
+    embeddings = encode_fn([RESUME] + skills)
+    return embeddings[1:] @ embeddings[0]
+
+
+def run(encode_fn, jds) -> float:
+    start = time.perf_counter()
+    for skills in jds:
+        skill_match(encode_fn, skills)
+    return (time.perf_counter() - start) / len(jds) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the embedding cache")
+    parser.add_argument("--jds", type=int, default=200)
+    parser.add_argument("--skills-per-jd", type=int, default=8)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    jds = [rng.sample(SKILLS, args.skills_per_jd) for _ in range(args.jds)]
+    cache = EmbeddingCache(MODEL_NAME, encode, directory=tempfile.mkdtemp())
+
+    encode([RESUME])  # load the model outside the timings
+    uncached_ms = run(encode, jds)
+    cached_ms = run(cache.encode, jds)
+    warm_ms = run(cache.encode, jds)
+
+    diff = max(
+        float(np.abs(skill_match(encode, skills) - skill_match(cache.encode, skills)).max())
+        for skills in jds[:20]
+    )
+    print(f"model: {MODEL_NAME}, {args.jds} JDs x {args.skills_per_jd} skills")
+    print(f"  no cache        {uncached_ms:8.3f} ms/JD")
+    print(f"  cache (cold)    {cached_ms:8.3f} ms/JD")
+    print(f"  cache (warm)    {warm_ms:8.3f} ms/JD")
+    print(f"  stats           {cache.stats()}")
+    print(f"  max |similarity diff| vs uncached: {diff:.6f}")
+    sys.exit(1 if diff > 1e-4 else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# backend/benchmarks/bench_experience_timeline.py
+#
+# Latency and accuracy of the local experience timeline on synthetic resumes
+# with known total tenure (overlapping roles, year-only ranges, "Present",
+# dated education that must not count).
+#
+#   python backend/benchmarks/bench_experience_timeline.py --resumes 500
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.experience_timeline import (
+    TIMELINE_MIN_CONFIDENCE,
+    resume_timeline,
+    timeline_years,
+)
+from utils.section_segmenter import segment_text
+
+TODAY = date(2026, 6, 15)
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+def make_resume(rng: random.Random) -> tuple:
+    """
+    Resume text and its true total months (union of the roles)
+    """
+    lines = ["Alex Doe", "alex@example.com", "", "EXPERIENCE"]
+    covered = set()
+    cursor = TODAY.year * 12 + TODAY.month - 1 - rng.randint(0, 6)
+    for i in range(rng.randint(1, 5)):
+        length = rng.randint(6, 48)
+        end, start = cursor, cursor - length + 1
+        present = i == 0 and rng.random() < 0.5
+        if present:
+            end = TODAY.year * 12 + TODAY.month - 1
+        if rng.random() < 0.7:
+            dates = f"{MONTHS[start % 12]} {start // 12} – " + (
+                "Present" if present else f"{MONTHS[end % 12]} {end // 12}"
+            )
+        else:
+            dates = f"{start % 12 + 1:02d}/{start // 12} - " + (
+                "Present" if present else f"{end % 12 + 1:02d}/{end // 12}"
+            )
+        covered.update(range(start, end + 1))
+        lines += [f"Engineer {i}, Company {i} | {dates}", "- Built services in Python"]
+        # Some roles overlap the next one
+        cursor = start - rng.randint(-6, 12)
+    lines += ["", "EDUCATION", "BSc Computer Science, 2008 - 2012"]
+    return "\n".join(lines), len(covered)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the experience timeline")
+    parser.add_argument("--resumes", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    resumes = [make_resume(rng) for _ in range(args.resumes)]
+    segmented = [(segment_text(text), text, months) for text, months in resumes]
+
+    start = time.perf_counter()
+    timelines = [resume_timeline(sections, text, TODAY) for sections, text, _ in segmented]
+    per_resume_us = (time.perf_counter() - start) / len(segmented) * 1e6
+
+    errors = [abs(t["total_months"] - months) for t, (_, _, months) in zip(timelines, segmented)]
+    confident = sum(t["confidence"] >= TIMELINE_MIN_CONFIDENCE for t in timelines)
+    exact_years = sum(
+        timeline_years(t) == (months + 6) // 12
+        for t, (_, _, months) in zip(timelines, segmented)
+    )
+    print(f"{len(segmented)} resumes")
+    print(f"  timeline          {per_resume_us:8.1f} us/resume (after segmentation)")
+    print(f"  max month error   {max(errors)}")
+    print(f"  whole years exact {exact_years}/{len(segmented)}")
+    print(f"  confident         {confident}/{len(segmented)}")
+    sys.exit(0 if max(errors) == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
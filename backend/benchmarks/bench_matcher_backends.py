@@ -0,0 +1,112 @@
+# backend/benchmarks/bench_matcher_backends.py
+#
+# Similarity parity and throughput of the torch vs ONNX skill-matcher backends.
+# Exits non-zero when ONNX similarities drift more than --tolerance from torch.
+#
+#   python backend/benchmarks/bench_matcher_backends.py --threads 8
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sentence_transformers import SentenceTransformer
+
+from utils.dynamic_batcher import DynamicBatcher
+from utils.onnx_encoder import OnnxSentenceEncoder
+
+RESUMES = [
+    "Machine learning engineer with 6 years of experience building NLP models in "
+    "PyTorch and deploying them on AWS with Docker and Kubernetes.",
+    "Frontend developer focused on React, TypeScript and design systems.",
+    "Data scientist: SQL, pandas, scikit-learn, A/B testing and forecasting.",
+    "Computer vision researcher working on object detection, SLAM and OpenCV.",
+]
+SKILLS = [
+    "Python",
+    "PyTorch",
+    "TensorFlow",
+    "AWS",
+    "Docker",
+    "Kubernetes",
+    "NLP",
+    "Computer Vision",
+    "SQL",
+    "React",
+    "MLOps",
+    "Fine-tuning LLMs",
+]
+THRESHOLD = 0.4  # calculate_skill_match's matched/missing cut-off
+
+
+def similarities(encode, resume: str) -> np.ndarray:
+    embeddings = encode([resume] + SKILLS)
+    return embeddings[1:] @ embeddings[0]
+
+
+def throughput(encode, texts, threads: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda t: encode([t]), texts))
+    return len(texts) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare matcher backends")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=256)
+    parser.add_argument("--tolerance", type=float, default=0.05)
+    args = parser.parse_args()
+
+    st_model = SentenceTransformer(args.model, device="cpu")
+
+    def torch_encode(texts):
+        return st_model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+
+    backends = {
+        "torch": torch_encode,
+        "onnx-fp32": OnnxSentenceEncoder(args.model, quantize=False).encode,
+        "onnx-int8": OnnxSentenceEncoder(args.model).encode,
+    }
+
+    # --- Parity against torch ---
+    print("parity vs torch (cosine similarity)")
+    failed = False
+    for name, encode in backends.items():
+        if name == "torch":
+            continue
+        diffs, flips = [], 0
+        for resume in RESUMES:
+            reference = similarities(torch_encode, resume)
+            candidate = similarities(encode, resume)
+            diffs.append(np.abs(reference - candidate).max())
+            flips += int(((reference > THRESHOLD) != (candidate > THRESHOLD)).sum())
+        max_diff = float(max(diffs))
+        failed |= max_diff > args.tolerance
+        print(f"  {name:<10} max |diff| = {max_diff:.4f}   threshold flips = {flips}")
+
+    # --- Throughput: one text per request from concurrent callers ---
+    texts = [f"{RESUMES[i % len(RESUMES)]} #{i}" for i in range(args.requests)]
+    print(
+        f"\nthroughput ({args.requests} single-text requests, {args.threads} threads)"
+    )
+    for name, encode in backends.items():
+        batcher = DynamicBatcher(encode)
+        unbatched = throughput(encode, texts, args.threads)
+        batched = throughput(batcher.encode, texts, args.threads)
+        print(
+            f"  {name:<10} {unbatched:8.1f} texts/s unbatched"
+            f"   {batched:8.1f} texts/s dynamic batching"
+        )
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# backend/benchmarks/bench_pdf_extraction.py
+#
+# Compare PDF text extraction backends on generated multi-page PDFs.
+#
+#   python backend/benchmarks/bench_pdf_extraction.py --pages 1 10 50 200
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # PyMuPDF
+import pdfplumber
+
+from utils.llm_resume_parser import MAX_RESUME_CHARS
+from utils import pdf_parser
+from utils.pdf_parser import PDF_BACKENDS, extract_text_from_pdf
+
+LINE = "Developed and deployed machine learning pipelines with Python, PyTorch and AWS."
+
+
+def make_pdf(path: str, pages: int) -> None:
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        body = "\n".join(f"{i}.{j} {LINE}" for j in range(45))
+        page.insert_textbox(fitz.Rect(36, 36, 576, 806), body, fontsize=8)
+    doc.save(path)
+    doc.close()
+
+
+def legacy_extract(pdf_path: str) -> str:
+    # The original implementation: pdfplumber with repeated string concatenation
+    text = ""
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages:
+            text += page.extract_text() or ""
+    return text.strip()
+
+
+def timeit(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare PDF extraction backends")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # Allow the process pool for every backend so the parallel rows compare
+    pdf_parser.PDF_PARALLEL_BACKENDS = list(PDF_BACKENDS)
+
+    cases = {"legacy (pdfplumber +=)": lambda path: legacy_extract(path)}
+    for backend in PDF_BACKENDS:
+        cases[f"{backend}"] = lambda path, b=backend: extract_text_from_pdf(
+            path, backend=b, parallel=False
+        )
+        cases[f"{backend} parallel"] = lambda path, b=backend: extract_text_from_pdf(
+            path, backend=b
+        )
+        cases[f"{backend} budget={MAX_RESUME_CHARS}"] = (
+            lambda path, b=backend: extract_text_from_pdf(
+                path, max_chars=MAX_RESUME_CHARS, backend=b
+            )
+        )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'case':<32}" + "".join(f"{p:>10}p" for p in args.pages))
+        paths = {}
+        for pages in args.pages:
+            paths[pages] = os.path.join(tmp, f"{pages}.pdf")
+            make_pdf(paths[pages], pages)
+
+        for name, fn in cases.items():
+            row = [timeit(lambda: fn(paths[p]), args.repeat) for p in args.pages]
+            print(f"{name:<32}" + "".join(f"{ms:>9.1f}ms" for ms in row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# backend/benchmarks/bench_prompt_tokens.py
+#
+# Estimated input tokens per call site: the previous prompt construction
+# (indented JSON, character slicing, indented templates) vs prompt_builder.
+#
+#   python backend/benchmarks/bench_prompt_tokens.py
+
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import bullet_rewriter, llm_jd_parser, llm_matcher, llm_resume_parser
+from utils.prompt_builder import estimate_tokens
+
+RESUME_TEXT = (
+    "Jane Doe\nSenior Machine Learning Engineer\n\n"
+    "Experience\n"
+    + "Acme Corp (2019-2024): built recommendation models in PyTorch, served on AWS "
+    "with Docker and Kubernetes; cut inference latency by 40%.\n" * 120
+    + "\nEducation\nBSc Computer Engineering\n"
+)
+
+JD_TEXT = (
+    "Machine Learning Engineer\n\nResponsibilities\n"
+    + "Design, train and deploy NLP and recommendation models at scale.\n" * 60
+    + "\nRequirements\n5+ years of Python, PyTorch, AWS and MLOps experience.\n"
+)
+
+RESUME_DATA = {
+    "name": "Jane Doe",
+    "job_title": "Senior Machine Learning Engineer",
+    "years_of_experience": 8,
+    "education": ["BSc Computer Engineering"],
+    "technical_skills": {
+        "languages": ["Python", "SQL"],
+        "ml_frameworks": ["PyTorch", "TensorFlow"],
+        "cloud": ["AWS"],
+        "mlops": ["Docker", "Kubernetes"],
+        "databases": [],
+        "tools": [],
+    },
+    "key_projects_or_achievements": [
+        "Built a recommendation platform serving 20M users",
+        "Cut model inference latency by 40%",
+        "Led a team of 5 engineers on LLM fine-tuning",
+    ],
+}
+
+JD_DATA = {
+    "job_title": "Machine Learning Engineer",
+    "required_years": 5,
+    "required_education": [],
+    "required_skills": {
+        "languages": ["Python"],
+        "ml_frameworks": ["PyTorch"],
+        "cloud": ["AWS"],
+        "mlops": ["MLOps"],
+        "nlp": ["NLP"],
+        "cv": [],
+    },
+    "nice_to_have_skills": ["Kubernetes"],
+    "key_responsibilities": ["Design, train and deploy NLP models at scale"],
+}
+
+
+def legacy_prompts() -> dict:
+    # The same templates filled the old way: source indentation kept,
+    # character slicing, indented JSON
+    return {
+        "resume_parser": llm_resume_parser.PROMPT_TEMPLATE.format(
+            resume_text=RESUME_TEXT[:30000]
+        ),
+        "jd_parser": llm_jd_parser.PROMPT_TEMPLATE.format(jd_text=JD_TEXT[:10000]),
+        "matcher": llm_matcher.PROMPT_TEMPLATE.format(
+            resume=json.dumps(RESUME_DATA, indent=2), job=json.dumps(JD_DATA, indent=2)
+        ),
+        "bullet_rewriter": bullet_rewriter.PROMPT_TEMPLATE.format(
+            bullet="Worked on models",
+            job_description=JD_TEXT[:500],
+            resume_context=RESUME_TEXT[:500],
+        ),
+    }
+
+
+def current_prompts() -> dict:
+    return {
+        "resume_parser": llm_resume_parser._build_prompt(RESUME_TEXT),
+        "jd_parser": llm_jd_parser._build_prompt(JD_TEXT),
+        "matcher": llm_matcher._build_prompt(RESUME_DATA, JD_DATA),
+        "bullet_rewriter": bullet_rewriter._build_prompt(
+            "Worked on models", JD_TEXT, RESUME_TEXT
+        ),
+    }
+
+
+def main():
+    legacy, current = legacy_prompts(), current_prompts()
+    print(f"{'call site':<16} {'legacy tok':>10} {'current tok':>11} {'saved':>7}")
+    for site in current:
+        before, after = estimate_tokens(legacy[site]), estimate_tokens(current[site])
+        print(f"{site:<16} {before:>10} {after:>11} {1 - after / before:>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
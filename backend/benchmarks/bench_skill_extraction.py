@@ -0,0 +1,120 @@
+# backend/benchmarks/bench_skill_extraction.py
+#
+# Compiled single-pass skill matching vs the previous per-skill regex loop,
+# on the shipped taxonomy and on synthetic taxonomies of growing size.
+#
+#   python backend/benchmarks/bench_skill_extraction.py --sizes 16 1000 5000
+
+import argparse
+import os
+import random
+import re
+import string
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.pdf_parser import SKILL_ALIASES, extract_skills
+from utils.skill_matcher import SkillMatcher
+
+# The previous pdf_parser.extract_skills patterns, kept here for comparison
+LEGACY_PATTERNS = {
+    "Python": r"python",
+    "TensorFlow": r"tensor\s*flow|tf",
+    "PyTorch": r"py\s*torch|torch",
+    "AWS": r"aws|amazon\s*web\s*services",
+    "Azure": r"azure|azure\s*cloud",
+    "GCP": r"gcp|google\s*cloud",
+    "NLP": r"nlp|natural\s*language|langchain|llm|large\s*language\s*model",
+    "MLOps": r"mlops|ci/cd|docker|kubernetes|model\s*deployment",
+    "SQL": r"sql|structured\s-?query\s-?language",
+    "Machine Learning": r"machine\s*learning|ml|ai",
+    "Deep Learning": r"deep\s*learning|neural\s*network|cnn|gan",
+    "Computer Vision": r"computer\s*vision|cv|opencv|object\s*detection|slam",
+    "Fine-tuning": r"fine\s*tuning|lora|qlora|sft|adapter",
+    "Recommendation System": r"recommendation|recommender|personalization",
+    "Anomaly Detection": r"anomaly\s*detection|outlier\s*detection",
+}
+
+RESUME = (
+    "Senior Machine Learning Engineer with 8 years of experience. Built a "
+    "recommendation platform serving 20M users; trained PyTorch and TensorFlow "
+    "models, deployed with Docker and Kubernetes on AWS. Led an NLP team working "
+    "on large language models, LoRA fine-tuning and retrieval. Maintained "
+    "PostgreSQL data pipelines and a gRPC API gateway. Hobbies: painting, "
+    "mountaineering, and contributing to open-source HTML/CSS tooling.\n"
+) * 20
+
+# Non-technical text: the old substring patterns find "ai" in "email",
+# "tf" in "platform" and "gan" in "organized"
+NON_TECHNICAL = (
+    "Retail store manager. Organized daily staff training, handled email "
+    "campaigns on our loyalty platform and maintained a clean sales floor."
+)
+
+
+def legacy_extract(text: str, patterns: dict) -> list:
+    text_lower = re.sub(r"\s+", " ", text.lower().replace("\n", " "))
+    return list(
+        {skill for skill, pattern in patterns.items() if re.search(pattern, text_lower)}
+    )
+
+
+def synthetic_taxonomy(size: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    taxonomy = {}
+    while len(taxonomy) < size:
+        word = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10)))
+        taxonomy[word.title()] = [word, word + " framework"]
+    return taxonomy
+
+
+def timeit(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark skill extraction")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    legacy = sorted(legacy_extract(RESUME, LEGACY_PATTERNS))
+    compiled = sorted(extract_skills(RESUME))
+    print("shipped taxonomy")
+    print(f"  legacy   : {legacy}")
+    print(f"  compiled : {compiled}")
+    print(
+        f"  only legacy (substring false positives): {sorted(set(legacy) - set(compiled))}"
+    )
+    print("non-technical text")
+    print(f"  legacy   : {sorted(legacy_extract(NON_TECHNICAL, LEGACY_PATTERNS))}")
+    print(f"  compiled : {sorted(extract_skills(NON_TECHNICAL))}")
+    print(
+        f"  legacy {timeit(lambda: legacy_extract(RESUME, LEGACY_PATTERNS), args.repeat):.2f}ms"
+        f"   compiled {timeit(lambda: extract_skills(RESUME), args.repeat):.2f}ms"
+        f"   ({len(RESUME)} chars)"
+    )
+
+    print(f"\n{'skills':>8} {'legacy ms':>10} {'compiled ms':>12} {'build ms':>9}")
+    for size in args.sizes:
+        taxonomy = {**synthetic_taxonomy(size - len(SKILL_ALIASES)), **SKILL_ALIASES}
+        patterns = {
+            skill: "|".join(re.escape(a) for a in aliases)
+            for skill, aliases in taxonomy.items()
+        }
+        start = time.perf_counter()
+        matcher = SkillMatcher(taxonomy)
+        build_ms = (time.perf_counter() - start) * 1000
+        repeat = max(1, args.repeat // max(1, size // 1000))
+        legacy_ms = timeit(lambda: legacy_extract(RESUME, patterns), repeat)
+        compiled_ms = timeit(lambda: matcher.find(RESUME), args.repeat)
+        print(f"{size:>8} {legacy_ms:>10.2f} {compiled_ms:>12.2f} {build_ms:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# backend/benchmarks/calibrate_cascade.py
+#
+# Calibrates the match cascade (utils/match_cascade.py) on a labelled set of
+# resume/JD texts (data/cascade_labelled.json: id, resume_text, jd_text,
+# fit). Reports how often each tier would be used with the configured
+# uncertainty band, how often local decisions agree with the labels and with
+# the LLM tier, and the same for a sweep of alternative bands.
+#
+# The LLM tier uses Gemini; set LLM_BACKEND=fake to exercise the tool
+# offline (its canned answers make LLM agreement meaningless), or pass
+# --no-llm to compare the local tier with the labels only.
+#
+#   python backend/benchmarks/calibrate_cascade.py
+#   python backend/benchmarks/calibrate_cascade.py --data my_set.json --no-llm
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.match_cascade import CASCADE_HIGH, CASCADE_LOW, local_match
+from utils.score_calculator import score_match
+
+DATA_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "cascade_labelled.json"
+)
+
+
+def llm_score(resume_text: str, jd_text: str):
+    from utils.llm_jd_parser import parse_jd_with_llm
+    from utils.llm_matcher import run_llm_match
+    from utils.llm_resume_parser import parse_resume_with_llm
+
+    resume, jd = parse_resume_with_llm(resume_text), parse_jd_with_llm(jd_text)
+    if not resume["success"] or not jd["success"]:
+        return None
+    match = run_llm_match(resume["data"], jd["data"])
+    feedback = match["feedback"] if match["success"] else None
+    return score_match(resume["data"], jd["data"], feedback)["overall_score"]
+
+
+def band_stats(cases: list, low: int, high: int) -> dict:
+    """
+    Tier usage and label agreement of local decisions for one band
+    """
+    local = [
+        c for c in cases
+        if c["local_ok"] and (c["local_score"] <= low or c["local_score"] >= high)
+    ]
+    correct = sum((c["local_score"] >= high) == c["fit"] for c in local)
+    with_llm = [c for c in local if c["llm_score"] is not None]
+    agree_llm = sum(
+        (c["local_score"] >= high) == (c["llm_score"] >= c["fit_score"]) for c in with_llm
+    )
+    return {
+        "local": len(local),
+        "llm": len(cases) - len(local),
+        "label_agreement": correct / len(local) if local else None,
+        "llm_agreement": agree_llm / len(with_llm) if with_llm else None,
+    }
+
+
+def _pct(value) -> str:
+    return "   -" if value is None else f"{100 * value:3.0f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate the match cascade")
+    parser.add_argument("--data", default=DATA_PATH, help="Labelled JSON set")
+    parser.add_argument("--no-llm", action="store_true", help="Skip the LLM tier")
+    parser.add_argument(
+        "--fit-score", type=int, default=60, help="LLM-tier score counted as a fit"
+    )
+    args = parser.parse_args()
+
+    with open(args.data) as f:
+        labelled = json.load(f)
+
+    cases = []
+    print(f"{'case':<26} {'fit':>5} {'local':>6} {'tier':>6} {'llm':>5}  reason")
+    for item in labelled:
+        local = local_match(item["resume_text"], item["jd_text"])
+        llm = None if args.no_llm else llm_score(item["resume_text"], item["jd_text"])
+        cases.append(
+            {
+                "fit": bool(item["fit"]),
+                "local_score": local["overall_score"],
+                "local_ok": local["decidable"],
+                "llm_score": llm,
+                "fit_score": args.fit_score,
+            }
+        )
+        print(
+            f"{item['id']:<26} {str(bool(item['fit'])):>5} {local['overall_score']:>6} "
+            f"{local['tier']:>6} {'-' if llm is None else llm:>5}  {local['reason']}"
+        )
+
+    stats = band_stats(cases, CASCADE_LOW, CASCADE_HIGH)
+    print(f"\nconfigured band [{CASCADE_LOW}, {CASCADE_HIGH}] on {len(cases)} cases")
+    print(f"  local tier       {stats['local']} ({_pct(stats['local'] / len(cases)).strip()})")
+    print(f"  llm tier         {stats['llm']} ({_pct(stats['llm'] / len(cases)).strip()})")
+    print(f"  local vs labels  {_pct(stats['label_agreement']).strip()}")
+    print(f"  local vs llm     {_pct(stats['llm_agreement']).strip()}")
+    with_llm = [c for c in cases if c["llm_score"] is not None]
+    if with_llm:
+        llm_correct = sum((c["llm_score"] >= args.fit_score) == c["fit"] for c in with_llm)
+        gap = sum(abs(c["local_score"] - c["llm_score"]) for c in with_llm) / len(with_llm)
+        print(f"  llm vs labels    {_pct(llm_correct / len(with_llm)).strip()}")
+        print(f"  mean |local - llm| score {gap:.1f}")
+
+    print("\nband sweep (local share / local vs labels / local vs llm)")
+    print("        " + "".join(f"high={high:<14}" for high in (60, 70, 80, 90)))
+    for low in (20, 30, 40, 50):
+        row = []
+        for high in (60, 70, 80, 90):
+            s = band_stats(cases, low, high)
+            row.append(
+                f"{_pct(s['local'] / len(cases))} {_pct(s['label_agreement'])} "
+                f"{_pct(s['llm_agreement'])}  "
+            )
+        print(f"low={low:<4}" + "".join(row))
+
+
+if __name__ == "__main__":
+    main()
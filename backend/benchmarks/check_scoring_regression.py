@@ -0,0 +1,75 @@
+# backend/benchmarks/check_scoring_regression.py
+#
+# Scores the fixed corpus in data/scoring_corpus.json and fails (exit 1) if
+# any score differs from its recorded expected_score, or if the single-pair,
+# pairwise-batch and matrix APIs disagree. Also times score_matrix.
+#
+#   python backend/benchmarks/check_scoring_regression.py
+#   python backend/benchmarks/check_scoring_regression.py --update   # re-record
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.score_calculator import score_match, score_matrix, score_pairs
+
+CORPUS_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "scoring_corpus.json"
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check structured scoring")
+    parser.add_argument("--update", action="store_true", help="Record current scores")
+    parser.add_argument("--matrix-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    with open(CORPUS_PATH) as f:
+        corpus = json.load(f)
+    resumes = [case["resume"] for case in corpus]
+    jds = [case["jd"] for case in corpus]
+    feedbacks = [case["feedback"] for case in corpus]
+
+    batch = score_pairs(resumes, jds, feedbacks)
+    failures = []
+    for case, score in zip(corpus, batch):
+        single = score_match(case["resume"], case["jd"], case["feedback"])
+        if single["overall_score"] != score:
+            failures.append(f"{case['id']}: single {single['overall_score']} != batch {score}")
+        if not args.update and case["expected_score"] != score:
+            failures.append(f"{case['id']}: expected {case['expected_score']}, got {score}")
+        print(f"{case['id']:<28} {int(score):>4}  {single['breakdown']}")
+
+    # Without feedback, the matrix diagonal must equal the pairwise scores
+    diagonal = score_matrix(resumes, jds).diagonal()
+    no_feedback = score_pairs(resumes, jds)
+    if (diagonal != no_feedback).any():
+        failures.append("score_matrix diagonal differs from score_pairs")
+
+    if args.update:
+        for case, score in zip(corpus, batch):
+            case["expected_score"] = int(score)
+        with open(CORPUS_PATH, "w") as f:
+            json.dump(corpus, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"recorded {len(corpus)} scores in {CORPUS_PATH}")
+
+    n = args.matrix_size
+    many_resumes = (resumes * (n // len(resumes) + 1))[:n]
+    many_jds = (jds * (n // len(jds) + 1))[:n]
+    start = time.perf_counter()
+    score_matrix(many_resumes, many_jds)
+    elapsed = time.perf_counter() - start
+    print(f"\nscore_matrix {n}x{n}: {elapsed * 1000:.0f}ms ({n * n / elapsed:,.0f} pairs/s)")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
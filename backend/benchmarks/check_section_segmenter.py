@@ -0,0 +1,80 @@
+# backend/benchmarks/check_section_segmenter.py
+#
+# Segments fixed resumes (lines with their heading styling, as read from a
+# PDF) and fails (exit 1) if a line lands in the wrong section: styled role
+# lines that mention a heading word ("Community Manager", "Languages
+# Engineer") must stay in the experience section, and real headings must
+# still be found.
+#
+#   python backend/benchmarks/check_section_segmenter.py
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.experience_timeline import resume_timeline
+from utils.section_segmenter import heading_section, segment_lines
+
+# (line, styled) -> expected section (None: not a heading)
+HEADINGS = [
+    (("Community Manager, Acme 2019 - 2022", True), None),
+    (("Languages Engineer, Duolingo 2016-2019", True), None),
+    (("Skills Lead, Acme", True), None),
+    (("Education Technology Consultant 2018 - 2020", True), None),
+    (("Senior Data Scientist at Projects Inc.", True), None),
+    (("Experience", False), "experience"),
+    (("WORK EXPERIENCE", True), "experience"),
+    (("Experience (2015 - present)", True), "experience"),
+    (("Technical Skills:", True), "skills"),
+    (("Skills & Tools", True), "skills"),
+    (("Projects — selected", True), "projects"),
+    (("Hobbies and Interests", False), "interests"),
+]
+
+# Bold role lines under one Experience heading
+RESUME = [
+    ("Jane Doe", True),
+    ("jane@example.com", False),
+    ("Experience", True),
+    ("Community Manager, Acme 2019 - 2022", True),
+    ("- Grew the user community to 40k members", False),
+    ("Languages Engineer, Duolingo 2016-2019", True),
+    ("- Built Python pipelines for course content", False),
+    ("Education", True),
+    ("BSc Linguistics, 2012 - 2016", False),
+]
+RESUME_EXPECTED = {
+    "experience": ["Community Manager, Acme", "Languages Engineer, Duolingo"],
+    "education": ["BSc Linguistics"],
+}
+RESUME_MONTHS = 6 * 12
+
+
+def main():
+    failures = []
+    for (line, styled), expected in HEADINGS:
+        found = heading_section(line, styled)
+        print(f"{line!r:<50} styled={str(styled):<5} -> {found}")
+        if found != expected:
+            failures.append(f"{line!r}: expected {expected}, got {found}")
+
+    sections = segment_lines(RESUME)
+    print(f"\nsections: {sorted(sections)}")
+    for name, snippets in RESUME_EXPECTED.items():
+        for snippet in snippets:
+            if snippet not in sections.get(name, ""):
+                failures.append(f"{snippet!r} missing from section {name}")
+    text = "\n".join(line for line, _ in RESUME)
+    months = resume_timeline(sections, text)["total_months"]
+    print(f"experience months: {months}")
+    if months != RESUME_MONTHS:
+        failures.append(f"timeline: expected {RESUME_MONTHS} months, got {months}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# backend/benchmarks/check_startup_budget.py
+#
+# Fails (exit 1) when importing the backend app exceeds the startup budget:
+# import time, resident memory, or heavy ML libraries loaded at import.
+#
+#   python backend/benchmarks/check_startup_budget.py --max-seconds 3 --max-rss-mb 250
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# These must only be imported lazily, on first use or during warm-up
+HEAVY_MODULES = [
+    "torch",
+    "spacy",
+    "sentence_transformers",
+    "onnxruntime",
+    "google.generativeai",
+]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {backend_dir!r})
+import main
+elapsed = time.perf_counter() - start
+rss_kb = 0
+with open("/proc/self/status") as f:
+    for line in f:
+        if line.startswith("VmRSS:"):
+            rss_kb = int(line.split()[1])
+print(json.dumps({{
+    "import_seconds": elapsed,
+    "rss_mb": rss_kb / 1024,
+    "heavy_modules": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def measure() -> dict:
+    code = PROBE.format(backend_dir=BACKEND_DIR, heavy=HEAVY_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check backend startup budget")
+    parser.add_argument("--max-seconds", type=float, default=3.0)
+    parser.add_argument("--max-rss-mb", type=float, default=250.0)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    # Best of N to keep filesystem-cache noise out of the measurement
+    results = [measure() for _ in range(args.runs)]
+    import_seconds = min(r["import_seconds"] for r in results)
+    rss_mb = min(r["rss_mb"] for r in results)
+    heavy = results[0]["heavy_modules"]
+
+    failures = []
+    if import_seconds > args.max_seconds:
+        failures.append(f"import took {import_seconds:.2f}s > {args.max_seconds}s")
+    if rss_mb > args.max_rss_mb:
+        failures.append(f"RSS {rss_mb:.0f}MB > {args.max_rss_mb}MB")
+    if heavy:
+        failures.append(f"heavy modules imported eagerly: {', '.join(heavy)}")
+
+    print(f"import time: {import_seconds:.3f}s   RSS: {rss_mb:.1f}MB")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# backend/benchmarks/check_worker_memory.py
+#
+# Per-worker memory of `serve.py` (preload-and-fork) compared with workers
+# that each load their own models. Starts the server on a free port with the
+# fake LLM backend, sends /parse-resume requests so every worker runs the
+# encoder, then reads RSS, PSS and private memory (USS) of the parent and
+# each worker from /proc/<pid>/smaps_rollup. Linux only.
+#
+# Exits non-zero when a preloaded worker's private memory exceeds
+# --max-worker-mb.
+#
+#   python backend/benchmarks/check_worker_memory.py --workers 4
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import fitz  # PyMuPDF
+
+SERVE_PY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "serve.py")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def make_pdf(i: int) -> bytes:
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((50, 72), f"Resume {i}: ML engineer, Python, PyTorch, AWS, Docker.")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def post_pdf(port: int, pdf: bytes) -> None:
+    boundary = "jobfitboundary"
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; "
+        f"filename=\"r.pdf\"\r\nContent-Type: application/pdf\r\n\r\n"
+    ).encode() + pdf + f"\r\n--{boundary}--\r\n".encode()
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{port}/parse-resume",
+        data=body,
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+    )
+    urllib.request.urlopen(request, timeout=60).read()
+
+
+def memory_mb(pid: int) -> dict:
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "uss": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def children(pid: int) -> list:
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(child) for child in f.read().split()]
+
+
+def measure(workers: int, preload: str, requests: int) -> dict:
+    port = free_port()
+    work_dir = tempfile.mkdtemp(prefix="jobfit-mem-")
+    os.makedirs(os.path.join(work_dir, "data", "resumes"))
+    env = {
+        **os.environ,
+        "LLM_BACKEND": "fake",
+        "LLM_CACHE_ENABLED": "0",
+        # Every request must reach the encoder
+        "EMBEDDING_CACHE_ENABLED": "0",
+        "JOB_WORKERS": "0",
+        "WARMUP_ON_STARTUP": "0",
+    }
+    server = subprocess.Popen(
+        [
+            sys.executable, SERVE_PY, "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--preload", preload, "--log-level", "warning",
+        ],
+        cwd=work_dir,
+        env=env,
+    )
+    try:
+        for _ in range(600):
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1)
+                break
+            except OSError:
+                time.sleep(0.1)
+        else:
+            raise RuntimeError("server did not start")
+        for i in range(requests):
+            post_pdf(port, make_pdf(i))
+        time.sleep(0.5)
+        return {
+            "parent": memory_mb(server.pid),
+            "workers": [memory_mb(pid) for pid in children(server.pid)],
+        }
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def report(label: str, result: dict) -> float:
+    workers = result["workers"]
+    total_pss = result["parent"]["pss"] + sum(w["pss"] for w in workers)
+    median_uss = statistics.median(w["uss"] for w in workers)
+    print(f"\n{label}")
+    print(f"  {'process':<10} {'RSS MB':>9} {'PSS MB':>9} {'private MB':>11}")
+    for name, m in [("parent", result["parent"])] + [
+        (f"worker {i}", w) for i, w in enumerate(workers)
+    ]:
+        print(f"  {name:<10} {m['rss']:>9.1f} {m['pss']:>9.1f} {m['uss']:>11.1f}")
+    print(f"  total (PSS) {total_pss:.1f} MB, median private per worker {median_uss:.1f} MB")
+    return median_uss
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check per-worker memory of serve.py")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--max-worker-mb", type=float, default=150)
+    parser.add_argument(
+        "--skip-baseline", action="store_true", help="Only measure the preloaded mode"
+    )
+    args = parser.parse_args()
+
+    preloaded = measure(args.workers, "sentence_encoder", args.requests)
+    worker_mb = report("preload + fork (models shared copy-on-write)", preloaded)
+    if not args.skip_baseline:
+        report(
+            "no preload (each worker loads its own models)",
+            measure(args.workers, "", args.requests),
+        )
+
+    if worker_mb > args.max_worker_mb:
+        print(f"\nFAIL: {worker_mb:.1f} MB private per worker > {args.max_worker_mb} MB")
+        sys.exit(1)
+    print(f"\nOK: {worker_mb:.1f} MB private per worker <= {args.max_worker_mb} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# backend/benchmarks/run_suite.py
+#
+# End-to-end benchmark suite that runs offline: Gemini is replaced by the
+# fake backend (utils/fake_llm.py), so no GEMINI_API_KEY or network is needed.
+# Times PDF extraction, skill matching and extraction, scoring, and the
+# /match and /rewrite-bullet flows through the FastAPI TestClient.
+#
+#   python backend/benchmarks/run_suite.py --save baselines/main.json
+#   python backend/benchmarks/run_suite.py --compare baselines/main.json --threshold 0.2
+#
+# LLM_FAKE_LATENCY_MS / LLM_FAKE_ERROR_RATE etc. are passed through; they
+# default to 0 here so the numbers measure this service, not the fake model.
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("LLM_CACHE_ENABLED", "0")
+os.environ.setdefault("LLM_FAKE_SEED", "0")
+WORK_DIR = tempfile.mkdtemp(prefix="jobfit-bench-")
+os.environ.setdefault("RESUME_INDEX_DIR", os.path.join(WORK_DIR, "index"))
+
+import fitz  # PyMuPDF
+
+LINE = "Developed and deployed machine learning pipelines with Python, PyTorch and AWS."
+JD_TEXT = (
+    "Senior Machine Learning Engineer. 5+ years of experience with Python, PyTorch, "
+    "AWS or GCP, Kubernetes and LLM fine-tuning. Master's degree preferred.\n"
+) * 10
+SKILLS = ["Python", "PyTorch", "AWS", "Kubernetes", "NLP", "SQL", "Docker", "GCP"]
+
+
+def make_pdf(path: str, pages: int) -> None:
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        body = "\n".join(f"{i}.{j} {LINE}" for j in range(45))
+        page.insert_textbox(fitz.Rect(36, 36, 576, 806), body, fontsize=8)
+    doc.save(path)
+    doc.close()
+
+
+def measure(fn, repeat: int, warmup: int = 1) -> dict:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "runs": repeat,
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[int(0.95 * (len(samples) - 1))], 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "min_ms": round(samples[0], 3),
+    }
+
+
+def build_cases(pdf_path: str) -> dict:
+    # Imported here so the environment above is in place first
+    from fastapi.testclient import TestClient
+
+    import main
+    from utils import jd_parser, pdf_parser
+    from utils.fake_llm import DEFAULT_RESPONSES
+    from utils.matcher import calculate_skill_match
+    from utils.score_calculator import score_match, score_matrix
+
+    resume_text = pdf_parser.extract_text_from_pdf(pdf_path)
+    resume_data = DEFAULT_RESPONSES["resume_parser"]
+    jd_data = DEFAULT_RESPONSES["jd_parser"]
+    feedback = DEFAULT_RESPONSES["matcher"]
+    client = TestClient(main.app)
+    with open(pdf_path, "rb") as f:
+        pdf_bytes = f.read()
+
+    def match_flow():
+        response = client.post(
+            "/match",
+            files={"resume_file": ("resume.pdf", pdf_bytes, "application/pdf")},
+            data={"jd_text": JD_TEXT},
+        )
+        assert response.status_code == 200 and "overall_score" in response.json()
+
+    def rewrite_flow():
+        response = client.post(
+            "/rewrite-bullet",
+            data={"bullet": "Worked on ML models", "jd_text": JD_TEXT, "resume_text": resume_text},
+        )
+        assert response.status_code == 200 and response.json()["success"]
+
+    return {
+        "extract_text_from_pdf": lambda: pdf_parser.extract_text_from_pdf(pdf_path),
+        "calculate_skill_match": lambda: calculate_skill_match(resume_text, SKILLS),
+        "pdf_parser.extract_skills": lambda: pdf_parser.extract_skills(resume_text),
+        "jd_parser.extract_skills": lambda: jd_parser.extract_skills(JD_TEXT),
+        "score_match": lambda: score_match(resume_data, jd_data, feedback),
+        "score_matrix_500x500": lambda: score_matrix([resume_data] * 500, [jd_data] * 500),
+        "POST /match": match_flow,
+        "POST /rewrite-bullet": rewrite_flow,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta_ms: float) -> list:
+    """
+    Cases whose p50 is more than `threshold` (fraction) and `min_delta_ms`
+    slower than the baseline
+    """
+    regressions = []
+    print(f"\n{'case':<28} {'baseline p50':>13} {'current p50':>12} {'change':>8}")
+    for name, current in results.items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            print(f"{name:<28} {'-':>13} {current['p50_ms']:>12.3f} {'new':>8}")
+            continue
+        change = current["p50_ms"] / before["p50_ms"] - 1 if before["p50_ms"] else 0.0
+        regressed = (
+            change > threshold and current["p50_ms"] - before["p50_ms"] > min_delta_ms
+        )
+        flag = "  REGRESSION" if regressed else ""
+        print(
+            f"{name:<28} {before['p50_ms']:>13.3f} {current['p50_ms']:>12.3f} "
+            f"{change:>+8.1%}{flag}"
+        )
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=5, help="Pages in the test PDF")
+    parser.add_argument("--only", nargs="+", help="Run only these cases")
+    parser.add_argument("--save", help="Write results to this JSON baseline file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--min-delta-ms", type=float, default=0.5)
+    args = parser.parse_args()
+
+    # Resolve paths before moving into the scratch directory
+    save = os.path.abspath(args.save) if args.save else None
+    baseline_path = os.path.abspath(args.compare) if args.compare else None
+    os.chdir(WORK_DIR)
+    pdf_path = os.path.join(WORK_DIR, "resume.pdf")
+    make_pdf(pdf_path, args.pages)
+    cases = build_cases(pdf_path)
+
+    results = {}
+    print(f"{'case':<28} {'p50 ms':>9} {'p95 ms':>9} {'mean ms':>9}")
+    for name, fn in cases.items():
+        if args.only and name not in args.only:
+            continue
+        results[name] = measure(fn, args.repeat)
+        stats = results[name]
+        print(f"{name:<28} {stats['p50_ms']:>9.3f} {stats['p95_ms']:>9.3f} {stats['mean_ms']:>9.3f}")
+
+    if save:
+        payload = {
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pages": args.pages,
+            "llm_fake_latency_ms": float(os.environ.get("LLM_FAKE_LATENCY_MS", "0")),
+            "results": results,
+        }
+        os.makedirs(os.path.dirname(save), exist_ok=True)
+        with open(save, "w") as f:
+            json.dump(payload, f, indent=2)
+            f.write("\n")
+        print(f"\nsaved baseline to {save}")
+
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+        for name in regressions:
+            print(f"FAIL: {name} regressed more than {args.threshold:.0%}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,115 @@
 import sys
 import os
-from fastapi import FastAPI, UploadFile, File, Form
+import asyncio
+import hashlib
+from contextlib import asynccontextmanager
+import time
+from fastapi import FastAPI, UploadFile, File, Form, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Annotated
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from typing import Annotated, Optional
 import json
 
 # Add backend/ to path so imports work
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Import LLM-based modules
-from utils.pdf_parser import extract_text_from_pdf
-from utils.llm_resume_parser import parse_resume_with_llm
-from utils.llm_jd_parser import parse_jd_with_llm
-from utils.llm_matcher import run_llm_match
-from utils.bullet_rewriter import rewrite_bullet_point
-from utils.score_calculator import calculate_match_score_from_feedback
+from utils.pdf_parser import extract_skills, extract_text_from_pdf
+from utils.llm_resume_parser import (
+    MAX_RESUME_CHARS,
+    RESUME_PARSER_SECTIONS,
+    parse_resume_with_llm_async,
+    resume_truncated,
+)
+from utils.llm_jd_parser import parse_jd_with_llm_async
+from utils.ai_suggestions import stream_resume_suggestions
+from utils.bullet_rewriter import (
+    REWRITE_CONTEXT_SECTIONS,
+    rewrite_bullet_point_async,
+    rewrite_bullet_points_async,
+    stream_rewrite_bullet_point,
+)
+from utils.llm_matcher import run_llm_match_async
+from utils.matcher import calculate_skill_match, estimate_experience, get_embedding_cache
+from utils.match_pipeline import (
+    build_match_response,
+    format_feedback,
+    llm_error_response,
+    match_parsed_async,
+    summarize_jd,
+)
+from utils.llm_cache import get_cache
+from utils.llm_client import usage_stats
+from utils.llm_scheduler import get_scheduler
+from utils.resume_index import get_resume_index
+from utils.model_registry import model_status, warm_up
+from utils.experience_timeline import apply_timeline, resume_timeline
+from utils.match_cascade import MATCH_CASCADE_ENABLED, build_local_response, local_match
+from utils.section_segmenter import segment_resume, select_sections
+from utils.artifact_store import get_artifact_store, is_artifact_id, make_jd_id
+from utils.job_queue import (
+    JOB_WORKERS,
+    JobFailed,
+    JobWorkerPool,
+    QueueFull,
+    get_job_queue,
+)
+from utils.metrics import (
+    CASCADE_TIERS,
+    EXPERIENCE_CHECKS,
+    HTTP_REQUEST_SECONDS,
+    UPLOAD_BYTES,
+    current_timings,
+    register_gauge,
+    render_prometheus,
+    start_request_timings,
+    stop_request_timings,
+)
+
+# Load models and the Gemini client in the background at startup; /ready
+# reports 503 until that has finished. Otherwise everything loads lazily.
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "0") == "1"
+_warmup = {"state": "idle", "error": None}
+
+
+async def _run_warmup() -> None:
+    _warmup["state"] = "running"
+    try:
+        await run_in_threadpool(warm_up)
+        _warmup.update(state="done", error=None)
+    except Exception as e:
+        _warmup.update(state="failed", error=str(e))
+
+
+async def _run_match_job(payload: dict) -> dict:
+    jd = await _resolve_jd(payload["jd_text"], None)
+    if jd is None:
+        # Not retryable; /jobs/match rejects these up front
+        raise JobFailed("Provide jd_text", retry=False)
+    result = await _match_stored(payload["resume_id"], payload["resume_path"], *jd)
+    if "error" in result:
+        # LLM parse failures are usually transient, so the job is retried
+        raise JobFailed(f"{result['error']}: {result['details']}")
+    return result
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if WARMUP_ON_STARTUP:
+        asyncio.create_task(_run_warmup())
+    # Background workers for /jobs; JOB_WORKERS=0 leaves this process API-only
+    workers = None
+    if JOB_WORKERS > 0:
+        workers = JobWorkerPool(get_job_queue(), {"match": _run_match_job})
+        workers.start()
+    yield
+    if workers is not None:
+        await workers.stop()
+
 
 # Initialize FastAPI
-app = FastAPI(title="JobFit AI - LLM Enhanced Backend")
+app = FastAPI(title="JobFit AI - LLM Enhanced Backend", lifespan=lifespan)
 
 # Allow frontend (Streamlit) to communicate
 app.add_middleware(
@@ -27,115 +119,643 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Send per-stage timings in an X-Timing header on every response, not only
+# when the request carries an X-Timing header
+TIMING_HEADER = os.getenv("TIMING_HEADER", "0") == "1"
+
+
+@app.middleware("http")
+async def record_timings(request: Request, call_next):
+    token = start_request_timings()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        if TIMING_HEADER or "x-timing" in request.headers:
+            timings = current_timings()
+            timings["total"] = round((time.perf_counter() - start) * 1000, 1)
+            response.headers["X-Timing"] = ", ".join(
+                f"{stage}={ms}ms" for stage, ms in timings.items()
+            )
+        return response
+    finally:
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - start,
+            request.method,
+            getattr(route, "path", "unmatched"),
+            str(status),
+        )
+        stop_request_timings(token)
+
+
+def _cache_hit_ratio():
+    cache = get_cache()
+    return cache.stats()["hit_ratio"] if cache is not None else None
+
+
+def _embedding_cache_hit_ratio():
+    cache = get_embedding_cache()
+    return cache.stats()["hit_ratio"] if cache is not None else None
+
+
+register_gauge(
+    "jobfit_llm_cache_hit_ratio", "LLM response cache hit ratio", _cache_hit_ratio
+)
+register_gauge(
+    "jobfit_embedding_cache_hit_ratio",
+    "Skill/resume embedding cache hit ratio",
+    _embedding_cache_hit_ratio,
+)
+register_gauge(
+    "jobfit_llm_queue_depth",
+    "LLM calls waiting for a scheduler slot or rate budget",
+    lambda: get_scheduler().stats()["queue_depth"],
+)
+register_gauge(
+    "jobfit_jobs_queued",
+    "Jobs waiting in the durable job queue",
+    lambda: get_job_queue().stats().get("queued", 0),
+)
+register_gauge(
+    "jobfit_llm_in_flight",
+    "LLM calls in flight",
+    lambda: get_scheduler().stats()["in_flight"],
+)
+
 # Ensure data/resumes exists
 os.makedirs("data/resumes", exist_ok=True)
 
+# Max resume/JD pairs processed at once by /match/batch
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+
+
+@app.get("/health")
+async def api_health():
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+async def api_ready():
+    ready = not WARMUP_ON_STARTUP or _warmup["state"] == "done"
+    body = {"ready": ready, "warmup": _warmup, "models": model_status()}
+    return JSONResponse(body, status_code=200 if ready else 503)
+
+
+@app.post("/warmup")
+async def api_warmup():
+    await _run_warmup()
+    return {"warmup": _warmup, "models": model_status()}
+
 
 @app.post("/parse-resume")
 async def api_parse_resume(file: UploadFile = File(...)):
-    filepath = f"data/resumes/{file.filename}"
-    with open(filepath, "wb") as f:
-        f.write(await file.read())
+    """
+    Extract and LLM-parse a resume and store both under its resume_id, which
+    /match, /match/stream and /rewrite-bullet accept in place of the file
+    """
+    resume_id, filepath = await _store_resume(file)
 
-    text = extract_text_from_pdf(filepath)
-    return {"text": text[:1000], "full_text": text}
+    text = await _resume_text(resume_id, filepath, max_chars=None)
+
+    # Index the resume for /search, keyed by content hash
+    if text:
+        await run_in_threadpool(
+            get_resume_index().add,
+            resume_id,
+            text,
+            {"filename": file.filename, "path": filepath},
+        )
+    response = {"resume_id": resume_id, "text": text[:1000], "full_text": text}
+    parsed = await _parse_resume_stored(resume_id, filepath, text)
+    response["sections"] = list(await _resume_sections(resume_id, filepath, text))
+    if parsed["success"]:
+        response["parsed_resume"] = parsed["data"]
+        response["experience_timeline"] = parsed["timeline"]
+        response["truncated"] = parsed["truncated"]
+        if parsed.get("failed_chunks"):
+            response["failed_chunks"] = parsed["failed_chunks"]
+    else:
+        response.update(llm_error_response("resume", parsed))
+    return response
+
+
+@app.post("/resumes")
+async def api_upload_resume(file: UploadFile = File(...)):
+    """
+    Store a resume PDF once; pass the returned resume_id to /match and
+    /match/stream instead of uploading the file again
+    """
+    resume_id, _ = await _store_resume(file)
+    return {"resume_id": resume_id}
 
 
 @app.post("/parse-jd")
 async def api_parse_jd(text: Annotated[str, Form()]):
-    return {"raw_text": text}
+    """
+    LLM-parse a job description and store it under its jd_id
+    """
+    jd = await _resolve_jd(text, None)
+    if jd is None:
+        return JSONResponse({"error": "Provide jd_text"}, status_code=400)
+    jd_id, jd_text = jd
+    response = {"jd_id": jd_id, "raw_text": text}
+    parsed = await _parse_stored("jd", jd_id, jd_text)
+    if parsed["success"]:
+        response["parsed_jd"] = parsed["data"]
+    else:
+        response.update(llm_error_response("job description", parsed))
+    return response
+
+
+def _stored_resume_path(resume_id: str) -> str:
+    return f"data/resumes/{resume_id}.pdf"
+
+
+async def _store_resume(resume_file: UploadFile) -> tuple:
+    """
+    Save an upload under its content hash; returns (resume_id, path)
+    """
+    content = await resume_file.read()
+    UPLOAD_BYTES.observe(len(content))
+    resume_id = hashlib.sha256(content).hexdigest()
+    resume_path = _stored_resume_path(resume_id)
+    if not os.path.exists(resume_path):
+        with open(resume_path, "wb") as f:
+            f.write(content)
+    return resume_id, resume_path
+
+
+async def _resolve_resume(
+    resume_file: Optional[UploadFile], resume_id: Optional[str]
+) -> Optional[tuple]:
+    """
+    (resume_id, path) of the resume given as an upload or as the ID of a
+    stored one; None when neither is usable
+    """
+    if resume_file is not None:
+        return await _store_resume(resume_file)
+    # IDs are hex digests; anything else could escape data/resumes
+    if is_artifact_id(resume_id):
+        path = _stored_resume_path(resume_id)
+        if os.path.exists(path):
+            return resume_id, path
+    return None
+
+
+async def _resolve_jd(
+    jd_text: Optional[str], jd_id: Optional[str]
+) -> Optional[tuple]:
+    """
+    (jd_id, text) of the JD given as text or as the ID of a stored one;
+    None when neither is usable
+    """
+    store = get_artifact_store()
+    if jd_text and jd_text.strip():
+        jd_id = make_jd_id(jd_text)
+        await run_in_threadpool(store.save, "jd", jd_id, text=jd_text)
+        return jd_id, jd_text
+    if is_artifact_id(jd_id):
+        artifact = await run_in_threadpool(store.get, "jd", jd_id)
+        if artifact is not None and artifact["text"] is not None:
+            return jd_id, artifact["text"]
+    return None
+
+
+def _unknown_input(missing: str) -> JSONResponse:
+    return JSONResponse({"error": f"Provide {missing}"}, status_code=404)
+
+
+async def _resume_text(
+    resume_id: str, resume_path: str, max_chars: Optional[int] = MAX_RESUME_CHARS
+) -> str:
+    """
+    Extracted text of a stored resume, reusing an earlier extraction when it
+    covers max_chars
+    """
+    store = get_artifact_store()
+    artifact = await run_in_threadpool(store.get, "resume", resume_id)
+    if artifact is not None and artifact["text"] is not None:
+        text = artifact["text"]
+        if artifact["text_complete"] or (
+            max_chars is not None and len(text) >= max_chars
+        ):
+            return text[:max_chars] if max_chars is not None else text
+
+    text = await run_in_threadpool(extract_text_from_pdf, resume_path, max_chars)
+    # Text cut at max_chars is only reusable by requests for as much or less
+    complete = max_chars is None or len(text) < max_chars
+    await run_in_threadpool(
+        store.save, "resume", resume_id, text=text, text_complete=complete
+    )
+    return text
+
+
+async def _resume_sections(resume_id: str, resume_path: str, text: str) -> dict:
+    """
+    Sections of a stored resume, segmented once and kept with its text
+    """
+    store = get_artifact_store()
+    artifact = await run_in_threadpool(store.get, "resume", resume_id)
+    if artifact is not None and artifact["sections"] is not None:
+        return artifact["sections"]
+    sections = await run_in_threadpool(
+        segment_resume, text, resume_path, MAX_RESUME_CHARS
+    )
+    await run_in_threadpool(store.save, "resume", resume_id, sections=sections)
+    return sections
+
+
+async def _parse_resume_stored(resume_id: str, resume_path: str, text: str) -> dict:
+    """
+    Parse a stored resume from the sections the parser uses (no references,
+    hobbies, ...); years_of_experience comes from the resume's own date
+    ranges when those are clear, and the result carries that `timeline`
+    and whether the parser had to leave text out (`truncated`)
+    """
+    sections = await _resume_sections(resume_id, resume_path, text)
+    selected = select_sections(sections, RESUME_PARSER_SECTIONS, fallback=text)
+    parsed = await _parse_stored("resume", resume_id, selected)
+    if not parsed["success"]:
+        return parsed
+    parsed["truncated"] = resume_truncated(selected)
+    timeline = resume_timeline(sections, text)
+    data, outcome = apply_timeline(parsed["data"], timeline)
+    EXPERIENCE_CHECKS.inc(outcome)
+    return {**parsed, "data": data, "timeline": {**timeline, "check": outcome}}
+
+
+async def _local_tier(
+    resume_id: str, resume_path: str, resume_text: str, jd_text: str
+) -> Optional[dict]:
+    """
+    /match response from the local tier when it is decisive, else None
+    (borderline: the LLM decides)
+    """
+    if not MATCH_CASCADE_ENABLED:
+        return None
+    sections = await _resume_sections(resume_id, resume_path, resume_text)
+    local = await run_in_threadpool(local_match, resume_text, jd_text, sections)
+    CASCADE_TIERS.inc(local["tier"])
+    return build_local_response(local) if local["tier"] == "local" else None
+
+
+async def _parse_stored(kind: str, artifact_id: str, text: str) -> dict:
+    """
+    LLM parse of a stored resume or JD ({"success", "data"} like the
+    parsers), computed once and then served from the artifact store
+    """
+    store = get_artifact_store()
+    artifact = await run_in_threadpool(store.get, kind, artifact_id)
+    if artifact is not None and artifact["parsed"] is not None:
+        return {"success": True, "data": artifact["parsed"]}
+
+    if kind == "resume":
+        result = await parse_resume_with_llm_async(text)
+    else:
+        result = await parse_jd_with_llm_async(text)
+    # A parse missing failed chunks is returned but not kept
+    if result["success"] and not result.get("failed_chunks"):
+        await run_in_threadpool(store.save, kind, artifact_id, parsed=result["data"])
+    return result
 
 
 @app.post("/match")
-async def match(jd_text: Annotated[str, Form()], resume_file: UploadFile = File(...)):
-    # --- 1. Save & Extract Resume Text ---
-    resume_path = f"data/resumes/{resume_file.filename}"
-    with open(resume_path, "wb") as f:
-        f.write(await resume_file.read())
-    resume_text = extract_text_from_pdf(resume_path)
-
-    # --- 2. Parse Resume with LLM ---
-    parsed_resume = parse_resume_with_llm(resume_text)
+async def match(
+    jd_text: Annotated[Optional[str], Form()] = None,
+    jd_id: Annotated[Optional[str], Form()] = None,
+    resume_file: Optional[UploadFile] = File(None),
+    resume_id: Annotated[Optional[str], Form()] = None,
+    timings: bool = False,
+):
+    """
+    Full match pipeline for a resume (upload or stored resume_id) and a JD
+    (text or stored jd_id). Stored IDs skip extraction and parsing done
+    before. With MATCH_CASCADE=1, clear fits and clear mismatches are scored
+    locally without Gemini (`tier: local`); other matches go to the LLM
+    (`tier: llm`).
+    With ?timings=true the response also carries the per-stage timings (ms)
+    of this request.
+    """
+    resume = await _resolve_resume(resume_file, resume_id)
+    if resume is None:
+        return _unknown_input("resume_file or the resume_id of a stored resume")
+    jd = await _resolve_jd(jd_text, jd_id)
+    if jd is None:
+        return _unknown_input("jd_text or the jd_id of a stored job description")
+    result = await _match_stored(*resume, *jd)
+    if timings:
+        result["timings"] = current_timings()
+    return result
+
+
+async def _match_stored(
+    resume_id: str, resume_path: str, jd_id: str, jd_text: str
+) -> dict:
+    # --- 1. Extract Resume Text (unless stored) ---
+    resume_text = await _resume_text(resume_id, resume_path)
+
+    # --- 2. Score locally; clear fits and clear mismatches stop here ---
+    local = await _local_tier(resume_id, resume_path, resume_text, jd_text)
+    if local is not None:
+        return local
+
+    # --- 3. Parse Resume and Job Description with LLM (concurrently) ---
+    parsed_resume, parsed_jd = await asyncio.gather(
+        _parse_resume_stored(resume_id, resume_path, resume_text),
+        _parse_stored("jd", jd_id, jd_text),
+    )
     if not parsed_resume["success"]:
-        return {
-            "error": "Failed to parse resume with LLM",
-            "details": parsed_resume["error"],
-            "raw_output": parsed_resume.get("raw_output", ""),
-        }
+        return llm_error_response("resume", parsed_resume)
 
-    # --- 3. Parse Job Description with LLM ---
-    parsed_jd = parse_jd_with_llm(jd_text)
+    # --- 4. Check Job Description Parse ---
     if not parsed_jd["success"]:
-        return {
-            "error": "Failed to parse job description with LLM",
-            "details": parsed_jd["error"],
-            "raw_output": parsed_jd.get("raw_output", ""),
-        }
+        return llm_error_response("job description", parsed_jd)
 
-    # --- 4. Run Semantic Match with LLM ---
-    match_result = run_llm_match(parsed_resume["data"], parsed_jd["data"])
+    # --- 5. Run Semantic Match with LLM, Score & Return Structured Response ---
+    return await match_parsed_async(parsed_resume["data"], parsed_jd["data"])
 
-    # Safely extract feedback (string or structured)
-    if not match_result["success"]:
-        ai_feedback = "Could not generate feedback. Please try again."
-    else:
-        # Ensure ai_feedback is always a string
-        raw_feedback = match_result["feedback"]
-        if isinstance(raw_feedback, str):
-            ai_feedback = raw_feedback.strip()
-        elif isinstance(raw_feedback, dict):
-            # Convert structured feedback to readable string
-            lines = []
-            if raw_feedback.get("experience_met") is not None:
-                status = "Yes" if raw_feedback["experience_met"] else "No"
-                lines.append(
-                    f"1. Does the candidate meet the experience requirement?\n{status}"
-                )
-            if raw_feedback.get("missing_required_skills"):
-                lines.append(
-                    f"2. Missing required skills:\n{raw_feedback['missing_required_skills']}"
-                )
-            if raw_feedback.get("underemphasized_skills"):
-                lines.append(
-                    f"3. Underemphasized skills:\n{raw_feedback['underemphasized_skills']}"
-                )
-            if raw_feedback.get("suggested_bullet_points"):
-                lines.append("4. Suggested bullet points to add:")
-                for bullet in raw_feedback["suggested_bullet_points"]:
-                    lines.append(f"• {bullet}")
-            ai_feedback = "\n\n".join(lines)
-        else:
-            ai_feedback = str(raw_feedback)
-
-    # --- 5. Safely Extract Experience Requirement ---
-    required_years_raw = parsed_jd["data"].get("required_years")
+
+@app.post("/jobs/match", status_code=202)
+async def create_match_job(
+    jd_text: Annotated[str, Form()], resume_file: UploadFile = File(...)
+):
+    """
+    Queue a /match run and return its job ID at once; poll GET /jobs/{id}
+    """
+    if not jd_text.strip():
+        return JSONResponse({"error": "Provide jd_text"}, status_code=400)
+    # Stored under its content hash, so the job can run much later
+    resume_id, resume_path = await _store_resume(resume_file)
     try:
-        required_years = (
-            int(required_years_raw) if required_years_raw not in [None, ""] else 0
+        job_id = await run_in_threadpool(
+            get_job_queue().enqueue,
+            "match",
+            {"jd_text": jd_text, "resume_id": resume_id, "resume_path": resume_path},
         )
-    except (ValueError, TypeError):
-        required_years = 0
+    except QueueFull as e:
+        return JSONResponse({"error": f"Job queue is full: {e}"}, status_code=503)
+    return {"job_id": job_id, "status": "queued"}
 
-    actual_experience = parsed_resume["data"]["years_of_experience"]
-    years_match = actual_experience >= required_years if required_years > 0 else True
 
-    # --- 6. Calculate Dynamic Match Score ---
-    overall_score = calculate_match_score_from_feedback(
-        ai_feedback=ai_feedback, years_match=years_match
-    )
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Job status (queued, running, done, failed); `result` is the /match
+    response once done
+    """
+    job = await run_in_threadpool(get_job_queue().get, job_id)
+    if job is None:
+        return JSONResponse({"error": "Unknown or expired job"}, status_code=404)
+    return job
 
-    # --- 7. Return Structured Response ---
-    return {
-        "job_summary": {
-            "job_title": parsed_jd["data"].get("job_title"),
-            "required_years": parsed_jd["data"].get("required_years"),
-            "required_education": parsed_jd["data"].get("required_education"),
-            "required_skills": parsed_jd["data"].get("required_skills"),
-        },
-        "parsed_resume": parsed_resume["data"],
-        "ai_feedback": ai_feedback,  # ✅ Always a string
-        "overall_score": overall_score,
-    }
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/match/stream")
+async def match_stream(
+    jd_text: Annotated[Optional[str], Form()] = None,
+    jd_id: Annotated[Optional[str], Form()] = None,
+    resume_file: Optional[UploadFile] = File(None),
+    resume_id: Annotated[Optional[str], Form()] = None,
+):
+    """
+    Same pipeline and inputs as /match, streamed as server-sent events: one
+    event per completed stage (extracted, resume_parsed, jd_parsed, matched)
+    and a final `result` event carrying the full /match response. Matches
+    the local tier decides go straight from `extracted` to `result`.
+    """
+    # Save before streaming starts; the upload is closed afterwards
+    resume = await _resolve_resume(resume_file, resume_id)
+    if resume is None:
+        return _unknown_input("resume_file or the resume_id of a stored resume")
+    jd = await _resolve_jd(jd_text, jd_id)
+    if jd is None:
+        return _unknown_input("jd_text or the jd_id of a stored job description")
+    resume_id, resume_path = resume
+    jd_id, jd_text = jd
+
+    async def stream():
+        # --- 1. Extract Resume Text (unless stored) ---
+        resume_text = await _resume_text(resume_id, resume_path)
+        yield _sse(
+            "extracted", {"characters": len(resume_text), "text": resume_text[:1000]}
+        )
+        local = await _local_tier(resume_id, resume_path, resume_text, jd_text)
+        if local is not None:
+            yield _sse("result", local)
+            return
+
+        # --- 2. Parse Resume and JD concurrently, emitting each as it lands ---
+        async def parse(kind: str, coro) -> tuple:
+            return kind, await coro
+
+        tasks = [
+            asyncio.create_task(
+                parse(
+                    "resume", _parse_resume_stored(resume_id, resume_path, resume_text)
+                )
+            ),
+            asyncio.create_task(
+                parse("job description", _parse_stored("jd", jd_id, jd_text))
+            ),
+        ]
+        parsed = {}
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                kind, result = await next_done
+                if not result["success"]:
+                    yield _sse("error", llm_error_response(kind, result))
+                    return
+                parsed[kind] = result["data"]
+                if kind == "resume":
+                    yield _sse("resume_parsed", {"parsed_resume": result["data"]})
+                else:
+                    yield _sse(
+                        "jd_parsed", {"job_summary": summarize_jd(result["data"])}
+                    )
+        finally:
+            for task in tasks:
+                task.cancel()
+        resume_data, jd_data = parsed["resume"], parsed["job description"]
+
+        # --- 3. Run Semantic Match with LLM ---
+        match_result = await run_llm_match_async(resume_data, jd_data)
+        yield _sse("matched", {"ai_feedback": format_feedback(match_result)})
+
+        # --- 4. Score & Return Structured Response ---
+        yield _sse("result", build_match_response(resume_data, jd_data, match_result))
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+@app.post("/match/batch")
+async def match_batch(
+    jd_text: Annotated[Optional[str], Form()] = None,
+    jd_texts: Annotated[Optional[list[str]], Form()] = None,
+    resume_file: Optional[UploadFile] = File(None),
+    resume_files: Optional[list[UploadFile]] = File(None),
+):
+    """
+    Match one resume against many JDs (resume_file + jd_texts) or many
+    resumes against one JD (resume_files + jd_text). The shared side is
+    parsed once; per-item results stream back as NDJSON as they complete,
+    followed by a ranked summary.
+    """
+    one_resume = resume_file is not None and bool(jd_texts)
+    one_jd = bool(resume_files) and bool(jd_text and jd_text.strip())
+    if one_resume == one_jd:
+        return {
+            "error": "Provide either resume_file with jd_texts, "
+            "or resume_files with jd_text"
+        }
+
+    # --- 1. Store and parse the shared side once ---
+    # Items go through the same stored pipeline as /match (artifact store,
+    # sections, experience timeline, cascade), so they score the same
+    if one_resume:
+        resume = await _resolve_resume(resume_file, None)
+        resume_text = await _resume_text(*resume)
+        shared = await _parse_resume_stored(*resume, resume_text)
+        if not shared["success"]:
+            return llm_error_response("resume", shared)
+        items = [(f"jd_{i}", text) for i, text in enumerate(jd_texts)]
+    else:
+        jd = await _resolve_jd(jd_text, None)
+        shared = await _parse_stored("jd", *jd)
+        if not shared["success"]:
+            return llm_error_response("job description", shared)
+        # Store uploads now; they are closed once the response starts streaming
+        items = [
+            (upload.filename, await _store_resume(upload)) for upload in resume_files
+        ]
+
+    semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+
+    async def run_item(index: int, label: str, value) -> dict:
+        async with semaphore:
+            if one_resume:
+                item_jd = await _resolve_jd(value, None)
+                if item_jd is None:
+                    return {"error": "Empty job description"}
+                return await _match_stored(*resume, *item_jd)
+            return await _match_stored(*value, *jd)
+
+    async def run_item_event(index: int, label: str, value) -> dict:
+        try:
+            result = await run_item(index, label, value)
+        except Exception as e:
+            result = {"error": str(e)}
+        if "error" in result:
+            return {"event": "error", "index": index, "label": label, **result}
+        return {"event": "result", "index": index, "label": label, "result": result}
+
+    # --- 2. Fan out with bounded concurrency and stream as results complete ---
+    async def stream():
+        tasks = [
+            asyncio.create_task(run_item_event(i, label, value))
+            for i, (label, value) in enumerate(items)
+        ]
+        ranking, failures = [], []
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                event = await next_done
+                if event["event"] == "result":
+                    ranking.append(
+                        {
+                            "index": event["index"],
+                            "label": event["label"],
+                            "overall_score": event["result"]["overall_score"],
+                        }
+                    )
+                else:
+                    failures.append(event)
+                yield json.dumps(event) + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        ranking.sort(key=lambda r: r["overall_score"], reverse=True)
+        yield json.dumps(
+            {
+                "event": "summary",
+                "total": len(items),
+                "succeeded": len(ranking),
+                "failed": len(failures),
+                "ranking": ranking,
+                "failures": failures,
+            }
+        ) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@app.post("/search")
+async def api_search(
+    jd_text: Annotated[str, Form()],
+    top_k: Annotated[int, Form()] = 5,
+    run_match: Annotated[bool, Form()] = False,
+):
+    """
+    Top-K indexed resumes for a job description by embedding similarity.
+    With run_match, only those K resumes go through the LLM match.
+    """
+    if not jd_text.strip():
+        return JSONResponse({"error": "Provide jd_text"}, status_code=400)
+    results = await run_in_threadpool(get_resume_index().search, jd_text, top_k)
+    if not run_match or not results:
+        return {"results": results}
+
+    jd_id, jd_text = await _resolve_jd(jd_text, None)
+    parsed_jd = await _parse_stored("jd", jd_id, jd_text)
+    if not parsed_jd["success"]:
+        return llm_error_response("job description", parsed_jd)
+
+    semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+
+    async def match_hit(hit: dict) -> dict:
+        async with semaphore:
+            # Indexed resumes went through /parse-resume, so this is usually stored
+            text = await _resume_text(hit["resume_id"], hit["path"])
+            parsed_resume = await _parse_resume_stored(hit["resume_id"], hit["path"], text)
+            if not parsed_resume["success"]:
+                return {**hit, "match": llm_error_response("resume", parsed_resume)}
+            match = await match_parsed_async(parsed_resume["data"], parsed_jd["data"])
+            return {**hit, "match": match}
+
+    matched = await asyncio.gather(*(match_hit(hit) for hit in results))
+    matched.sort(key=lambda r: r["match"].get("overall_score", -1), reverse=True)
+    return {"results": matched}
+
+
+async def _rewrite_context(
+    jd_text: str, jd_id: Optional[str], resume_text: str, resume_id: Optional[str]
+) -> tuple:
+    """
+    (JD text, resume context) for the rewriters, filling whichever is empty
+    from a stored jd_id / resume_id
+    """
+    store = get_artifact_store()
+    if not jd_text and is_artifact_id(jd_id):
+        artifact = await run_in_threadpool(store.get, "jd", jd_id)
+        if artifact is not None:
+            jd_text = artifact["text"] or ""
+    if not resume_text and is_artifact_id(resume_id):
+        artifact = await run_in_threadpool(store.get, "resume", resume_id)
+        if artifact is not None:
+            # Same context the frontend builds: the top achievements
+            achievements = (artifact["parsed"] or {}).get(
+                "key_projects_or_achievements", []
+            )
+            resume_text = " ".join(achievements[:2]) or select_sections(
+                artifact["sections"] or {},
+                REWRITE_CONTEXT_SECTIONS,
+                fallback=artifact["text"] or "",
+            )
+    return jd_text, resume_text
 
 
 @app.post("/rewrite-bullet")
@@ -143,8 +763,116 @@ async def api_rewrite_bullet(
     bullet: Annotated[str, Form()],
     jd_text: Annotated[str, Form()] = "",
     resume_text: Annotated[str, Form()] = "",
+    jd_id: Annotated[Optional[str], Form()] = None,
+    resume_id: Annotated[Optional[str], Form()] = None,
 ):
-    result = rewrite_bullet_point(
+    jd_text, resume_text = await _rewrite_context(
+        jd_text, jd_id, resume_text, resume_id
+    )
+    result = await rewrite_bullet_point_async(
         bullet=bullet, job_description=jd_text, resume_context=resume_text
     )
     return result
+
+
+@app.post("/rewrite-bullets")
+async def api_rewrite_bullets(
+    bullets: Annotated[list[str], Form()],
+    jd_text: Annotated[str, Form()] = "",
+    resume_text: Annotated[str, Form()] = "",
+    jd_id: Annotated[Optional[str], Form()] = None,
+    resume_id: Annotated[Optional[str], Form()] = None,
+):
+    """
+    Rewrite several bullets at once; results[i] corresponds to bullets[i]
+    """
+    jd_text, resume_text = await _rewrite_context(
+        jd_text, jd_id, resume_text, resume_id
+    )
+    return await rewrite_bullet_points_async(
+        bullets=bullets, job_description=jd_text, resume_context=resume_text
+    )
+
+
+@app.post("/rewrite-bullet/stream")
+async def api_rewrite_bullet_stream(
+    bullet: Annotated[str, Form()],
+    jd_text: Annotated[str, Form()] = "",
+    resume_text: Annotated[str, Form()] = "",
+    jd_id: Annotated[Optional[str], Form()] = None,
+    resume_id: Annotated[Optional[str], Form()] = None,
+):
+    """
+    /rewrite-bullet as server-sent events: `delta` events carry the rewrite
+    as Gemini generates it, then a `result` (or `error`) event carries the
+    /rewrite-bullet response
+    """
+    jd_text, resume_text = await _rewrite_context(
+        jd_text, jd_id, resume_text, resume_id
+    )
+
+    async def stream():
+        async for event in stream_rewrite_bullet_point(bullet, jd_text, resume_text):
+            if "delta" in event:
+                yield _sse("delta", event)
+            else:
+                yield _sse("result" if event["success"] else "error", event)
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+@app.post("/suggestions/stream")
+async def api_suggestions_stream(
+    jd_text: Annotated[str, Form()] = "",
+    resume_text: Annotated[str, Form()] = "",
+    jd_id: Annotated[Optional[str], Form()] = None,
+    resume_id: Annotated[Optional[str], Form()] = None,
+):
+    """
+    Bullet points to add to the resume for a JD, as server-sent events:
+    `delta` events ({index, delta}) while each suggestion is generated, then
+    `result` with the full list. Missing skills and the experience gap are
+    computed locally.
+    """
+    jd_text, _ = await _rewrite_context(jd_text, jd_id, "", None)
+    if not resume_text and is_artifact_id(resume_id):
+        artifact = await run_in_threadpool(get_artifact_store().get, "resume", resume_id)
+        resume_text = (artifact or {}).get("text") or ""
+    if not jd_text or not resume_text:
+        return _unknown_input("jd_text or jd_id, and resume_text or resume_id")
+
+    semantic = await run_in_threadpool(
+        calculate_skill_match, resume_text, extract_skills(jd_text)
+    )
+    experience = await run_in_threadpool(estimate_experience, resume_text, jd_text)
+
+    async def stream():
+        async for event in stream_resume_suggestions(
+            jd_text, resume_text, semantic["missing_skills"], experience
+        ):
+            if "delta" in event:
+                yield _sse("delta", event)
+            else:
+                yield _sse("result" if event["success"] else "error", event)
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+@app.get("/llm/stats")
+async def api_llm_stats():
+    cache = get_cache()
+    return {
+        "cache": cache.stats() if cache is not None else None,
+        "scheduler": get_scheduler().stats(),
+        "usage": usage_stats(),
+    }
+
+
+@app.get("/metrics")
+async def api_metrics():
+    """
+    Prometheus text exposition of service metrics
+    """
+    return PlainTextResponse(
+        render_prometheus(), media_type="text/plain; version=0.0.4"
+    )
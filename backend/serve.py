@@ -0,0 +1,144 @@
+# backend/serve.py
+#
+# Multi-process server with preloaded, shared models. The app is imported and
+# the sentence encoder loaded once in this parent process; workers are then
+# forked and share those pages copy-on-write instead of each loading its own
+# copy, so adding a worker costs its private memory only (see
+# benchmarks/check_worker_memory.py). All workers accept on one listening
+# socket; dead workers are replaced.
+#
+#   python backend/serve.py --workers 4 --port 8000
+#
+# Linux/macOS only (needs os.fork).
+
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+
+import uvicorn
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+SERVE_WORKERS = int(os.getenv("SERVE_WORKERS", str(os.cpu_count() or 1)))
+# Models loaded before forking. The Gemini client is left to each worker:
+# gRPC channels must not be shared across fork.
+SERVE_PRELOAD = os.getenv("SERVE_PRELOAD", "sentence_encoder")
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _preload(models: list) -> None:
+    from utils.model_registry import warm_up
+
+    import main  # noqa: F401  (registers the models; imported by workers from here)
+
+    if models:
+        warm_up(models)
+    # Objects created so far are never collected; keeps the GC from writing
+    # to (and so un-sharing) their pages in every worker
+    gc.collect()
+    gc.freeze()
+
+
+def _run_worker(sock: socket.socket, threads: int, log_level: str) -> None:
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    # N workers each using every core would oversubscribe the CPU
+    if "torch" in sys.modules and threads > 0:
+        sys.modules["torch"].set_num_threads(threads)
+
+    import main
+
+    config = uvicorn.Config(main.app, log_level=log_level)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def _spawn(sock: socket.socket, threads: int, log_level: str) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _run_worker(sock, threads, log_level)
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        os._exit(code)
+    return pid
+
+
+def serve(
+    host: str, port: int, workers: int, preload: list, threads: int, log_level: str
+) -> None:
+    sock = _bind(host, port)
+    _preload(preload)
+    print(
+        f"[serve] preloaded {preload or 'nothing'}; "
+        f"forking {workers} workers on {host}:{port}"
+    )
+
+    children = {_spawn(sock, threads, log_level) for _ in range(workers)}
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        if not stopping:
+            print(f"[serve] worker {pid} exited ({status}); starting a new one")
+            time.sleep(1)  # avoid a tight loop when workers crash on start
+            if not stopping:
+                children.add(_spawn(sock, threads, log_level))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Preload models and fork workers")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=SERVE_WORKERS)
+    parser.add_argument(
+        "--preload",
+        default=SERVE_PRELOAD,
+        help="Comma-separated models to load before forking ('' for none)",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=0,
+        help="Torch threads per worker (default: CPU count / workers)",
+    )
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    threads = args.threads or max(1, (os.cpu_count() or 1) // max(1, args.workers))
+    preload = [name for name in args.preload.split(",") if name.strip()]
+    serve(args.host, args.port, args.workers, preload, threads, args.log_level)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,18 @@
 # backend/utils/ai_suggestions.py
 
-import google.generativeai as genai
+import json
 import os
+from typing import AsyncIterator, List
 
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+from utils.llm_client import generate_text, stream_text_async
+from utils.llm_jd_parser import MAX_JD_TOKENS
+from utils.prompt_builder import render_prompt, truncate_to_tokens
+from utils.stream_parser import StreamingTextParser
 
+# Tokens of resume text quoted as the snippet
+SNIPPET_TOKENS = int(os.getenv("SUGGESTIONS_SNIPPET_TOKENS", "375"))
 
-def generate_resume_suggestions(
-    jd_text: str, resume_text: str, missing_skills: list, experience_gap: dict
-) -> str:
-    """
-    Ask Gemini to suggest how to improve the resume
-    """
-    model = genai.GenerativeModel("gemini-2.5-flash")
-
-    prompt = f"""
+PROMPT_TEMPLATE = """
     You are a senior career coach helping a Machine Learning Scientist optimize their resume for a competitive role.
     The candidate has strong experience but may not be highlighting key terms from the job description.
 
@@ -31,26 +29,92 @@ def generate_resume_suggestions(
     {jd_text}
 
     Resume Snippet:
-    {resume_text[:1500]}
+    {resume_snippet}
 
-    Missing Skills: {', '.join([s['skill'] for s in missing_skills]) if missing_skills else 'None'}
+    Missing Skills: {missing_skills}
 
-    Experience Required: {experience_gap.get('required_years', 'Unknown')}+ years
-    Candidate Experience: {experience_gap.get('resume_years', 'Unknown')}
+    Experience Required: {required_years}+ years
+    Candidate Experience: {resume_years}
 
-    Format:
-    • [Action verb] [specific task] using [keyword], resulting in [impact].
-    • ...
+    Return only a JSON array of strings, one bullet point per string:
+    ["[Action verb] [specific task] using [keyword], resulting in [impact].", "..."]
     """
 
+
+GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "temperature": 0.2,
+}
+
+
+def _build_prompt(
+    jd_text: str, resume_text: str, missing_skills: list, experience_gap: dict
+) -> str:
+    return render_prompt(
+        PROMPT_TEMPLATE,
+        jd_text=truncate_to_tokens(jd_text, MAX_JD_TOKENS),
+        resume_snippet=truncate_to_tokens(resume_text, SNIPPET_TOKENS),
+        missing_skills=", ".join(s["skill"] for s in missing_skills)
+        if missing_skills
+        else "None",
+        required_years=experience_gap.get("required_years", "Unknown"),
+        resume_years=experience_gap.get("resume_years", "Unknown"),
+    )
+
+
+def generate_resume_suggestions(
+    jd_text: str, resume_text: str, missing_skills: list, experience_gap: dict
+) -> str:
+    """
+    Ask Gemini to suggest how to improve the resume
+    """
     try:
-        response = model.generate_content(
-            prompt,
-            generation_config={
-                "response_mime_type": "application/json",
-                "temperature": 0.2,
-            },
+        text = generate_text(
+            _build_prompt(jd_text, resume_text, missing_skills, experience_gap),
+            generation_config=GENERATION_CONFIG,
+            call_site="suggestions",
         )
-        return response.text.strip()
+        return text.strip()
     except Exception as e:
         return f"AI suggestion failed: {str(e)}"
+
+
+def _suggestion_list(parser: StreamingTextParser) -> List[str]:
+    # One entry per bullet, whether Gemini sent the JSON array asked for, a
+    # JSON object or string, or plain text with a bullet per line
+    items = parser.items
+    if parser.mode in ("text", "object"):
+        try:
+            value = json.loads(parser.text)
+            if isinstance(value, dict):
+                # e.g. {"suggestions": [...]}
+                lists = [v for v in value.values() if isinstance(v, list)]
+                value = lists[0] if lists else list(value.values())
+            items = value if isinstance(value, list) else [str(value)]
+        except json.JSONDecodeError:
+            pass
+    lines = [line.strip() for item in items for line in str(item).splitlines()]
+    return [line for line in lines if line]
+
+
+async def stream_resume_suggestions(
+    jd_text: str, resume_text: str, missing_skills: list, experience_gap: dict
+) -> AsyncIterator[dict]:
+    """
+    Streaming variant of generate_resume_suggestions: yields
+    {"index": i, "delta": text} as each suggestion is generated, then
+    {"success": True, "suggestions": [...]}
+    """
+    parser = StreamingTextParser()
+    try:
+        async for chunk in stream_text_async(
+            _build_prompt(jd_text, resume_text, missing_skills, experience_gap),
+            generation_config=GENERATION_CONFIG,
+            call_site="suggestions",
+        ):
+            for index, delta in parser.feed(chunk):
+                yield {"index": index, "delta": delta}
+    except Exception as e:
+        yield {"success": False, "error": f"AI suggestion failed: {str(e)}"}
+        return
+    yield {"success": True, "suggestions": _suggestion_list(parser)}
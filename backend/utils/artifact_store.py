@@ -0,0 +1,142 @@
+# backend/utils/artifact_store.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+# Where extracted resume/JD text and parsed LLM JSON are kept
+ARTIFACT_STORE_PATH = os.getenv("ARTIFACT_STORE_PATH", "data/artifacts/artifacts.sqlite3")
+
+ARTIFACT_KINDS = ("resume", "jd")
+
+
+def make_jd_id(jd_text: str) -> str:
+    """
+    ID of a job description: hash of its text, ignoring surrounding whitespace
+    """
+    return hashlib.sha256(jd_text.strip().encode("utf-8")).hexdigest()
+
+
+def is_artifact_id(value: Optional[str]) -> bool:
+    return bool(value) and len(value) == 64 and all(c in "0123456789abcdef" for c in value)
+
+
+class ArtifactStore:
+    """
+    Extracted text, sections and parsed LLM output of resumes and job
+    descriptions, keyed by content hash (resume_id = sha256 of the PDF,
+    jd_id = sha256 of the JD text). Lets /match reuse earlier extraction and
+    parsing by ID.
+    """
+
+    def __init__(self, path: str = ARTIFACT_STORE_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS artifacts (
+                kind TEXT NOT NULL,
+                id TEXT NOT NULL,
+                text TEXT,
+                text_complete INTEGER NOT NULL DEFAULT 0,
+                parsed TEXT,
+                sections TEXT,
+                meta TEXT NOT NULL DEFAULT '{}',
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (kind, id)
+            )
+            """)
+        self._db.commit()
+
+    def get(self, kind: str, artifact_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM artifacts WHERE kind = ? AND id = ?", (kind, artifact_id)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "id": row["id"],
+            "kind": row["kind"],
+            "text": row["text"],
+            "text_complete": bool(row["text_complete"]),
+            "parsed": json.loads(row["parsed"]) if row["parsed"] is not None else None,
+            "sections": (
+                json.loads(row["sections"]) if row["sections"] is not None else None
+            ),
+            "meta": json.loads(row["meta"]),
+            "created_at": row["created_at"],
+        }
+
+    def save(
+        self,
+        kind: str,
+        artifact_id: str,
+        text: Optional[str] = None,
+        text_complete: bool = True,
+        parsed: Optional[dict] = None,
+        sections: Optional[dict] = None,
+        meta: Optional[dict] = None,
+    ) -> None:
+        """
+        Insert or update an artifact; fields left as None keep their stored value
+        """
+        if kind not in ARTIFACT_KINDS:
+            raise ValueError(f"Unknown artifact kind: {kind}")
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                """
+                INSERT INTO artifacts
+                    (kind, id, text, text_complete, parsed, sections, meta,
+                     created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (kind, id) DO UPDATE SET
+                    text = COALESCE(excluded.text, text),
+                    text_complete = CASE WHEN excluded.text IS NULL
+                        THEN text_complete ELSE excluded.text_complete END,
+                    parsed = COALESCE(excluded.parsed, parsed),
+                    sections = COALESCE(excluded.sections, sections),
+                    meta = json_patch(meta, excluded.meta),
+                    updated_at = excluded.updated_at
+                """,
+                (
+                    kind,
+                    artifact_id,
+                    text,
+                    int(text_complete),
+                    json.dumps(parsed) if parsed is not None else None,
+                    json.dumps(sections) if sections is not None else None,
+                    json.dumps(meta or {}),
+                    now,
+                    now,
+                ),
+            )
+            self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT kind, COUNT(*), COUNT(parsed) FROM artifacts GROUP BY kind"
+            ).fetchall()
+        return {kind: {"stored": total, "parsed": parsed} for kind, total, parsed in rows}
+
+
+_store: Optional[ArtifactStore] = None
+_store_lock = threading.Lock()
+
+
+def get_artifact_store() -> ArtifactStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ArtifactStore()
+    return _store
@@ -1,17 +1,26 @@
 # backend/utils/bullet_rewriter.py
 
-import google.generativeai as genai
+import asyncio
+import json
 import os
+from typing import AsyncIterator, Dict, List
 
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+from utils.llm_client import generate_text, generate_text_async, stream_text_async
+from utils.prompt_builder import compact_json, render_prompt, truncate_to_tokens
+from utils.stream_parser import StreamingTextParser
 
+# Tokens of job description and resume context sent with each prompt
+CONTEXT_TOKENS = int(os.getenv("BULLET_CONTEXT_TOKENS", "125"))
+# Resume sections used as context when only a stored resume is given
+REWRITE_CONTEXT_SECTIONS = ("experience", "projects", "summary")
 
-def rewrite_bullet_point(
-    bullet: str, job_description: str = "", resume_context: str = ""
-) -> dict:
-    model = genai.GenerativeModel("gemini-2.5-flash")
+GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "temperature": 0.2,
+}
 
-    prompt = f"""
+
+PROMPT_TEMPLATE = """
     You are a resume optimization expert. Rewrite the following bullet point to be:
     - Stronger, more specific, and achievement-oriented
     - Include relevant keywords from the job description
@@ -23,28 +32,246 @@ def rewrite_bullet_point(
     {bullet}
 
     Job Description (for keywords):
-    {job_description[:500]}
+    {job_description}
 
     Resume Context (for realism):
-    {resume_context[:500]}
+    {resume_context}
 
     Return only the improved bullet point. No explanation.
     """
 
+
+def _build_prompt(bullet: str, job_description: str, resume_context: str) -> str:
+    return render_prompt(
+        PROMPT_TEMPLATE,
+        bullet=bullet.strip(),
+        job_description=truncate_to_tokens(job_description, CONTEXT_TOKENS),
+        resume_context=truncate_to_tokens(resume_context, CONTEXT_TOKENS),
+    )
+
+
+def _decode_output(text: str) -> str:
+    # Gemini answers in JSON mode, usually with a quoted string; decode it
+    # the way the streaming path does, so both return the same text
+    parser = StreamingTextParser()
+    parser.feed(text)
+    return parser.text
+
+
+def _clean_output(text: str) -> dict:
+    rewritten = text.strip()
+
+    # Clean output
+    if rewritten.startswith("•"):
+        rewritten = rewritten[1:].strip()
+
+    return {"success": True, "rewritten": f"• {rewritten}"}
+
+
+def rewrite_bullet_point(
+    bullet: str, job_description: str = "", resume_context: str = ""
+) -> dict:
     try:
-        response = model.generate_content(
-            prompt,
-            generation_config={
-                "response_mime_type": "application/json",
-                "temperature": 0.2,
-            },
+        text = generate_text(
+            _build_prompt(bullet, job_description, resume_context),
+            generation_config=GENERATION_CONFIG,
+            call_site="bullet_rewriter",
         )
-        rewritten = response.text.strip()
+        return _clean_output(_decode_output(text))
+    except Exception as e:
+        return {"success": False, "error": str(e)}
 
-        # Clean output
-        if rewritten.startswith("•"):
-            rewritten = rewritten[1:].strip()
 
-        return {"success": True, "rewritten": f"• {rewritten}"}
+async def rewrite_bullet_point_async(
+    bullet: str, job_description: str = "", resume_context: str = ""
+) -> dict:
+    """
+    Async variant of rewrite_bullet_point that does not block the event loop
+    """
+    try:
+        text = await generate_text_async(
+            _build_prompt(bullet, job_description, resume_context),
+            generation_config=GENERATION_CONFIG,
+            call_site="bullet_rewriter",
+        )
+        return _clean_output(_decode_output(text))
     except Exception as e:
         return {"success": False, "error": str(e)}
+
+
+async def stream_rewrite_bullet_point(
+    bullet: str, job_description: str = "", resume_context: str = ""
+) -> AsyncIterator[dict]:
+    """
+    Streaming variant of rewrite_bullet_point_async: yields {"delta": text}
+    as the rewrite is generated (decoded incrementally when Gemini answers
+    with a JSON string), then the same final dict as the non-streaming call
+    """
+    parser = StreamingTextParser()
+    pending, started = "", False
+    try:
+        async for chunk in stream_text_async(
+            _build_prompt(bullet, job_description, resume_context),
+            generation_config=GENERATION_CONFIG,
+            call_site="bullet_rewriter",
+        ):
+            for _, delta in parser.feed(chunk):
+                if not started:
+                    # Hold back leading whitespace and "•"; the client adds its own
+                    pending += delta
+                    delta = pending.lstrip()
+                    if delta.startswith("•"):
+                        delta = delta[1:].lstrip()
+                    started = bool(delta)
+                if delta:
+                    yield {"delta": delta}
+    except Exception as e:
+        yield {"success": False, "error": str(e)}
+        return
+    yield _clean_output(parser.text)
+
+
+# Bullets sent per Gemini call by rewrite_bullet_points
+BULLET_BATCH_SIZE = int(os.getenv("BULLET_BATCH_SIZE", "8"))
+
+
+BATCH_PROMPT_TEMPLATE = """
+    You are a resume optimization expert. Rewrite each of the following bullet points to be:
+    - Stronger, more specific, and achievement-oriented
+    - Include relevant keywords from the job description
+    - Use strong action verbs: Developed, Led, Built, Optimized, etc.
+    - Add metrics if possible (even estimated)
+    - Keep each under 1 line
+
+    Original Bullets (JSON):
+    {bullets}
+
+    Job Description (for keywords):
+    {job_description}
+
+    Resume Context (for realism):
+    {resume_context}
+
+    Return only a JSON array with one object per input bullet, keeping its index:
+    [{{"index": 0, "rewritten": "Improved bullet"}}]
+    """
+
+
+def _build_batch_prompt(
+    bullets: List[str], job_description: str, resume_context: str
+) -> str:
+    numbered = compact_json(
+        [{"index": i, "bullet": bullet} for i, bullet in enumerate(bullets)]
+    )
+    return render_prompt(
+        BATCH_PROMPT_TEMPLATE,
+        bullets=numbered,
+        job_description=truncate_to_tokens(job_description, CONTEXT_TOKENS),
+        resume_context=truncate_to_tokens(resume_context, CONTEXT_TOKENS),
+    )
+
+
+def _parse_batch_response(text: str) -> Dict[int, str]:
+    # Map of input index -> rewritten bullet; entries that are missing or
+    # malformed are left out so the caller can retry them one by one
+    items = json.loads(text.strip())
+    if not isinstance(items, list):
+        raise ValueError("Expected a JSON array")
+    rewritten = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        index, value = item.get("index"), item.get("rewritten")
+        if isinstance(index, int) and isinstance(value, str) and value.strip():
+            rewritten[index] = value
+    return rewritten
+
+
+def _batch_validator(count: int):
+    # Only complete answers are cached
+    def validate(text: str) -> None:
+        if set(_parse_batch_response(text)) != set(range(count)):
+            raise ValueError("Batch response does not cover every bullet")
+
+    return validate
+
+
+def _chunks(bullets: List[str]) -> List[range]:
+    size = max(1, BULLET_BATCH_SIZE)
+    return [range(i, min(i + size, len(bullets))) for i in range(0, len(bullets), size)]
+
+
+def _collect(chunk: range, text: str, results: list) -> List[int]:
+    # Fill results from one chunk's response; returns indices still missing
+    try:
+        rewritten = _parse_batch_response(text)
+    except Exception:
+        rewritten = {}
+    missing = []
+    for offset, index in enumerate(chunk):
+        if offset in rewritten:
+            results[index] = _clean_output(rewritten[offset])
+        else:
+            missing.append(index)
+    return missing
+
+
+def rewrite_bullet_points(
+    bullets: List[str], job_description: str = "", resume_context: str = ""
+) -> dict:
+    """
+    Rewrite many bullets with one Gemini call per BULLET_BATCH_SIZE chunk.
+    results[i] corresponds to bullets[i]; bullets missing from a chunk's
+    answer are retried individually.
+    """
+    results: list = [None] * len(bullets)
+    for chunk in _chunks(bullets):
+        chunk_bullets = [bullets[i] for i in chunk]
+        try:
+            text = generate_text(
+                _build_batch_prompt(chunk_bullets, job_description, resume_context),
+                generation_config=GENERATION_CONFIG,
+                validate=_batch_validator(len(chunk)),
+                call_site="bullet_rewriter_batch",
+            )
+        except Exception:
+            text = ""
+        for index in _collect(chunk, text, results):
+            results[index] = rewrite_bullet_point(
+                bullets[index], job_description, resume_context
+            )
+    return {"success": all(r["success"] for r in results), "results": results}
+
+
+async def rewrite_bullet_points_async(
+    bullets: List[str], job_description: str = "", resume_context: str = ""
+) -> dict:
+    """
+    Async variant of rewrite_bullet_points; chunks are sent concurrently
+    """
+    results: list = [None] * len(bullets)
+
+    async def run_chunk(chunk: range) -> None:
+        chunk_bullets = [bullets[i] for i in chunk]
+        try:
+            text = await generate_text_async(
+                _build_batch_prompt(chunk_bullets, job_description, resume_context),
+                generation_config=GENERATION_CONFIG,
+                validate=_batch_validator(len(chunk)),
+                call_site="bullet_rewriter_batch",
+            )
+        except Exception:
+            text = ""
+        missing = _collect(chunk, text, results)
+        retried = await asyncio.gather(
+            *(
+                rewrite_bullet_point_async(bullets[i], job_description, resume_context)
+                for i in missing
+            )
+        )
+        for index, result in zip(missing, retried):
+            results[index] = result
+
+    await asyncio.gather(*(run_chunk(chunk) for chunk in _chunks(bullets)))
+    return {"success": all(r["success"] for r in results), "results": results}
+
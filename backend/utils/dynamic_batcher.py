@@ -0,0 +1,82 @@
+# backend/utils/dynamic_batcher.py
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List
+
+import numpy as np
+
+
+class DynamicBatcher:
+    """
+    Collects encode requests from concurrent callers and runs them through
+    the model as one batch. A batch is flushed when it reaches max_batch
+    texts or max_wait_ms after its first request arrived.
+    """
+
+    def __init__(
+        self,
+        encode_fn: Callable[[List[str]], np.ndarray],
+        max_batch: int = 64,
+        max_wait_ms: float = 5.0,
+    ):
+        self.encode_fn = encode_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue: "queue.Queue[tuple[List[str], Future]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker_pid = None
+
+    def _ensure_worker(self) -> None:
+        # Started lazily (and again after a fork, where threads do not survive)
+        if self._worker_pid == os.getpid():
+            return
+        with self._lock:
+            if self._worker_pid != os.getpid():
+                self._queue = queue.Queue()
+                threading.Thread(
+                    target=self._run,
+                    args=(self._queue,),
+                    name="encode-batcher",
+                    daemon=True,
+                ).start()
+                self._worker_pid = os.getpid()
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((list(texts), future))
+        return future.result()
+
+    def _run(self, requests_queue: queue.Queue) -> None:
+        while True:
+            requests = [requests_queue.get()]
+            size = len(requests[0][0])
+            deadline = time.monotonic() + self.max_wait
+            # Gather more requests until the batch is full or the window closes
+            while size < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = requests_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                requests.append(item)
+                size += len(item[0])
+
+            texts = [text for batch, _ in requests for text in batch]
+            try:
+                embeddings = self.encode_fn(texts)
+            except Exception as e:
+                for _, future in requests:
+                    future.set_exception(e)
+                continue
+
+            offset = 0
+            for batch, future in requests:
+                future.set_result(embeddings[offset : offset + len(batch)])
+                offset += len(batch)
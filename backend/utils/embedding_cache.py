@@ -0,0 +1,170 @@
+# backend/utils/embedding_cache.py
+
+import hashlib
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads of one process are serialized
+    fcntl = None
+
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "1") not in ("0", "false", "False")
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", "data/embeddings")
+# Past this many rows new embeddings are still returned but no longer stored
+EMBEDDING_CACHE_MAX_ROWS = int(os.getenv("EMBEDDING_CACHE_MAX_ROWS", "200000"))
+
+KEY_BYTES = 16
+
+
+def normalize_text(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=KEY_BYTES).digest()
+
+
+@contextmanager
+def _file_lock(path: str):
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class EmbeddingCache:
+    """
+    Persistent embedding cache shared by all worker processes. Vectors are an
+    append-only float32 matrix file read through np.memmap (pages are shared
+    via the OS page cache, not copied per worker); a parallel append-only
+    file holds the 16-byte text hash of each row. Rows are only ever
+    appended, under an exclusive file lock, vectors before keys, so a row is
+    visible once its key is written.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        encode_fn: Callable[[List[str]], np.ndarray],
+        directory: str = EMBEDDING_CACHE_DIR,
+        max_rows: int = EMBEDDING_CACHE_MAX_ROWS,
+    ):
+        safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", namespace)
+        self.directory = os.path.join(directory, safe)
+        self.encode_fn = encode_fn
+        self.max_rows = max_rows
+        os.makedirs(self.directory, exist_ok=True)
+        self._vectors_path = os.path.join(self.directory, "vectors.f32")
+        self._keys_path = os.path.join(self.directory, "keys.bin")
+        self._meta_path = os.path.join(self.directory, "meta.json")
+        self._lock_path = os.path.join(self.directory, "lock")
+
+        self._lock = threading.Lock()
+        self._index: Dict[bytes, int] = {}
+        self._rows = 0
+        self._dim: Optional[int] = None
+        self._matrix: Optional[np.ndarray] = None
+        self._counters = {"hits": 0, "misses": 0, "stored": 0}
+
+    def _sync(self) -> None:
+        # Caller holds self._lock; pick up rows appended by any process
+        try:
+            rows = os.path.getsize(self._keys_path) // KEY_BYTES
+        except FileNotFoundError:
+            return
+        if rows == self._rows:
+            return
+        with open(self._keys_path, "rb") as f:
+            f.seek(self._rows * KEY_BYTES)
+            data = f.read((rows - self._rows) * KEY_BYTES)
+        for i in range(rows - self._rows):
+            self._index[data[i * KEY_BYTES : (i + 1) * KEY_BYTES]] = self._rows + i
+        if self._dim is None:
+            with open(self._meta_path) as f:
+                self._dim = json.load(f)["dim"]
+        self._rows = rows
+        self._matrix = np.memmap(
+            self._vectors_path, dtype=np.float32, mode="r", shape=(rows, self._dim)
+        )
+
+    def _append(self, keys: List[bytes], vectors: np.ndarray) -> None:
+        with self._lock, _file_lock(self._lock_path):
+            self._sync()
+            new = [i for i, key in enumerate(keys) if key not in self._index]
+            new = new[: max(0, self.max_rows - self._rows)]
+            if not new:
+                return
+            if self._dim is None:
+                self._dim = int(vectors.shape[1])
+                with open(self._meta_path, "w") as f:
+                    json.dump({"dim": self._dim}, f)
+            with open(self._vectors_path, "ab") as f:
+                # Drop vectors a crashed writer left without keys
+                f.truncate(self._rows * self._dim * 4)
+                f.write(np.ascontiguousarray(vectors[new], dtype=np.float32).tobytes())
+            with open(self._keys_path, "ab") as f:
+                f.write(b"".join(keys[i] for i in new))
+            self._counters["stored"] += len(new)
+            self._sync()
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Embeddings for texts, one row per text; only texts not seen before
+        (by any worker) are encoded, in one batch
+        """
+        if not texts:
+            return np.empty((0, self._dim or 0), dtype=np.float32)
+        normalized = [normalize_text(text) for text in texts]
+        keys = [_key(text) for text in normalized]
+
+        with self._lock:
+            self._sync()
+            rows = [self._index.get(key) for key in keys]
+            hits = [i for i, row in enumerate(rows) if row is not None]
+            cached = self._matrix[[rows[i] for i in hits]] if hits else None
+
+        # Unique misses, in first-seen order
+        missing: Dict[bytes, str] = {}
+        for i, row in enumerate(rows):
+            if row is None:
+                missing.setdefault(keys[i], normalized[i])
+        with self._lock:
+            self._counters["hits"] += len(hits)
+            self._counters["misses"] += len(missing)
+
+        fresh = None
+        if missing:
+            fresh = np.asarray(self.encode_fn(list(missing.values())), dtype=np.float32)
+            self._append(list(missing), fresh)
+        dim = fresh.shape[1] if fresh is not None else cached.shape[1]
+
+        result = np.empty((len(texts), dim), dtype=np.float32)
+        if hits:
+            result[hits] = cached
+        if missing:
+            position = {key: j for j, key in enumerate(missing)}
+            for i, row in enumerate(rows):
+                if row is None:
+                    result[i] = fresh[position[keys[i]]]
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "rows": self._rows,
+                "hit_ratio": round(self._counters["hits"] / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,205 @@
+# backend/utils/experience_timeline.py
+
+import os
+import re
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from utils.section_segmenter import HEADER
+
+# Timeline years replace the LLM's years_of_experience at or above this
+# confidence; below it the LLM value is kept
+TIMELINE_MIN_CONFIDENCE = float(os.getenv("TIMELINE_MIN_CONFIDENCE", "0.6"))
+# LLM and timeline years further apart than this count as a disagreement
+TIMELINE_TOLERANCE_YEARS = 1
+
+# Sections whose dates are not employment (degrees, certificates, papers)
+NON_EMPLOYMENT_SECTIONS = (
+    "education", "certifications", "publications", "awards",
+    "languages", "interests", "references",
+)
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+_MONTH = (
+    r"jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|"
+    r"aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?"
+)
+
+
+def _date_pattern(prefix: str) -> str:
+    # "Jan 2019", "January, 2019", "01/2019", "1.2019" or a bare "2019"
+    return (
+        rf"(?:(?P<{prefix}name>{_MONTH})\.?\s*,?\s*(?P<{prefix}year>(?:19|20)\d{{2}})"
+        rf"|(?P<{prefix}num>0?[1-9]|1[0-2])\s*[/.]\s*(?P<{prefix}numyear>(?:19|20)\d{{2}})"
+        rf"|(?P<{prefix}bare>(?:19|20)\d{{2}}))"
+    )
+
+
+_RANGE_PATTERN = re.compile(
+    rf"\b{_date_pattern('s_')}\s*(?:-|–|—|to|until|till)\s*"
+    rf"(?:{_date_pattern('e_')}|(?P<present>present|current|now|today|ongoing|date))\b",
+    re.IGNORECASE,
+)
+_TITLE_STRIP = " \t|,;:-–—()[]•*·"
+
+# Month index: year * 12 + (month - 1)
+Month = int
+
+
+def _endpoint(match: re.Match, prefix: str) -> Optional[Tuple[Month, bool]]:
+    """
+    (month index, precise) for one end of a range; bare years are placed
+    mid-year so "2016 - 2018" counts as two years
+    """
+    if match.group(f"{prefix}name"):
+        month = _MONTHS[match.group(f"{prefix}name")[:3].lower()]
+        return int(match.group(f"{prefix}year")) * 12 + month - 1, True
+    if match.group(f"{prefix}num"):
+        month = int(match.group(f"{prefix}num"))
+        return int(match.group(f"{prefix}numyear")) * 12 + month - 1, True
+    if match.group(f"{prefix}bare"):
+        return int(match.group(f"{prefix}bare")) * 12 + 6, False
+    return None
+
+
+def _format_month(index: Month) -> str:
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def _role_title(line: str, match: re.Match, previous: str) -> str:
+    title = (line[: match.start()] + " " + line[match.end():]).strip(_TITLE_STRIP)
+    title = " ".join(title.split())
+    # Dates on a line of their own belong to the line above
+    if len(title) < 3:
+        title = previous
+    return title[:80]
+
+
+def merge_intervals(intervals: List[Tuple[Month, Month]]) -> List[Tuple[Month, Month]]:
+    """
+    Union of half-open [start, end) month intervals, sorted; overlapping
+    or back-to-back roles become one span
+    """
+    merged: List[List[Month]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def extract_timeline(
+    text: str, today: Optional[date] = None, experience_section: bool = True
+) -> Dict:
+    """
+    Employment date ranges found in the text, each with its role line and
+    length, plus the total of the merged (non-overlapping) ranges.
+
+    confidence (0-1) is lower when dates are year-only, when ranges had to
+    be discarded (ending before they start, starting in the future), and
+    when the text is not a recognized experience section.
+    """
+    today = today or date.today()
+    now = today.year * 12 + today.month  # end of the current month
+    roles, intervals, precision, dropped = [], [], [], 0
+    previous = ""
+    for line in text.splitlines():
+        for match in _RANGE_PATTERN.finditer(line):
+            start, start_precise = _endpoint(match, "s_")
+            if match.group("present"):
+                end, end_precise = now, True
+            else:
+                end, end_precise = _endpoint(match, "e_")
+                # Month-precise ends are inclusive ("Jan - Mar" is 3 months)
+                end += 1 if end_precise else 0
+            if start >= now or end < start:
+                dropped += 1
+                continue
+            end = min(end, now)
+            if end == start:
+                # "2018 - 2018": some time within that year
+                start, end = start - 6, start
+            roles.append(
+                {
+                    "title": _role_title(line, match, previous),
+                    "start": _format_month(start),
+                    "end": "present" if match.group("present") else _format_month(end - 1),
+                    "months": end - start,
+                }
+            )
+            intervals.append((start, end))
+            precision.append((start_precise + end_precise) / 2)
+        if line.strip():
+            previous = " ".join(line.split()).strip(_TITLE_STRIP)
+
+    total = sum(end - start for start, end in merge_intervals(intervals))
+    confidence = 0.0
+    if roles:
+        # Both ends month-precise 1.0, one 0.85, none 0.7
+        confidence = sum(0.7 + 0.3 * p for p in precision) / len(precision)
+        confidence *= len(roles) / (len(roles) + dropped)
+        if not experience_section:
+            confidence *= 0.8
+    return {
+        "roles": roles,
+        "total_months": total,
+        "years": round(total / 12, 1),
+        "confidence": round(confidence, 2),
+    }
+
+
+def resume_timeline(sections: Dict[str, str], text: str, today: Optional[date] = None) -> Dict:
+    """
+    Timeline of a segmented resume: the experience section when there is
+    one, otherwise everything except education and similar sections
+    """
+    if sections.get("experience"):
+        return extract_timeline(sections["experience"], today)
+    if set(sections) <= {HEADER}:
+        body = text
+    else:
+        body = "\n".join(
+            body for name, body in sections.items() if name not in NON_EMPLOYMENT_SECTIONS
+        )
+    return extract_timeline(body, today, experience_section=False)
+
+
+def _llm_years(value) -> Optional[float]:
+    # Numbers, or strings such as "5+" or "5 years"
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    found = re.search(r"\d+(?:\.\d+)?", str(value or ""))
+    return float(found.group()) if found else None
+
+
+def timeline_years(timeline: Dict) -> int:
+    """
+    Total tenure in whole years, rounded half up (23 months is 2 years)
+    """
+    return (timeline["total_months"] + 6) // 12
+
+
+def apply_timeline(resume_data: dict, timeline: Dict) -> Tuple[dict, str]:
+    """
+    Cross-check the parsed years_of_experience against the timeline.
+    Returns the resume data and the outcome: agree, disagree, no_llm_value
+    or low_confidence. The LLM value is kept unless the timeline is
+    confident and the two disagree (or there is no LLM value); then the
+    timeline's rounded years replace it.
+    """
+    if timeline["confidence"] < TIMELINE_MIN_CONFIDENCE:
+        return resume_data, "low_confidence"
+    llm_years = _llm_years(resume_data.get("years_of_experience"))
+    if llm_years is None:
+        outcome = "no_llm_value"
+    elif abs(llm_years - timeline["total_months"] / 12) <= TIMELINE_TOLERANCE_YEARS:
+        return resume_data, "agree"
+    else:
+        outcome = "disagree"
+    return {**resume_data, "years_of_experience": timeline_years(timeline)}, outcome
@@ -0,0 +1,217 @@
+# backend/utils/fake_llm.py
+
+import asyncio
+import json
+import os
+import random
+import re
+import threading
+import time
+from typing import Optional
+
+# Fake backend settings (used when LLM_BACKEND=fake)
+FAKE_LATENCY_MS = float(os.getenv("LLM_FAKE_LATENCY_MS", "0"))
+FAKE_LATENCY_JITTER_MS = float(os.getenv("LLM_FAKE_LATENCY_JITTER_MS", "0"))
+FAKE_ERROR_RATE = float(os.getenv("LLM_FAKE_ERROR_RATE", "0"))
+# Streamed responses (stream=True) arrive in chunks of this many characters,
+# LLM_FAKE_CHUNK_MS apart; the first one after the usual latency
+FAKE_CHUNK_CHARS = int(os.getenv("LLM_FAKE_CHUNK_CHARS", "12"))
+FAKE_CHUNK_MS = float(os.getenv("LLM_FAKE_CHUNK_MS", "0"))
+# JSON file mapping prompt types to canned responses, overriding the defaults
+FAKE_RESPONSES_PATH = os.getenv("LLM_FAKE_RESPONSES")
+FAKE_SEED = os.getenv("LLM_FAKE_SEED")
+
+# Prompt type -> phrase that identifies its prompt template
+PROMPT_TYPES = {
+    "resume_parser": "expert resume parser",
+    "jd_parser": "expert job analyst",
+    "matcher": "senior hiring expert",
+    "bullet_rewriter_batch": "Original Bullets (JSON)",
+    "bullet_rewriter": "resume optimization expert",
+    "suggestions": "senior career coach",
+}
+
+DEFAULT_RESPONSES = {
+    "resume_parser": {
+        "name": "Jane Doe",
+        "job_title": "Machine Learning Engineer",
+        "years_of_experience": 6,
+        "education": ["MSc Computer Science"],
+        "technical_skills": {
+            "languages": ["Python", "SQL"],
+            "ml_frameworks": ["PyTorch", "TensorFlow"],
+            "cloud": ["AWS"],
+            "mlops": ["Docker", "Kubernetes"],
+            "databases": ["PostgreSQL"],
+            "tools": ["Git"],
+        },
+        "key_projects_or_achievements": [
+            "Built a recommendation system serving 5M users",
+            "Cut model inference latency by 40%",
+            "Led migration of training pipelines to Kubernetes",
+        ],
+    },
+    "jd_parser": {
+        "job_title": "Senior Machine Learning Engineer",
+        "required_years": 5,
+        "required_education": ["Master's in Computer Science or related field"],
+        "required_skills": {
+            "languages": ["Python"],
+            "ml_frameworks": ["PyTorch"],
+            "cloud": ["AWS", "GCP"],
+            "mlops": ["Kubernetes"],
+            "nlp": ["LLM fine-tuning"],
+        },
+        "nice_to_have_skills": ["Ray", "Spark"],
+        "key_responsibilities": [
+            "Train and deploy NLP models",
+            "Own the model serving platform",
+            "Mentor engineers",
+        ],
+    },
+    "matcher": {
+        "experience_met": True,
+        "missing_required_skills": "GCP, LLM fine-tuning",
+        "underemphasized_skills": "Kubernetes",
+        "suggested_bullet_points": [
+            "• Fine-tuned large language models with LoRA on GCP, improving accuracy by 12%"
+        ],
+    },
+    "bullet_rewriter": "• Developed and deployed PyTorch models on AWS, cutting latency by 40%",
+    "suggestions": [
+        "• Deployed LLM fine-tuning pipelines on GCP using Kubernetes, reducing cost by 20%"
+    ],
+}
+
+
+class FakeServiceUnavailable(ConnectionError):
+    """Injected transient failure (retried like a provider 503)"""
+
+
+def _load_responses() -> dict:
+    responses = dict(DEFAULT_RESPONSES)
+    if FAKE_RESPONSES_PATH:
+        with open(FAKE_RESPONSES_PATH) as f:
+            responses.update(json.load(f))
+    return responses
+
+
+def prompt_type(prompt: str) -> str:
+    for name, marker in PROMPT_TYPES.items():
+        if marker in prompt:
+            return name
+    return "unknown"
+
+
+class FakeUsage:
+    def __init__(self, prompt: str, text: str):
+        self.prompt_token_count = max(1, len(prompt) // 4)
+        self.candidates_token_count = max(1, len(text) // 4)
+        self.total_token_count = self.prompt_token_count + self.candidates_token_count
+
+
+class FakeResponse:
+    def __init__(self, prompt: str, text: str):
+        self.text = text
+        self.usage_metadata = FakeUsage(prompt, text)
+
+
+class FakeChunk:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeStreamResponse:
+    """
+    Streamed answer: iterate (or async-iterate) for chunks; text and
+    usage_metadata describe the whole response, like the SDK's
+    """
+
+    def __init__(self, response: FakeResponse, chunk_chars: int, chunk_ms: float):
+        self.text = response.text
+        self.usage_metadata = response.usage_metadata
+        self._chunks = [
+            self.text[i : i + chunk_chars]
+            for i in range(0, len(self.text), max(1, chunk_chars))
+        ]
+        self._delay = chunk_ms / 1000
+
+    def __iter__(self):
+        for i, chunk in enumerate(self._chunks):
+            if i and self._delay:
+                time.sleep(self._delay)
+            yield FakeChunk(chunk)
+
+    async def __aiter__(self):
+        for i, chunk in enumerate(self._chunks):
+            if i and self._delay:
+                await asyncio.sleep(self._delay)
+            yield FakeChunk(chunk)
+
+
+class FakeGenerativeModel:
+    """
+    Stand-in for genai.GenerativeModel that answers locally with canned JSON
+    per prompt type, after a configurable latency and with a configurable
+    rate of injected errors. Lets every flow run without GEMINI_API_KEY.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        latency_ms: float = FAKE_LATENCY_MS,
+        jitter_ms: float = FAKE_LATENCY_JITTER_MS,
+        error_rate: float = FAKE_ERROR_RATE,
+        responses: Optional[dict] = None,
+    ):
+        self.model_name = model_name
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.responses = responses if responses is not None else _load_responses()
+        self._random = random.Random(FAKE_SEED)
+        self._lock = threading.Lock()
+
+    def _delay_and_fault(self) -> float:
+        with self._lock:
+            delay = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+            fail = self._random.random() < self.error_rate
+        if fail:
+            raise FakeServiceUnavailable("Injected fake LLM failure")
+        return delay / 1000
+
+    def _answer(self, prompt: str) -> FakeResponse:
+        kind = prompt_type(prompt)
+        if kind == "bullet_rewriter_batch":
+            # Echo one rewritten bullet per indexed input
+            bullets = re.search(r"Original Bullets \(JSON\):\s*(\[.*?\])\n", prompt, re.S)
+            items = json.loads(bullets.group(1)) if bullets else []
+            template = self.responses["bullet_rewriter"]
+            answer = [
+                {"index": item["index"], "rewritten": template} for item in items
+            ]
+        else:
+            answer = self.responses.get(kind, {})
+        text = answer if isinstance(answer, str) else json.dumps(answer)
+        return FakeResponse(prompt, text)
+
+    def _stream(self, response: FakeResponse) -> FakeStreamResponse:
+        return FakeStreamResponse(response, FAKE_CHUNK_CHARS, FAKE_CHUNK_MS)
+
+    def generate_content(
+        self, prompt: str, generation_config=None, stream: bool = False, **kwargs
+    ):
+        delay = self._delay_and_fault()
+        if delay:
+            time.sleep(delay)
+        response = self._answer(prompt)
+        return self._stream(response) if stream else response
+
+    async def generate_content_async(
+        self, prompt: str, generation_config=None, stream: bool = False, **kwargs
+    ):
+        delay = self._delay_and_fault()
+        if delay:
+            await asyncio.sleep(delay)
+        response = self._answer(prompt)
+        return self._stream(response) if stream else response
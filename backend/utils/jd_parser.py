@@ -1,9 +1,8 @@
+import os
 import re
-import spacy
 from typing import Dict, List
 
-# Load NLP model
-nlp = spacy.load("en_core_web_sm")
+from utils.skill_matcher import SkillMatcher
 
 # Common skill patterns (extendable)
 SKILL_KEYWORDS = [
@@ -26,6 +25,17 @@ SKILL_KEYWORDS = [
     "mlops",
 ]
 
+# Extra skills/aliases can be supplied as JSON: {"canonical": ["alias", ...]}
+SKILL_TAXONOMY_PATH = os.getenv("JD_SKILL_TAXONOMY_PATH")
+
+# Compiled once at import; skills are reported title-cased, e.g. "Machine Learning"
+_skill_taxonomy = {skill.title(): [skill] for skill in SKILL_KEYWORDS}
+_skill_matcher = (
+    SkillMatcher.from_json(SKILL_TAXONOMY_PATH, base=_skill_taxonomy)
+    if SKILL_TAXONOMY_PATH
+    else SkillMatcher(_skill_taxonomy)
+)
+
 
 def extract_experience(text: str) -> str:
     patterns = [
@@ -41,16 +51,8 @@ def extract_experience(text: str) -> str:
 
 
 def extract_skills(text: str) -> List[str]:
-    doc = nlp(text.lower())
-    found_skills = []
-
-    # Exact keyword matching (can be improved later with NER or embeddings)
-    for skill in SKILL_KEYWORDS:
-        if skill in doc.text:
-            found_skills.append(skill.title())
-
-    # Remove duplicates
-    return list(set(found_skills))
+    # Single pass over the text, matching whole tokens only
+    return _skill_matcher.find(text)
 
 
 def parse_job_description(text: str) -> Dict:
@@ -0,0 +1,337 @@
+# backend/utils/job_queue.py
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, Optional
+
+# Job queue settings (override with environment variables)
+JOB_QUEUE_PATH = os.getenv("JOB_QUEUE_PATH", "data/jobs/jobs.sqlite3")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_MAX_QUEUED = int(os.getenv("JOB_MAX_QUEUED", "1000"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# A running job whose lease is not renewed in time (worker crashed or was
+# restarted) goes back to the queue
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+JOB_RESULT_TTL_SECONDS = float(os.getenv("JOB_RESULT_TTL_SECONDS", str(24 * 3600)))
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "0.5"))
+
+
+class QueueFull(Exception):
+    """Raised by enqueue when JOB_MAX_QUEUED jobs are already waiting"""
+
+
+class JobFailed(Exception):
+    """
+    Raised by a handler whose job did not succeed; with retry=False the job
+    fails at once instead of using up its remaining attempts
+    """
+
+    def __init__(self, error: str, retry: bool = True):
+        super().__init__(error)
+        self.retry = retry
+
+
+class JobQueue:
+    """
+    Durable job queue in SQLite. Workers claim jobs under a lease; expired
+    leases are reclaimed, so jobs survive worker crashes and restarts, up to
+    max_attempts. Finished jobs are kept for result_ttl_seconds.
+    Safe to share between threads and between processes using the same file.
+    """
+
+    def __init__(
+        self,
+        path: str = JOB_QUEUE_PATH,
+        lease_seconds: float = JOB_LEASE_SECONDS,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        result_ttl_seconds: float = JOB_RESULT_TTL_SECONDS,
+        max_queued: int = JOB_MAX_QUEUED,
+    ):
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.result_ttl_seconds = result_ttl_seconds
+        self.max_queued = max_queued
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Autocommit mode; write transactions are opened with BEGIN IMMEDIATE
+        self._db = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                lease_expires_at REAL,
+                expires_at REAL
+            )
+            """)
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)"
+        )
+
+    def _write(self, fn):
+        # Run fn(db) in one IMMEDIATE transaction (locks out other writers,
+        # including other processes)
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(self._db)
+                self._db.execute("COMMIT")
+                return result
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    # --- Producer side ---
+
+    def enqueue(self, kind: str, payload: dict) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+
+        def insert(db):
+            queued = db.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'queued'"
+            ).fetchone()[0]
+            if self.max_queued and queued >= self.max_queued:
+                raise QueueFull(f"{queued} jobs already queued")
+            db.execute(
+                "INSERT INTO jobs (id, kind, status, payload, created_at, updated_at) "
+                "VALUES (?, ?, 'queued', ?, ?, ?)",
+                (job_id, kind, json.dumps(payload), now, now),
+            )
+
+        self._write(insert)
+        return job_id
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """
+        Public view of a job, or None if it is unknown or expired
+        """
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None or (row["expires_at"] and row["expires_at"] < time.time()):
+            return None
+        job = {
+            "job_id": row["id"],
+            "kind": row["kind"],
+            "status": row["status"],
+            "attempts": row["attempts"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+        if row["result"] is not None:
+            job["result"] = json.loads(row["result"])
+        if row["error"] is not None:
+            job["error"] = row["error"]
+        return job
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall()
+        return {status: count for status, count in rows}
+
+    # --- Worker side ---
+
+    def claim(self) -> Optional[dict]:
+        """
+        Lease the oldest runnable job: queued, or running with an expired
+        lease. Jobs out of attempts are failed instead.
+        """
+        now = time.time()
+
+        def take(db):
+            while True:
+                row = db.execute(
+                    "SELECT id, kind, payload, attempts FROM jobs "
+                    "WHERE status = 'queued' "
+                    "OR (status = 'running' AND lease_expires_at < ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (now,),
+                ).fetchone()
+                if row is None:
+                    return None
+                if row["attempts"] >= self.max_attempts:
+                    db.execute(
+                        "UPDATE jobs SET status = 'failed', error = ?, updated_at = ?, "
+                        "expires_at = ? WHERE id = ?",
+                        (
+                            f"Gave up after {row['attempts']} attempts",
+                            now,
+                            now + self.result_ttl_seconds,
+                            row["id"],
+                        ),
+                    )
+                    continue
+                db.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, "
+                    "lease_expires_at = ?, updated_at = ? WHERE id = ?",
+                    (now + self.lease_seconds, now, row["id"]),
+                )
+                return {
+                    "id": row["id"],
+                    "kind": row["kind"],
+                    "payload": json.loads(row["payload"]),
+                    "attempt": row["attempts"] + 1,
+                }
+
+        return self._write(take)
+
+    def renew(self, job_id: str) -> None:
+        now = time.time()
+        self._write(
+            lambda db: db.execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND status = 'running'",
+                (now + self.lease_seconds, job_id),
+            )
+        )
+
+    def complete(self, job_id: str, result: dict) -> None:
+        now = time.time()
+        self._write(
+            lambda db: db.execute(
+                "UPDATE jobs SET status = 'done', result = ?, error = NULL, "
+                "updated_at = ?, expires_at = ? WHERE id = ?",
+                (json.dumps(result), now, now + self.result_ttl_seconds, job_id),
+            )
+        )
+
+    def fail(self, job_id: str, error: str, attempt: int, retry: bool = True) -> None:
+        """
+        Requeue after an error, or fail for good once out of attempts
+        (or at once without retry)
+        """
+        now = time.time()
+        if retry and attempt < self.max_attempts:
+            sql = (
+                "UPDATE jobs SET status = 'queued', error = ?, updated_at = ?, "
+                "lease_expires_at = NULL WHERE id = ?"
+            )
+            params = (error, now, job_id)
+        else:
+            sql = (
+                "UPDATE jobs SET status = 'failed', error = ?, updated_at = ?, "
+                "expires_at = ? WHERE id = ?"
+            )
+            params = (error, now, now + self.result_ttl_seconds, job_id)
+        self._write(lambda db: db.execute(sql, params))
+
+    def release(self, job_id: str) -> None:
+        """
+        Put a job back without using up an attempt (graceful shutdown)
+        """
+        now = time.time()
+        self._write(
+            lambda db: db.execute(
+                "UPDATE jobs SET status = 'queued', attempts = MAX(attempts - 1, 0), "
+                "lease_expires_at = NULL, updated_at = ? "
+                "WHERE id = ? AND status = 'running'",
+                (now, job_id),
+            )
+        )
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        return self._write(
+            lambda db: db.execute(
+                "DELETE FROM jobs WHERE expires_at IS NOT NULL AND expires_at < ?",
+                (now,),
+            ).rowcount
+        )
+
+
+class JobWorkerPool:
+    """
+    `size` asyncio workers that claim jobs and run handlers[kind](payload).
+    A handler's return value is the job result; it raises to fail the job.
+    The pool size is the cap on concurrently running jobs in this process.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Dict[str, Callable[[dict], Awaitable[dict]]],
+        size: int = JOB_WORKERS,
+        poll_seconds: float = JOB_POLL_SECONDS,
+    ):
+        self.queue = queue
+        self.handlers = handlers
+        self.size = size
+        self.poll_seconds = poll_seconds
+        self._tasks: list = []
+
+    def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.size)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.queue.lease_seconds / 3)
+            await asyncio.to_thread(self.queue.renew, job_id)
+
+    async def _run(self, job: dict) -> None:
+        heartbeat = asyncio.create_task(self._heartbeat(job["id"]))
+        try:
+            handler = self.handlers[job["kind"]]
+            result = await handler(job["payload"])
+        except asyncio.CancelledError:
+            await asyncio.to_thread(self.queue.release, job["id"])
+            raise
+        except JobFailed as e:
+            await asyncio.to_thread(
+                self.queue.fail, job["id"], str(e), job["attempt"], e.retry
+            )
+        except Exception as e:
+            await asyncio.to_thread(self.queue.fail, job["id"], str(e), job["attempt"])
+        else:
+            await asyncio.to_thread(self.queue.complete, job["id"], result)
+        finally:
+            heartbeat.cancel()
+
+    async def _worker(self) -> None:
+        last_purge = 0.0
+        while True:
+            if time.monotonic() - last_purge > 60:
+                await asyncio.to_thread(self.queue.purge_expired)
+                last_purge = time.monotonic()
+            job = await asyncio.to_thread(self.queue.claim)
+            if job is None:
+                await asyncio.sleep(self.poll_seconds)
+                continue
+            await self._run(job)
+
+
+_queue: Optional[JobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = JobQueue()
+    return _queue
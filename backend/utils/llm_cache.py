@@ -0,0 +1,326 @@
+# backend/utils/llm_cache.py
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Cache settings (override with environment variables)
+CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") not in ("0", "false", "False")
+CACHE_PATH = os.getenv("LLM_CACHE_PATH", "data/cache/llm_cache.sqlite3")
+CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+CACHE_MEMORY_ITEMS = int(os.getenv("LLM_CACHE_MEMORY_ITEMS", "256"))
+CACHE_MAX_DISK_BYTES = int(os.getenv("LLM_CACHE_MAX_DISK_MB", "256")) * 1024 * 1024
+
+
+def make_cache_key(prompt: str, model_name: str, generation_config: dict) -> str:
+    """
+    Stable hash of everything that determines a Gemini response
+    """
+    payload = json.dumps(
+        {
+            "prompt": prompt,
+            "model": model_name,
+            "generation_config": generation_config or {},
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    Two-tier response cache: in-memory LRU in front of a SQLite table.
+    Identical in-flight requests are coalesced into a single upstream call.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = CACHE_PATH,
+        ttl_seconds: float = CACHE_TTL_SECONDS,
+        memory_items: int = CACHE_MEMORY_ITEMS,
+        max_disk_bytes: int = CACHE_MAX_DISK_BYTES,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.memory_items = memory_items
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory: "OrderedDict[str, tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: dict = {}
+        self._inflight_async: dict = {}
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "stores": 0,
+            "store_errors": 0,
+            "evictions": 0,
+        }
+
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """)
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_cache_access ON llm_cache (last_access)"
+            )
+            self._db.commit()
+
+    # --- Lookup / store ---
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, expires_at = row
+                    if expires_at > now:
+                        self._db.execute(
+                            "UPDATE llm_cache SET last_access = ? WHERE key = ?",
+                            (now, key),
+                        )
+                        self._db.commit()
+                        self._remember(key, value, expires_at)
+                        self._counters["disk_hits"] += 1
+                        return value
+                    self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self._counters["misses"] += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        with self._lock:
+            self._remember(key, value, expires_at)
+            self._counters["stores"] += 1
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?)",
+                    (key, value, len(value.encode("utf-8")), expires_at, now),
+                )
+                self._evict_disk(now)
+                self._db.commit()
+
+    async def get_async(self, key: str) -> Optional[str]:
+        """
+        get() in a worker thread, so SQLite reads stay off the event loop
+        """
+        return await asyncio.to_thread(self.get, key)
+
+    async def set_async(self, key: str, value: str) -> None:
+        await asyncio.to_thread(self.set, key, value)
+
+    def _store_computed(self, key: str, value: str) -> None:
+        # The caller gets a freshly computed value even if caching it fails
+        try:
+            self.set(key, value)
+        except Exception:
+            logger.exception("Failed to cache LLM response under %s", key)
+            with self._lock:
+                self._counters["store_errors"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache")
+                self._db.commit()
+
+    def _remember(self, key: str, value: str, expires_at: float) -> None:
+        # Caller holds self._lock
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _evict_disk(self, now: float) -> None:
+        # Caller holds self._lock: drop expired rows, then least recently used
+        # rows until the table fits the byte budget
+        expired = self._db.execute(
+            "DELETE FROM llm_cache WHERE expires_at <= ?", (now,)
+        ).rowcount
+        self._counters["evictions"] += max(expired, 0)
+
+        total = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM llm_cache"
+        ).fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        for key, size in self._db.execute(
+            "SELECT key, size FROM llm_cache ORDER BY last_access ASC"
+        ).fetchall():
+            if total <= self.max_disk_bytes:
+                break
+            self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            total -= size
+            self._counters["evictions"] += 1
+
+    # --- Single-flight helpers ---
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], str],
+        should_store: Callable[[str], bool] = bool,
+    ) -> str:
+        """
+        Return the cached value for key, or call compute() once even if several
+        threads ask for the same key at the same time
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            waiter = self._inflight.get(key)
+            if waiter is None:
+                waiter = {"event": threading.Event(), "value": None, "error": None}
+                self._inflight[key] = waiter
+                leader = True
+            else:
+                self._counters["coalesced"] += 1
+                leader = False
+
+        if not leader:
+            waiter["event"].wait()
+            if waiter["error"] is not None:
+                raise waiter["error"]
+            return waiter["value"]
+
+        try:
+            value = compute()
+            if should_store(value):
+                self._store_computed(key, value)
+            waiter["value"] = value
+            return value
+        except Exception as e:
+            waiter["error"] = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            waiter["event"].set()
+
+    async def get_or_compute_async(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[str]],
+        should_store: Callable[[str], bool] = bool,
+    ) -> str:
+        """
+        Async counterpart of get_or_compute: concurrent awaiters of the same
+        key share one upstream call. If the task making the call is
+        cancelled, its waiters are not: one of them makes the call instead.
+        """
+        cached = await self.get_async(key)
+        if cached is not None:
+            return cached
+
+        pending = self._inflight_async.get(key)
+        if pending is not None:
+            self._counters["coalesced"] += 1
+        while pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # Cancelled ourselves (not the leader): propagate
+                if not pending.cancelled():
+                    raise
+            pending = self._inflight_async.get(key)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight_async[key] = future
+        try:
+            value = await compute()
+            future.set_result(value)
+            if should_store(value):
+                await asyncio.to_thread(self._store_computed, key, value)
+            return value
+        except asyncio.CancelledError:
+            # Waiters see a cancelled future and retry; no-op once resolved
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else is waiting
+            future.exception()
+            raise
+        finally:
+            if self._inflight_async.get(key) is future:
+                del self._inflight_async[key]
+
+    # --- Introspection ---
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            disk_items = disk_bytes = 0
+            if self._db is not None:
+                disk_items, disk_bytes = self._db.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+                ).fetchone()
+            memory_items = len(self._memory)
+
+        hits = counters["memory_hits"] + counters["disk_hits"]
+        lookups = hits + counters["misses"]
+        return {
+            **counters,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_items": memory_items,
+            "disk_items": disk_items,
+            "disk_bytes": disk_bytes,
+        }
+
+
+_cache: Optional[LLMCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> Optional[LLMCache]:
+    """
+    Process-wide cache instance, or None when caching is disabled
+    """
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMCache()
+    return _cache
@@ -0,0 +1,306 @@
+# backend/utils/llm_client.py
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import AsyncIterator, Callable, Dict, Optional
+
+from utils.llm_cache import get_cache, make_cache_key
+from utils.llm_scheduler import get_scheduler
+from utils.metrics import (
+    LLM_CACHE_LOOKUPS,
+    LLM_JSON_PARSE,
+    LLM_REQUEST_SECONDS,
+    LLM_REQUESTS,
+)
+from utils.prompt_builder import estimate_tokens
+from utils.model_registry import register_model
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+# "gemini", or "fake" for the local stand-in in utils/fake_llm.py
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")
+
+_models: dict = {}
+_client_lock = threading.Lock()
+
+
+def get_generative_model(model_name: str = DEFAULT_MODEL):
+    """
+    Shared GenerativeModel for model_name. The Gemini SDK is imported and
+    configured once, on first use, for every LLM module. With
+    LLM_BACKEND=fake, a local FakeGenerativeModel is returned instead.
+    """
+    model = _models.get(model_name)
+    if model is None:
+        with _client_lock:
+            model = _models.get(model_name)
+            if model is None and LLM_BACKEND == "fake":
+                from utils.fake_llm import FakeGenerativeModel
+
+                model = _models[model_name] = FakeGenerativeModel(model_name)
+            elif model is None:
+                import google.generativeai as genai
+
+                if not _models:
+                    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+                model = _models[model_name] = genai.GenerativeModel(model_name)
+    return model
+
+
+# Lets warm-up import and configure the SDK ahead of the first request
+register_model("gemini_client", get_generative_model)
+
+
+# Token accounting per call site, reported by GET /llm/stats
+_usage: Dict[str, Dict[str, int]] = {}
+_usage_lock = threading.Lock()
+
+
+def _site_usage(call_site: str) -> Dict[str, int]:
+    # Caller holds _usage_lock
+    return _usage.setdefault(
+        call_site,
+        {
+            "calls": 0,
+            "llm_calls": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "max_input_tokens": 0,
+            "max_output_tokens": 0,
+        },
+    )
+
+
+def _count_call(call_site: str) -> None:
+    with _usage_lock:
+        _site_usage(call_site)["calls"] += 1
+
+
+def _record_usage(call_site: str, prompt: str, response) -> int:
+    """
+    Record the tokens of a fresh Gemini response, from usage_metadata when
+    the SDK reports it, otherwise estimated. Returns the total.
+    """
+    usage = getattr(response, "usage_metadata", None)
+    input_tokens = getattr(usage, "prompt_token_count", None) or estimate_tokens(prompt)
+    output_tokens = getattr(usage, "candidates_token_count", None) or estimate_tokens(
+        response.text
+    )
+    with _usage_lock:
+        site = _site_usage(call_site)
+        site["llm_calls"] += 1
+        site["input_tokens"] += input_tokens
+        site["output_tokens"] += output_tokens
+        site["max_input_tokens"] = max(site["max_input_tokens"], input_tokens)
+        site["max_output_tokens"] = max(site["max_output_tokens"], output_tokens)
+    return input_tokens + output_tokens
+
+
+@contextmanager
+def _observe_llm_request(call_site: str):
+    LLM_CACHE_LOOKUPS.inc(call_site, "miss")
+    start = time.perf_counter()
+    try:
+        yield
+        LLM_REQUESTS.inc(call_site, "success")
+    except Exception:
+        LLM_REQUESTS.inc(call_site, "error")
+        raise
+    finally:
+        LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, call_site)
+
+
+def usage_stats() -> Dict[str, dict]:
+    """
+    Per call site: requests (calls), cache misses sent to Gemini (llm_calls)
+    and their input/output token totals, averages and maxima
+    """
+    with _usage_lock:
+        stats = {site: dict(counts) for site, counts in _usage.items()}
+    for counts in stats.values():
+        sent = counts["llm_calls"] or 1
+        counts["avg_input_tokens"] = round(counts["input_tokens"] / sent, 1)
+        counts["avg_output_tokens"] = round(counts["output_tokens"] / sent, 1)
+    return stats
+
+
+def _should_store(
+    validate: Optional[Callable[[str], object]], call_site: str
+) -> Callable[[str], bool]:
+    # Only cache non-empty responses that pass the caller's validation;
+    # called once per fresh response, so it also feeds the parse metric
+    def should_store(text: str) -> bool:
+        if not text or not text.strip():
+            valid = False
+        elif validate is None:
+            return True
+        else:
+            try:
+                validate(text)
+                valid = True
+            except Exception:
+                valid = False
+        if validate is not None:
+            LLM_JSON_PARSE.inc(call_site, "ok" if valid else "error")
+        return valid
+
+    return should_store
+
+
+def generate_text(
+    prompt: str,
+    model_name: str = DEFAULT_MODEL,
+    generation_config: Optional[dict] = None,
+    validate: Optional[Callable[[str], object]] = None,
+    call_site: str = "default",
+) -> str:
+    """
+    Call Gemini and return the response text, served from the LLM cache
+    when an identical prompt/model/config was answered before.
+    `validate` is called on fresh responses; if it raises, the response is
+    returned but not cached. Token usage is accounted under `call_site`.
+    """
+
+    def call(timeout: float):
+        model = get_generative_model(model_name)
+        return model.generate_content(
+            prompt,
+            generation_config=generation_config,
+            request_options={"timeout": timeout},
+        )
+
+    sent = []
+
+    def compute() -> str:
+        sent.append(True)
+        scheduler = get_scheduler()
+        estimated = estimate_tokens(prompt)
+        with _observe_llm_request(call_site):
+            response = scheduler.run(call, estimated_tokens=estimated)
+        scheduler.reconcile_tokens(estimated, _record_usage(call_site, prompt, response))
+        return response.text
+
+    _count_call(call_site)
+    should_store = _should_store(validate, call_site)
+    cache = get_cache()
+    if cache is None:
+        text = compute()
+        should_store(text)
+        return text
+    key = make_cache_key(prompt, model_name, generation_config)
+    text = cache.get_or_compute(key, compute, should_store)
+    if not sent:
+        LLM_CACHE_LOOKUPS.inc(call_site, "hit")
+    return text
+
+
+async def generate_text_async(
+    prompt: str,
+    model_name: str = DEFAULT_MODEL,
+    generation_config: Optional[dict] = None,
+    validate: Optional[Callable[[str], object]] = None,
+    call_site: str = "default",
+) -> str:
+    """
+    Async variant of generate_text
+    """
+
+    def call(timeout: float):
+        model = get_generative_model(model_name)
+        return model.generate_content_async(
+            prompt,
+            generation_config=generation_config,
+            request_options={"timeout": timeout},
+        )
+
+    sent = []
+
+    async def compute() -> str:
+        sent.append(True)
+        scheduler = get_scheduler()
+        estimated = estimate_tokens(prompt)
+        with _observe_llm_request(call_site):
+            response = await scheduler.run_async(call, estimated_tokens=estimated)
+        scheduler.reconcile_tokens(estimated, _record_usage(call_site, prompt, response))
+        return response.text
+
+    _count_call(call_site)
+    should_store = _should_store(validate, call_site)
+    cache = get_cache()
+    if cache is None:
+        text = await compute()
+        should_store(text)
+        return text
+    key = make_cache_key(prompt, model_name, generation_config)
+    text = await cache.get_or_compute_async(key, compute, should_store)
+    if not sent:
+        LLM_CACHE_LOOKUPS.inc(call_site, "hit")
+    return text
+
+
+def _chunk_text(chunk) -> str:
+    # The SDK raises for chunks without text (e.g. only a finish reason)
+    try:
+        return chunk.text
+    except ValueError:
+        return ""
+
+
+async def stream_text_async(
+    prompt: str,
+    model_name: str = DEFAULT_MODEL,
+    generation_config: Optional[dict] = None,
+    validate: Optional[Callable[[str], object]] = None,
+    call_site: str = "default",
+) -> AsyncIterator[str]:
+    """
+    Streaming variant of generate_text_async: yields the response text in
+    pieces as Gemini generates it. A cached answer is yielded in one piece;
+    a fresh one is cached once complete (if it validates). The scheduler
+    retries only until the stream opens, before anything has been yielded;
+    the stream holds its in-flight slot until it is consumed or closed.
+    """
+
+    def call(timeout: float):
+        model = get_generative_model(model_name)
+        return model.generate_content_async(
+            prompt,
+            generation_config=generation_config,
+            stream=True,
+            request_options={"timeout": timeout},
+        )
+
+    _count_call(call_site)
+    cache = get_cache()
+    key = make_cache_key(prompt, model_name, generation_config)
+    cached = await cache.get_async(key) if cache is not None else None
+    if cached is not None:
+        LLM_CACHE_LOOKUPS.inc(call_site, "hit")
+        yield cached
+        return
+
+    scheduler = get_scheduler()
+    estimated = estimate_tokens(prompt)
+    parts = []
+    with _observe_llm_request(call_site):
+        response = await scheduler.run_async(
+            call, estimated_tokens=estimated, keep_slot=True
+        )
+        try:
+            async for chunk in response:
+                text = _chunk_text(chunk)
+                if text:
+                    parts.append(text)
+                    yield text
+        finally:
+            scheduler.release_slot()
+    text = "".join(parts)
+    usage = getattr(response, "usage_metadata", None)
+    scheduler.reconcile_tokens(
+        estimated,
+        _record_usage(call_site, prompt, SimpleNamespace(text=text, usage_metadata=usage)),
+    )
+    if _should_store(validate, call_site)(text) and cache is not None:
+        await cache.set_async(key, text)
@@ -1,20 +1,22 @@
 # backend/utils/llm_jd_parser.py
 
-import google.generativeai as genai
 import json
 import os
 
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+from utils.llm_client import generate_text, generate_text_async
+from utils.metrics import timed
+from utils.prompt_builder import render_prompt, truncate_to_tokens
 
+# Tokens of job description text sent to the LLM
+MAX_JD_TOKENS = int(os.getenv("JD_PROMPT_TOKENS", "2500"))
+
+GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "temperature": 0.2,
+}
 
-def parse_jd_with_llm(jd_text: str) -> dict:
-    """
-    Use Gemini to extract structured requirements from job description
-    """
-    model = genai.GenerativeModel("gemini-2.5-flash")
 
-    prompt = (
-        """
+PROMPT_TEMPLATE = """
     You are an expert job analyst. Extract the following from the job description.
     Return only valid JSON. No markdown, no explanation.
 
@@ -27,30 +29,67 @@ def parse_jd_with_llm(jd_text: str) -> dict:
     - key_responsibilities (list of 3-5 bullets)
 
     Job Description:
+    {jd_text}
     """
-        + jd_text[:10000]
+
+
+def _build_prompt(jd_text: str) -> str:
+    return render_prompt(
+        PROMPT_TEMPLATE, jd_text=truncate_to_tokens(jd_text, MAX_JD_TOKENS)
     )
 
+
+def _parse_response(text: str) -> dict:
+    text = text.strip()
+
+    if text.startswith("```json"):
+        text = text[7:]
+    if text.endswith("```"):
+        text = text[:-3]
+
+    parsed = json.loads(text)
+    return {"success": True, "data": parsed}
+
+
+def _error_result(error: Exception, text) -> dict:
+    return {
+        "success": False,
+        "error": str(error),
+        "raw_output": text if text is not None else "No response",
+    }
+
+
+@timed("jd_parse")
+def parse_jd_with_llm(jd_text: str) -> dict:
+    """
+    Use Gemini to extract structured requirements from job description
+    """
+    text = None
     try:
-        response = model.generate_content(
-            prompt,
-            generation_config={
-                "response_mime_type": "application/json",
-                "temperature": 0.2,
-            },
+        text = generate_text(
+            _build_prompt(jd_text),
+            generation_config=GENERATION_CONFIG,
+            validate=_parse_response,
+            call_site="jd_parser",
         )
-        text = response.text.strip()
+        return _parse_response(text)
+    except Exception as e:
+        return _error_result(e, text)
 
-        if text.startswith("```json"):
-            text = text[7:]
-        if text.endswith("```"):
-            text = text[:-3]
 
-        parsed = json.loads(text)
-        return {"success": True, "data": parsed}
+@timed("jd_parse")
+async def parse_jd_with_llm_async(jd_text: str) -> dict:
+    """
+    Async variant of parse_jd_with_llm that does not block the event loop
+    """
+    text = None
+    try:
+        text = await generate_text_async(
+            _build_prompt(jd_text),
+            generation_config=GENERATION_CONFIG,
+            validate=_parse_response,
+            call_site="jd_parser",
+        )
+        return _parse_response(text)
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "raw_output": getattr(response, "text", "No response"),
-        }
+        return _error_result(e, text)
@@ -1,23 +1,25 @@
 # backend/utils/llm_matcher.py
 
-import google.generativeai as genai
 import json
-import os
 
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+from utils.llm_client import generate_text, generate_text_async
+from utils.metrics import timed
+from utils.prompt_builder import compact_json, render_prompt
 
+GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "temperature": 0.2,
+}
 
-def run_llm_match(resume_data: dict, jd_data: dict) -> dict:
-    model = genai.GenerativeModel("gemini-2.5-flash")
 
-    prompt = f"""
+PROMPT_TEMPLATE = """
     You are a senior hiring expert. Compare the candidate's resume to the job description.
 
     Resume:
-    {json.dumps(resume_data, indent=2)}
+    {resume}
 
     Job:
-    {json.dumps(jd_data, indent=2)}
+    {job}
 
     Answer in valid JSON format:
     {{
@@ -30,26 +32,53 @@ def run_llm_match(resume_data: dict, jd_data: dict) -> dict:
     }}
     """
 
+
+def _build_prompt(resume_data: dict, jd_data: dict) -> str:
+    return render_prompt(
+        PROMPT_TEMPLATE, resume=compact_json(resume_data), job=compact_json(jd_data)
+    )
+
+
+def _parse_response(text: str) -> dict:
+    # Try to parse as JSON
+    try:
+        parsed = json.loads(text.strip())
+        return {"success": True, "feedback": parsed}  # Return as dict
+    except json.JSONDecodeError as e:
+        # If JSON parsing fails, return raw text as fallback
+        return {
+            "success": False,
+            "error": f"LLM returned invalid JSON: {str(e)}",
+            "feedback": text.strip(),  # Raw string fallback
+        }
+
+
+@timed("match")
+def run_llm_match(resume_data: dict, jd_data: dict) -> dict:
     try:
-        response = model.generate_content(
-            prompt,
-            generation_config={
-                "response_mime_type": "application/json",
-                "temperature": 0.2,
-            },
+        text = generate_text(
+            _build_prompt(resume_data, jd_data),
+            generation_config=GENERATION_CONFIG,
+            validate=json.loads,
+            call_site="matcher",
         )
+        return _parse_response(text)
+    except Exception as e:
+        return {"success": False, "error": str(e)}
 
-        # Try to parse as JSON
-        try:
-            parsed = json.loads(response.text.strip())
-            return {"success": True, "feedback": parsed}  # Return as dict
-        except json.JSONDecodeError as e:
-            # If JSON parsing fails, return raw text as fallback
-            return {
-                "success": False,
-                "error": f"LLM returned invalid JSON: {str(e)}",
-                "feedback": response.text.strip(),  # Raw string fallback
-            }
 
+@timed("match")
+async def run_llm_match_async(resume_data: dict, jd_data: dict) -> dict:
+    """
+    Async variant of run_llm_match that does not block the event loop
+    """
+    try:
+        text = await generate_text_async(
+            _build_prompt(resume_data, jd_data),
+            generation_config=GENERATION_CONFIG,
+            validate=json.loads,
+            call_site="matcher",
+        )
+        return _parse_response(text)
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -1,23 +1,59 @@
 # backend/utils/llm_resume_parser.py
 
-import google.generativeai as genai
+import asyncio
 import json
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
 
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+from utils.llm_client import generate_text, generate_text_async
+from utils.metrics import timed
+from utils.prompt_builder import (
+    CHARS_PER_TOKEN,
+    estimate_tokens,
+    render_prompt,
+    split_to_tokens,
+    truncate_to_tokens,
+)
 
+# Tokens of resume text sent in a single parse call (when chunking is off)
+MAX_RESUME_TOKENS = int(os.getenv("RESUME_PROMPT_TOKENS", "7500"))
+# Longer resumes are split into chunks of about this size, parsed
+# concurrently and merged; RESUME_MAX_CHUNKS=1 turns chunking off
+RESUME_CHUNK_TOKENS = int(os.getenv("RESUME_CHUNK_TOKENS", "3000"))
+RESUME_MAX_CHUNKS = int(os.getenv("RESUME_MAX_CHUNKS", "8"))
+# Resume sections sent to the parser (see section_segmenter); references,
+# publications, hobbies etc. are left out
+RESUME_PARSER_SECTIONS = (
+    "header",
+    "summary",
+    "experience",
+    "education",
+    "skills",
+    "projects",
+    "certifications",
+    "awards",
+)
+# Achievements kept after merging chunks
+MAX_MERGED_ACHIEVEMENTS = 8
 
-def parse_resume_with_llm(resume_text: str) -> dict:
-    """
-    Use Gemini to extract structured data from resume
-    """
-    model = genai.GenerativeModel("gemini-2.5-flash")
+# Resume text the parser reads; anything past it is left out and the
+# result is flagged `truncated`
+RESUME_PARSE_CHARS = (
+    RESUME_CHUNK_TOKENS * RESUME_MAX_CHUNKS if RESUME_MAX_CHUNKS > 1 else MAX_RESUME_TOKENS
+) * CHARS_PER_TOKEN
+# Extraction can stop at this many characters: one chunk past the parse
+# budget, so text the parser leaves out is still seen and reported
+MAX_RESUME_CHARS = RESUME_PARSE_CHARS + RESUME_CHUNK_TOKENS * CHARS_PER_TOKEN
 
-    prompt = (
-        """
-    You are an expert resume parser. Extract the following fields from the resume text below.
-    Return only valid JSON. No markdown, no explanation.
+GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "temperature": 0.2,
+}
 
+
+FIELDS = """
     Fields to extract:
     - name (string)
     - job_title (string, best-fit title)
@@ -25,34 +61,256 @@ def parse_resume_with_llm(resume_text: str) -> dict:
     - education (list of strings, e.g., "BSc Computer Engineering")
     - technical_skills (object with keys: languages, ml_frameworks, cloud, mlops, databases, tools)
     - key_projects_or_achievements (list of 3-5 strong bullet points)
+    """
+
+PROMPT_TEMPLATE = """
+    You are an expert resume parser. Extract the following fields from the resume text below.
+    Return only valid JSON. No markdown, no explanation.
+
+    {fields}
 
     Resume Text:
+    {resume_text}
+    """
+
+CHUNK_PROMPT_TEMPLATE = """
+    You are an expert resume parser. The text below is part {part} of {parts} of one long resume.
+    Extract the following fields from this part only; use null or empty lists for anything it does not contain.
+    Return only valid JSON. No markdown, no explanation.
+
+    {fields}
+
+    Resume Text (part {part} of {parts}):
+    {resume_text}
+    """
+
+_FIELDS_TEXT = render_prompt(FIELDS)
+
+
+def _build_prompt(resume_text: str) -> str:
+    return render_prompt(
+        PROMPT_TEMPLATE,
+        fields=_FIELDS_TEXT,
+        resume_text=truncate_to_tokens(resume_text, MAX_RESUME_TOKENS),
+    )
+
+
+def _chunk_resume(resume_text: str) -> Tuple[List[str], bool]:
+    """
+    One chunk for short resumes (or with chunking off); otherwise evenly
+    sized chunks cut at page, paragraph or line breaks. Also returns whether
+    text had to be left out (longer than RESUME_MAX_CHUNKS chunks, or than
+    MAX_RESUME_TOKENS with chunking off).
+    """
+    if RESUME_MAX_CHUNKS <= 1:
+        return [resume_text], len(resume_text.strip()) > RESUME_PARSE_CHARS
+    tokens = estimate_tokens(resume_text)
+    if tokens <= RESUME_CHUNK_TOKENS:
+        return [resume_text], False
+    count = min(RESUME_MAX_CHUNKS, -(-tokens // RESUME_CHUNK_TOKENS))
+    # Balanced sizes, so no chunk (and so no call) is much slower than the rest
+    target = min(RESUME_CHUNK_TOKENS, int(tokens / count * 1.15) + 1)
+    if tokens > RESUME_CHUNK_TOKENS * RESUME_MAX_CHUNKS:
+        chunks = split_to_tokens(resume_text, RESUME_CHUNK_TOKENS)
+        return chunks[:RESUME_MAX_CHUNKS], True
+    chunks = split_to_tokens(resume_text, target)
+    if len(chunks) > RESUME_MAX_CHUNKS:
+        # Cutting at breaks left a small remainder: the last chunk takes it
+        chunks[RESUME_MAX_CHUNKS - 1 :] = ["\n\n".join(chunks[RESUME_MAX_CHUNKS - 1 :])]
+    return chunks, False
+
+
+def resume_truncated(resume_text: str) -> bool:
+    """
+    Whether parsing this text leaves part of it out
     """
-        + resume_text[:30000]
-    )  # Limit length
+    return _chunk_resume(resume_text)[1]
+
+
+def _build_chunk_prompt(chunk: str, part: int, parts: int) -> str:
+    return render_prompt(
+        CHUNK_PROMPT_TEMPLATE,
+        fields=_FIELDS_TEXT,
+        part=part,
+        parts=parts,
+        resume_text=chunk,
+    )
+
+
+def _dedupe_key(value) -> str:
+    return re.sub(r"[\W_]+", " ", str(value)).strip().lower()
+
+
+def _merge_values(values: list):
+    values = [v for v in values if v not in (None, "", [], {})]
+    if not values:
+        return None
+    if all(isinstance(v, dict) for v in values):
+        keys = list(dict.fromkeys(k for v in values for k in v))
+        merged = {k: _merge_values([v.get(k) for v in values]) for k in keys}
+        return {k: v for k, v in merged.items() if v is not None}
+    if any(isinstance(v, list) for v in values):
+        # Union in first-seen order, ignoring case and punctuation
+        seen, merged = set(), []
+        for v in values:
+            for item in v if isinstance(v, list) else [v]:
+                key = _dedupe_key(item)
+                if key and key not in seen:
+                    seen.add(key)
+                    merged.append(item)
+        return merged
+    numbers = [_as_number(v) for v in values]
+    if all(n is not None for n in numbers):
+        return max(numbers)
+    # Text fields (name, job title): the earliest chunk that has one wins
+    return values[0]
+
+
+def _as_number(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*\+?\s*", str(value))
+    if match is None:
+        return None
+    number = float(match.group(1))
+    return int(number) if number.is_integer() else number
+
 
+def merge_parsed_chunks(parts: List[dict]) -> dict:
+    """
+    Deterministic merge of per-chunk parses: lists (skills, education,
+    achievements) are unioned without duplicates, numbers (years) take the
+    max, and text fields come from the first chunk that has them
+    """
+    merged = _merge_values(parts) or {}
+    achievements = merged.get("key_projects_or_achievements")
+    if achievements:
+        merged["key_projects_or_achievements"] = achievements[:MAX_MERGED_ACHIEVEMENTS]
+    return merged
+
+
+def _merge_results(results: List[dict], truncated: bool) -> dict:
+    """
+    Merge the chunks that parsed; `failed_chunks` lists the 1-based parts
+    that did not. Fails only when every chunk failed.
+    """
+    parsed = [r["data"] for r in results if r["success"]]
+    if not parsed:
+        return results[0]
+    merged = {"success": True, "data": merge_parsed_chunks(parsed), "truncated": truncated}
+    failed = [i + 1 for i, r in enumerate(results) if not r["success"]]
+    if failed:
+        merged["failed_chunks"] = failed
+    return merged
+
+
+def _parse_response(text: str) -> dict:
+    text = text.strip()
+
+    # Clean up code block if present
+    if text.startswith("```json"):
+        text = text[7:]
+    if text.endswith("```"):
+        text = text[:-3]
+
+    # Parse JSON
+    parsed = json.loads(text)
+    return {"success": True, "data": parsed}
+
+
+def _error_result(error: Exception, text) -> dict:
+    return {
+        "success": False,
+        "error": str(error),
+        "raw_output": text if text is not None else "No response",
+    }
+
+
+@timed("resume_parse")
+def parse_resume_with_llm(resume_text: str) -> dict:
+    """
+    Use Gemini to extract structured data from resume. Long resumes are
+    parsed in chunks concurrently and merged; `truncated` is True when the
+    resume was longer than the parser reads, and `failed_chunks` lists
+    chunks left out because their parse failed.
+    """
+    chunks, truncated = _chunk_resume(resume_text)
+    if len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=len(chunks)) as pool:
+            results = list(
+                pool.map(
+                    lambda args: _parse_chunk(*args),
+                    [(chunk, i + 1, len(chunks)) for i, chunk in enumerate(chunks)],
+                )
+            )
+        return _merge_results(results, truncated)
+
+    text = None
     try:
-        response = model.generate_content(
-            prompt,
-            generation_config={
-                "response_mime_type": "application/json",
-                "temperature": 0.2,
-            },
+        text = generate_text(
+            _build_prompt(resume_text),
+            generation_config=GENERATION_CONFIG,
+            validate=_parse_response,
+            call_site="resume_parser",
         )
-        text = response.text.strip()
+        return {**_parse_response(text), "truncated": truncated}
+    except Exception as e:
+        return _error_result(e, text)
+
 
-        # Clean up code block if present
-        if text.startswith("```json"):
-            text = text[7:]
-        if text.endswith("```"):
-            text = text[:-3]
+@timed("resume_parse")
+async def parse_resume_with_llm_async(resume_text: str) -> dict:
+    """
+    Async variant of parse_resume_with_llm that does not block the event loop
+    """
+    chunks, truncated = _chunk_resume(resume_text)
+    if len(chunks) > 1:
+        results = await asyncio.gather(
+            *(
+                _parse_chunk_async(chunk, i + 1, len(chunks))
+                for i, chunk in enumerate(chunks)
+            )
+        )
+        return _merge_results(results, truncated)
+
+    text = None
+    try:
+        text = await generate_text_async(
+            _build_prompt(resume_text),
+            generation_config=GENERATION_CONFIG,
+            validate=_parse_response,
+            call_site="resume_parser",
+        )
+        return {**_parse_response(text), "truncated": truncated}
+    except Exception as e:
+        return _error_result(e, text)
 
-        # Parse JSON
-        parsed = json.loads(text)
-        return {"success": True, "data": parsed}
+
+def _parse_chunk(chunk: str, part: int, parts: int) -> dict:
+    text = None
+    try:
+        text = generate_text(
+            _build_chunk_prompt(chunk, part, parts),
+            generation_config=GENERATION_CONFIG,
+            validate=_parse_response,
+            call_site="resume_parser_chunk",
+        )
+        return _parse_response(text)
+    except Exception as e:
+        return _error_result(e, text)
+
+
+async def _parse_chunk_async(chunk: str, part: int, parts: int) -> dict:
+    text = None
+    try:
+        text = await generate_text_async(
+            _build_chunk_prompt(chunk, part, parts),
+            generation_config=GENERATION_CONFIG,
+            validate=_parse_response,
+            call_site="resume_parser_chunk",
+        )
+        return _parse_response(text)
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "raw_output": getattr(response, "text", "No response"),
-        }
+        return _error_result(e, text)
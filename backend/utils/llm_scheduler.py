@@ -0,0 +1,375 @@
+# backend/utils/llm_scheduler.py
+
+import asyncio
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Scheduler settings (override with environment variables; 0 disables a limit)
+LLM_MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", "8"))
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "0"))
+LLM_TOKENS_PER_MINUTE = float(os.getenv("LLM_TOKENS_PER_MINUTE", "0"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "0.5"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "20"))
+# Per-attempt timeout, and overall deadline including queueing and retries
+LLM_CALL_TIMEOUT_SECONDS = float(os.getenv("LLM_CALL_TIMEOUT_SECONDS", "60"))
+LLM_DEADLINE_SECONDS = float(os.getenv("LLM_DEADLINE_SECONDS", "120"))
+
+
+class SchedulerTimeout(TimeoutError):
+    """Raised when a call cannot finish before its deadline"""
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Provider throttling (429), transient 5xx, timeouts and connection errors
+    """
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError, ConnectionError)):
+        return not isinstance(error, SchedulerTimeout)
+    try:
+        from google.api_core import exceptions as api_exceptions
+    except ImportError:
+        return False
+    return isinstance(
+        error,
+        (
+            api_exceptions.TooManyRequests,
+            api_exceptions.ResourceExhausted,
+            api_exceptions.ServiceUnavailable,
+            api_exceptions.InternalServerError,
+            api_exceptions.DeadlineExceeded,
+        ),
+    )
+
+
+class TokenBucket:
+    """
+    Refills at rate_per_minute. reserve() always succeeds and returns how
+    long the caller must wait before its reservation is covered.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            return max(0.0, -self.tokens / self.rate)
+
+    def adjust(self, amount: float) -> None:
+        # Correct an earlier reservation once the real cost is known
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class _Slots:
+    """
+    Max-in-flight limit shared by threads and event-loop tasks. Released
+    slots are handed directly to the longest waiter (FIFO).
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self._waiters: deque = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def _take(self) -> bool:
+        # Caller holds self._lock
+        if self.limit <= 0 or (self.in_use < self.limit and not self._waiters):
+            self.in_use += 1
+            return True
+        return False
+
+    def acquire(self, timeout: float) -> bool:
+        with self._lock:
+            if self._take():
+                return True
+            event = threading.Event()
+            waiter = (event, None, None)
+            self._waiters.append(waiter)
+        if event.wait(max(timeout, 0)):
+            return True
+        with self._lock:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+                return False
+        # Granted just as the wait timed out
+        return True
+
+    async def acquire_async(self, timeout: float) -> bool:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._take():
+                return True
+            future = loop.create_future()
+            waiter = (None, future, loop)
+            self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(future), max(timeout, 0))
+            return True
+        except BaseException as e:
+            # Timed out or cancelled: leave the queue, or hand back a slot
+            # that was granted while we were giving up
+            with self._lock:
+                granted = waiter not in self._waiters
+                if not granted:
+                    self._waiters.remove(waiter)
+            if granted:
+                self.release()
+            if isinstance(e, asyncio.TimeoutError):
+                return False
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            if self._waiters:
+                event, future, loop = self._waiters.popleft()
+                if event is not None:
+                    event.set()
+                else:
+                    loop.call_soon_threadsafe(_grant, future)
+                return
+            self.in_use -= 1
+
+
+def _grant(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(True)
+
+
+class LLMScheduler:
+    """
+    Every outbound Gemini call goes through run()/run_async(): max-in-flight
+    limit, request and token budgets per minute, per-attempt timeouts,
+    jittered exponential backoff on retryable errors and an overall deadline.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = LLM_MAX_IN_FLIGHT,
+        requests_per_minute: float = LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = LLM_TOKENS_PER_MINUTE,
+        max_retries: int = LLM_MAX_RETRIES,
+        call_timeout: float = LLM_CALL_TIMEOUT_SECONDS,
+        deadline: float = LLM_DEADLINE_SECONDS,
+    ):
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.call_timeout = call_timeout
+        self.deadline = deadline
+        self._slots = _Slots(max_in_flight)
+        self._rpm = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self._tpm = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+
+        self._lock = threading.Lock()
+        self._rate_waiting = 0
+        self._waits: deque = deque(maxlen=1000)
+        self._counters = {
+            "requests": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "retries": 0,
+            "retryable_errors": 0,
+            "deadline_exceeded": 0,
+        }
+
+    # --- Helpers ---
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+    def _rate_wait(self, estimated_tokens: int) -> float:
+        wait = 0.0
+        if self._rpm is not None:
+            wait = max(wait, self._rpm.reserve(1))
+        if self._tpm is not None:
+            wait = max(wait, self._tpm.reserve(estimated_tokens))
+        return wait
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: uniform in [0, min(cap, base * 2^attempt)]
+        ceiling = min(LLM_BACKOFF_MAX_SECONDS, LLM_BACKOFF_BASE_SECONDS * 2**attempt)
+        return random.uniform(0, ceiling)
+
+    def _attempt_timeout(self, deadline_at: float) -> float:
+        remaining = deadline_at - time.monotonic()
+        if remaining <= 0:
+            self._count("deadline_exceeded")
+            raise SchedulerTimeout("LLM call deadline exceeded")
+        return min(self.call_timeout, remaining)
+
+    def _give_up(self, error: Exception, attempt: int, deadline_at: float) -> bool:
+        if not is_retryable(error):
+            return True
+        self._count("retryable_errors")
+        return attempt >= self.max_retries or time.monotonic() >= deadline_at
+
+    def release_slot(self) -> None:
+        """
+        Give back the slot kept by run_async(..., keep_slot=True)
+        """
+        self._slots.release()
+
+    def reconcile_tokens(self, estimated: int, actual: Optional[int]) -> None:
+        if self._tpm is not None and actual is not None:
+            self._tpm.adjust(actual - estimated)
+
+    # --- Sync ---
+
+    def run(
+        self,
+        call: Callable[[float], T],
+        estimated_tokens: int = 0,
+        deadline: Optional[float] = None,
+    ) -> T:
+        """
+        Run call(timeout_seconds) under the scheduler's limits
+        """
+        self._count("requests")
+        deadline_at = time.monotonic() + (deadline or self.deadline)
+        attempt = 0
+        while True:
+            queued_at = time.monotonic()
+            with self._lock:
+                self._rate_waiting += 1
+            try:
+                wait = self._rate_wait(estimated_tokens)
+                if time.monotonic() + wait >= deadline_at:
+                    self._count("deadline_exceeded")
+                    raise SchedulerTimeout("LLM rate limit wait exceeds deadline")
+                time.sleep(wait)
+            finally:
+                with self._lock:
+                    self._rate_waiting -= 1
+            if not self._slots.acquire(deadline_at - time.monotonic()):
+                self._count("deadline_exceeded")
+                raise SchedulerTimeout("Timed out waiting for an LLM slot")
+            self._waits.append(time.monotonic() - queued_at)
+
+            try:
+                result = call(self._attempt_timeout(deadline_at))
+                self._count("succeeded")
+                return result
+            except SchedulerTimeout:
+                self._count("failed")
+                raise
+            except Exception as e:
+                if self._give_up(e, attempt, deadline_at):
+                    self._count("failed")
+                    raise
+            finally:
+                self._slots.release()
+
+            self._count("retries")
+            time.sleep(min(self._backoff(attempt), max(0, deadline_at - time.monotonic())))
+            attempt += 1
+
+    # --- Async ---
+
+    async def run_async(
+        self,
+        call: Callable[[float], Awaitable[T]],
+        estimated_tokens: int = 0,
+        deadline: Optional[float] = None,
+        keep_slot: bool = False,
+    ) -> T:
+        """
+        Await call(timeout_seconds) under the scheduler's limits. With
+        keep_slot, a successful call keeps its in-flight slot until the
+        caller calls release_slot() (e.g. once a stream is consumed).
+        """
+        self._count("requests")
+        deadline_at = time.monotonic() + (deadline or self.deadline)
+        attempt = 0
+        while True:
+            queued_at = time.monotonic()
+            with self._lock:
+                self._rate_waiting += 1
+            try:
+                wait = self._rate_wait(estimated_tokens)
+                if time.monotonic() + wait >= deadline_at:
+                    self._count("deadline_exceeded")
+                    raise SchedulerTimeout("LLM rate limit wait exceeds deadline")
+                await asyncio.sleep(wait)
+            finally:
+                with self._lock:
+                    self._rate_waiting -= 1
+            if not await self._slots.acquire_async(deadline_at - time.monotonic()):
+                self._count("deadline_exceeded")
+                raise SchedulerTimeout("Timed out waiting for an LLM slot")
+            self._waits.append(time.monotonic() - queued_at)
+
+            held = False
+            try:
+                timeout = self._attempt_timeout(deadline_at)
+                result = await asyncio.wait_for(call(timeout), timeout)
+                self._count("succeeded")
+                held = keep_slot
+                return result
+            except SchedulerTimeout:
+                self._count("failed")
+                raise
+            except Exception as e:
+                if self._give_up(e, attempt, deadline_at):
+                    self._count("failed")
+                    raise
+            finally:
+                if not held:
+                    self._slots.release()
+
+            self._count("retries")
+            await asyncio.sleep(
+                min(self._backoff(attempt), max(0, deadline_at - time.monotonic()))
+            )
+            attempt += 1
+
+    # --- Introspection ---
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            rate_waiting = self._rate_waiting
+        waits = sorted(self._waits)
+        return {
+            **counters,
+            "in_flight": self._slots.in_use,
+            "max_in_flight": self.max_in_flight,
+            "queue_depth": self._slots.waiting + rate_waiting,
+            "wait_seconds": {
+                "avg": round(sum(waits) / len(waits), 4) if waits else 0.0,
+                "p95": round(waits[int(0.95 * (len(waits) - 1))], 4) if waits else 0.0,
+                "max": round(waits[-1], 4) if waits else 0.0,
+            },
+        }
+
+
+_scheduler: Optional[LLMScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> LLMScheduler:
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = LLMScheduler()
+    return _scheduler
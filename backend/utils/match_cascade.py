@@ -0,0 +1,146 @@
+# backend/utils/match_cascade.py
+
+import os
+import re
+from typing import Dict, Optional
+
+from utils.experience_timeline import (
+    TIMELINE_MIN_CONFIDENCE,
+    resume_timeline,
+    timeline_years,
+)
+from utils.jd_parser import extract_experience
+from utils.match_pipeline import format_feedback, summarize_jd
+from utils.matcher import calculate_skill_match
+from utils.metrics import timed
+from utils.pdf_parser import extract_skills
+from utils.score_calculator import score_match
+from utils.section_segmenter import segment_text
+
+# Tier 1 scores every match locally; scores inside the uncertainty band
+# [CASCADE_LOW, CASCADE_HIGH] (and cases the local tier cannot judge) go on
+# to the LLM. Off by default: enable with MATCH_CASCADE=1 once the band has
+# been calibrated on real labels (benchmarks/calibrate_cascade.py).
+MATCH_CASCADE_ENABLED = os.getenv("MATCH_CASCADE", "0") == "1"
+CASCADE_LOW = int(os.getenv("CASCADE_LOW", "35"))
+CASCADE_HIGH = int(os.getenv("CASCADE_HIGH", "80"))
+
+# Resume sections the embedding skill check reads (the encoder only sees
+# the first few hundred tokens, so the skills section goes first)
+SKILL_CHECK_SECTIONS = ("skills", "summary", "experience", "projects")
+
+# Resume fields the LLM parse has and the local tier cannot fill; they are
+# null/empty in a local response and listed in its `missing_fields`
+LOCAL_MISSING_FIELDS = ("name", "job_title", "key_projects_or_achievements")
+
+_DEGREE_LINE = re.compile(
+    r"\b(degree|bachelor|master|ph\.?\s?d|doctorate|b\.?sc|m\.?sc|mba)\b", re.IGNORECASE
+)
+
+
+def _degree_lines(text: str) -> list:
+    return [line.strip() for line in text.splitlines() if _DEGREE_LINE.search(line)]
+
+
+def _required_years(jd_text: str) -> int:
+    found = re.match(r"\d+", extract_experience(jd_text))
+    return int(found.group()) if found else 0
+
+
+def _skill_check_text(sections: Dict[str, str], resume_text: str) -> str:
+    ordered = [sections[name] for name in SKILL_CHECK_SECTIONS if sections.get(name)]
+    return "\n".join(ordered) or resume_text
+
+
+@timed("local_match")
+def local_match(
+    resume_text: str, jd_text: str, sections: Optional[Dict[str, str]] = None
+) -> dict:
+    """
+    Tier 1: score a resume against a JD without the LLM. Skills come from
+    the taxonomy (pdf_parser.extract_skills), years from the resume's date
+    ranges and the JD's stated requirement, and the LLM's missing-skills
+    check is replaced by embedding similarity (calculate_skill_match).
+    Scored with score_match, like LLM-parsed data.
+
+    Returns the score plus `tier`: "local" when the score is outside the
+    uncertainty band, "llm" when it needs the LLM, and `reason`.
+    `decidable` is False when the local tier cannot judge at all (no known
+    skills in the JD, nothing scorable in the resume, undated experience),
+    whatever the band.
+    """
+    if sections is None:
+        sections = segment_text(resume_text)
+    jd_skills = extract_skills(jd_text)
+    timeline = resume_timeline(sections, resume_text)
+    required_years = _required_years(jd_text)
+
+    resume_data = {
+        "technical_skills": extract_skills(resume_text),
+        "years_of_experience": timeline_years(timeline),
+        "education": _degree_lines(sections.get("education") or resume_text),
+    }
+    jd_data = {
+        "job_title": None,
+        "required_years": required_years,
+        "required_education": _degree_lines(jd_text),
+        "required_skills": jd_skills,
+    }
+    semantic = calculate_skill_match(_skill_check_text(sections, resume_text), jd_skills)
+    feedback = {
+        "experience_met": resume_data["years_of_experience"] >= required_years,
+        "missing_required_skills": ", ".join(s["skill"] for s in semantic["missing_skills"]),
+    }
+    score = score_match(resume_data, jd_data, feedback)
+
+    decidable = True
+    if not jd_skills:
+        decidable, tier, reason = False, "llm", "no known skills in the job description"
+    elif not score["breakdown"]:
+        decidable, tier, reason = False, "llm", "no usable data in the resume"
+    elif required_years and timeline["confidence"] < TIMELINE_MIN_CONFIDENCE:
+        decidable, tier, reason = False, "llm", "experience could not be dated"
+    elif score["overall_score"] >= CASCADE_HIGH:
+        tier, reason = "local", "clear fit"
+    elif score["overall_score"] <= CASCADE_LOW:
+        tier, reason = "local", "clear mismatch"
+    else:
+        tier, reason = "llm", "borderline score"
+    return {
+        "tier": tier,
+        "reason": reason,
+        "decidable": decidable,
+        "resume_data": resume_data,
+        "jd_data": jd_data,
+        "feedback": feedback,
+        "overall_score": score["overall_score"],
+        "score_breakdown": score["breakdown"],
+    }
+
+
+def build_local_response(local: dict) -> dict:
+    """
+    /match response body for a match decided by the local tier. Same
+    schema as the LLM tier: fields the local tier cannot fill are null or
+    empty and listed in `missing_fields`, and the taxonomy skills (which
+    have no categories) sit under technical_skills.uncategorized.
+    """
+    resume_data = local["resume_data"]
+    parsed_resume = {
+        "name": None,
+        "job_title": None,
+        "years_of_experience": resume_data["years_of_experience"],
+        "education": resume_data["education"],
+        "technical_skills": {"uncategorized": resume_data["technical_skills"]},
+        "key_projects_or_achievements": [],
+    }
+    return {
+        "tier": "local",
+        "tier_reason": local["reason"],
+        "missing_fields": list(LOCAL_MISSING_FIELDS),
+        "job_summary": summarize_jd(local["jd_data"]),
+        "parsed_resume": parsed_resume,
+        "ai_feedback": format_feedback({"success": True, "feedback": local["feedback"]}),
+        "overall_score": local["overall_score"],
+        "score_breakdown": local["score_breakdown"],
+    }
@@ -0,0 +1,92 @@
+# backend/utils/match_pipeline.py
+
+from utils.llm_matcher import run_llm_match_async
+from utils.metrics import timed
+from utils.score_calculator import score_match
+
+
+def llm_error_response(label: str, parsed: dict) -> dict:
+    """
+    Error payload returned when an LLM parse step fails
+    """
+    return {
+        "error": f"Failed to parse {label} with LLM",
+        "details": parsed["error"],
+        "raw_output": parsed.get("raw_output", ""),
+    }
+
+
+def format_feedback(match_result: dict) -> str:
+    """
+    Turn the run_llm_match result into the feedback string shown to users
+    """
+    # Safely extract feedback (string or structured)
+    if not match_result["success"]:
+        return "Could not generate feedback. Please try again."
+
+    # Ensure ai_feedback is always a string
+    raw_feedback = match_result["feedback"]
+    if isinstance(raw_feedback, str):
+        return raw_feedback.strip()
+    if isinstance(raw_feedback, dict):
+        # Convert structured feedback to readable string
+        lines = []
+        if raw_feedback.get("experience_met") is not None:
+            status = "Yes" if raw_feedback["experience_met"] else "No"
+            lines.append(
+                f"1. Does the candidate meet the experience requirement?\n{status}"
+            )
+        if raw_feedback.get("missing_required_skills"):
+            lines.append(
+                f"2. Missing required skills:\n{raw_feedback['missing_required_skills']}"
+            )
+        if raw_feedback.get("underemphasized_skills"):
+            lines.append(
+                f"3. Underemphasized skills:\n{raw_feedback['underemphasized_skills']}"
+            )
+        if raw_feedback.get("suggested_bullet_points"):
+            lines.append("4. Suggested bullet points to add:")
+            for bullet in raw_feedback["suggested_bullet_points"]:
+                lines.append(f"• {bullet}")
+        return "\n\n".join(lines)
+    return str(raw_feedback)
+
+
+def summarize_jd(jd_data: dict) -> dict:
+    """
+    The job fields echoed back to the client
+    """
+    return {
+        "job_title": jd_data.get("job_title"),
+        "required_years": jd_data.get("required_years"),
+        "required_education": jd_data.get("required_education"),
+        "required_skills": jd_data.get("required_skills"),
+    }
+
+
+@timed("scoring")
+def build_match_response(resume_data: dict, jd_data: dict, match_result: dict) -> dict:
+    """
+    Score a finished LLM match and assemble the /match response body
+    """
+    ai_feedback = format_feedback(match_result)
+    score = score_match(
+        resume_data, jd_data, match_result["feedback"] if match_result["success"] else None
+    )
+
+    return {
+        "tier": "llm",
+        "job_summary": summarize_jd(jd_data),
+        "parsed_resume": resume_data,
+        "ai_feedback": ai_feedback,  # ✅ Always a string
+        "overall_score": score["overall_score"],
+        "score_breakdown": score["breakdown"],
+    }
+
+
+async def match_parsed_async(resume_data: dict, jd_data: dict) -> dict:
+    """
+    Run the LLM match on already-parsed resume and JD data and score it
+    """
+    match_result = await run_llm_match_async(resume_data, jd_data)
+    return build_match_response(resume_data, jd_data, match_result)
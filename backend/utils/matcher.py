@@ -1,27 +1,99 @@
 # backend/utils/matcher.py
 
-from sentence_transformers import SentenceTransformer
-from sentence_transformers.util import cos_sim
-import torch
+import os
 import re
+import threading
+from typing import List, Optional
 
-# Load model once at startup
-model = SentenceTransformer("all-MiniLM-L6-v2")
+import numpy as np
+
+from utils.dynamic_batcher import DynamicBatcher
+from utils.embedding_cache import EMBEDDING_CACHE_ENABLED, EmbeddingCache
+from utils.experience_timeline import (
+    TIMELINE_MIN_CONFIDENCE,
+    resume_timeline,
+    timeline_years,
+)
+from utils.model_registry import get_model, register_model
+from utils.section_segmenter import segment_text
+
+MODEL_NAME = os.getenv("MATCHER_MODEL", "all-MiniLM-L6-v2")
+
+# Inference backend for skill matching: "torch" (SentenceTransformer) or
+# "onnx" (int8-quantized ONNX Runtime export of the same model)
+MATCHER_BACKEND = os.getenv("MATCHER_BACKEND", "torch")
+MATCHER_MAX_BATCH = int(os.getenv("MATCHER_MAX_BATCH", "64"))
+MATCHER_MAX_WAIT_MS = float(os.getenv("MATCHER_MAX_WAIT_MS", "5"))
+
+
+def _load_sentence_encoder():
+    if MATCHER_BACKEND == "onnx":
+        from utils.onnx_encoder import OnnxSentenceEncoder
+
+        return OnnxSentenceEncoder(MODEL_NAME).encode
+
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(MODEL_NAME)
+
+    def encode_batch(texts: List[str]) -> np.ndarray:
+        return model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+
+    return encode_batch
+
+
+# Model is loaded on first use (or by warm-up), not at import time
+register_model("sentence_encoder", _load_sentence_encoder)
+
+# Concurrent requests are encoded together in one model call
+_batcher = DynamicBatcher(
+    lambda texts: get_model("sentence_encoder")(texts),
+    max_batch=MATCHER_MAX_BATCH,
+    max_wait_ms=MATCHER_MAX_WAIT_MS,
+)
+
+
+def encode(texts: List[str]) -> np.ndarray:
+    """
+    L2-normalized embeddings for texts, one row per text
+    """
+    return _batcher.encode(texts)
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    global _embedding_cache
+    if not EMBEDDING_CACHE_ENABLED:
+        return None
+    if _embedding_cache is None:
+        with _embedding_cache_lock:
+            if _embedding_cache is None:
+                # ONNX int8 vectors differ slightly from torch ones; keep them apart
+                _embedding_cache = EmbeddingCache(f"{MODEL_NAME}-{MATCHER_BACKEND}", encode)
+    return _embedding_cache
+
+
+def cached_encode(texts: List[str]) -> np.ndarray:
+    """
+    Like encode(), but texts seen before (by any worker) come from the
+    persistent embedding cache and only the rest reach the model
+    """
+    cache = get_embedding_cache()
+    return cache.encode(texts) if cache is not None else encode(texts)
 
 
 def calculate_skill_match(resume_text: str, required_skills: list) -> dict:
     if not required_skills:
         return {"matched_skills": [], "missing_skills": [], "match_percentage": 0}
 
-    # Encode
-    resume_embedding = model.encode(resume_text, convert_to_tensor=True)
-    skill_embeddings = model.encode(required_skills, convert_to_tensor=True)
+    # Resume and skills in a single call; recurring skills are cache lookups
+    embeddings = cached_encode([resume_text] + list(required_skills))
 
-    # Compute cosine similarity
-    similarities = cos_sim(resume_embedding, skill_embeddings)[
-        0
-    ]  # [0] to remove batch dim
-    similarities = similarities.cpu().numpy()  # Convert to NumPy
+    # Compute cosine similarity (embeddings are normalized)
+    similarities = embeddings[1:] @ embeddings[0]
 
     matched_skills = []
     missing_skills = []
@@ -48,6 +120,9 @@ def calculate_skill_match(resume_text: str, required_skills: list) -> dict:
 
 
 def estimate_experience(resume_text: str, required: str) -> dict:
+    # Employment date ranges when they are clear ("Jan 2019 - Present"),
+    # otherwise the largest stated "N years"
+    timeline = resume_timeline(segment_text(resume_text), resume_text)
     # Broader pattern to catch "10+ years", "over 5 years", "more than 3 years", etc.
     resume_matches = re.findall(
         r"(\d+)\+?\s*(?:\+)?\s*years?\s*(?:of)?(?:\s+(?:experience|software|ai|ml|development|work))?",
@@ -57,7 +132,10 @@ def estimate_experience(resume_text: str, required: str) -> dict:
 
     resume_years = "Not found"
     max_resume_years = 0
-    if resume_matches:
+    if timeline["confidence"] >= TIMELINE_MIN_CONFIDENCE:
+        max_resume_years = timeline_years(timeline)
+        resume_years = f"{max_resume_years} years"
+    elif resume_matches:
         max_resume_years = max(map(int, resume_matches))
         resume_years = f"{max_resume_years} years"
 
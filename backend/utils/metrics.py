@@ -0,0 +1,277 @@
+# backend/utils/metrics.py
+
+import asyncio
+import functools
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+SIZE_BUCKETS = (
+    10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 2_500_000, 5_000_000,
+    10_000_000, 25_000_000,
+)
+
+# Stage timings of the current request, when one is being recorded
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(
+                    f"{self.name}{_format_labels(self.labels, labels)} {_format_value(value)}"
+                )
+        return lines
+
+
+class Gauge:
+    """
+    Value read from a callback at scrape time
+    """
+
+    def __init__(self, name: str, help: str, read: Callable[[], Optional[float]]):
+        self.name, self.help, self.read = name, help, read
+
+    def collect(self) -> List[str]:
+        value = self.read()
+        if value is None:
+            return []
+        return [
+            f"# HELP {self.name} {self.help}",
+            f"# TYPE {self.name} gauge",
+            f"{self.name} {_format_value(value)}",
+        ]
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # labels -> [bucket counts..., sum, count]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            series = self._series.setdefault(labels, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+        for labels, values in sorted(series.items()):
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labels, labels, le)} "
+                    f"{_format_value(cumulative)}"
+                )
+            label_text = _format_labels(self.labels, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(values[-2])}")
+            lines.append(f"{self.name}_count{label_text} {_format_value(values[-1])}")
+        return lines
+
+
+_registry: List = []
+
+
+def _register(metric):
+    _registry.append(metric)
+    return metric
+
+
+def register_gauge(name: str, help: str, read: Callable[[], Optional[float]]) -> Gauge:
+    return _register(Gauge(name, help, read))
+
+
+def render_prometheus() -> str:
+    """
+    All registered metrics in the Prometheus text exposition format
+    """
+    lines: List[str] = []
+    for metric in _registry:
+        lines.extend(metric.collect())
+    return "\n".join(lines) + "\n"
+
+
+# --- Service metrics ---
+
+STAGE_SECONDS = _register(
+    Histogram(
+        "jobfit_stage_seconds",
+        "Latency of match pipeline stages",
+        labels=("stage",),
+    )
+)
+HTTP_REQUEST_SECONDS = _register(
+    Histogram(
+        "jobfit_http_request_seconds",
+        "HTTP request latency by route",
+        labels=("method", "route", "status"),
+    )
+)
+LLM_REQUEST_SECONDS = _register(
+    Histogram(
+        "jobfit_llm_request_seconds",
+        "Latency of Gemini calls (cache misses), including queueing and retries",
+        labels=("call_site",),
+    )
+)
+LLM_REQUESTS = _register(
+    Counter(
+        "jobfit_llm_requests_total",
+        "Gemini calls by call site and outcome",
+        labels=("call_site", "outcome"),
+    )
+)
+LLM_CACHE_LOOKUPS = _register(
+    Counter(
+        "jobfit_llm_cache_lookups_total",
+        "LLM requests by call site, served from cache (hit) or Gemini (miss)",
+        labels=("call_site", "result"),
+    )
+)
+LLM_JSON_PARSE = _register(
+    Counter(
+        "jobfit_llm_json_parse_total",
+        "Validation of fresh LLM responses by call site (ok or error)",
+        labels=("call_site", "outcome"),
+    )
+)
+CASCADE_TIERS = _register(
+    Counter(
+        "jobfit_match_tier_total",
+        "Matches decided by the local tier or escalated to the LLM",
+        labels=("tier",),
+    )
+)
+EXPERIENCE_CHECKS = _register(
+    Counter(
+        "jobfit_experience_check_total",
+        "Parsed years of experience cross-checked against the resume's date "
+        "ranges (agree, disagree, no_llm_value, low_confidence)",
+        labels=("outcome",),
+    )
+)
+UPLOAD_BYTES = _register(
+    Histogram(
+        "jobfit_upload_bytes",
+        "Size of uploaded resume files",
+        buckets=SIZE_BUCKETS,
+    )
+)
+
+
+# --- Per-request timings ---
+
+
+def start_request_timings():
+    """
+    Begin collecting stage timings for the current request; returns a token
+    for stop_request_timings
+    """
+    return _request_timings.set({})
+
+
+def stop_request_timings(token) -> None:
+    _request_timings.reset(token)
+
+
+def current_timings() -> Dict[str, float]:
+    """
+    Stage timings (ms) recorded so far in the current request
+    """
+    timings = _request_timings.get()
+    return {stage: round(seconds * 1000, 1) for stage, seconds in (timings or {}).items()}
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    STAGE_SECONDS.observe(seconds, stage)
+    timings = _request_timings.get()
+    if timings is not None:
+        # Summed, so repeated stages (batch endpoints) add up
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+@contextmanager
+def stage_timer(stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - start)
+
+
+def timed(stage: str):
+    """
+    Decorator recording a function's (sync or async) latency as a stage
+    """
+
+    def decorator(fn):
+        if asyncio.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with stage_timer(stage):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage_timer(stage):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,56 @@
+# backend/utils/model_registry.py
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+# Heavy models are registered with a loader and only built on first use
+_loaders: Dict[str, Callable[[], Any]] = {}
+_models: Dict[str, Any] = {}
+_load_seconds: Dict[str, float] = {}
+_locks: Dict[str, threading.Lock] = {}
+_registry_lock = threading.Lock()
+
+
+def register_model(name: str, loader: Callable[[], Any]) -> None:
+    with _registry_lock:
+        _loaders[name] = loader
+        _locks.setdefault(name, threading.Lock())
+
+
+def get_model(name: str) -> Any:
+    """
+    Return the named model, loading it on first use (once per process)
+    """
+    model = _models.get(name)
+    if model is not None:
+        return model
+
+    if name not in _loaders:
+        raise KeyError(f"Unknown model: {name}")
+    with _locks[name]:
+        if name not in _models:
+            start = time.perf_counter()
+            _models[name] = _loaders[name]()
+            _load_seconds[name] = round(time.perf_counter() - start, 3)
+    return _models[name]
+
+
+def is_loaded(name: str) -> bool:
+    return name in _models
+
+
+def model_status() -> dict:
+    return {
+        name: {"loaded": name in _models, "load_seconds": _load_seconds.get(name)}
+        for name in _loaders
+    }
+
+
+def warm_up(names: Optional[Iterable[str]] = None) -> dict:
+    """
+    Load the given (default: all registered) models and report their status
+    """
+    for name in list(names if names is not None else _loaders):
+        get_model(name)
+    return model_status()
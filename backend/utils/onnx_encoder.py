@@ -0,0 +1,152 @@
+# backend/utils/onnx_encoder.py
+
+import inspect
+import json
+import os
+from typing import List, Optional
+
+import numpy as np
+import onnxruntime as ort
+from tokenizers import Tokenizer
+
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", "data/models/onnx")
+ONNX_INTRA_OP_THREADS = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))  # 0 = ORT default
+
+
+def export_sentence_transformer(
+    model_name: str, output_dir: str, quantize: bool = True
+) -> str:
+    """
+    Export a SentenceTransformer's transformer module to ONNX (optionally
+    int8-quantized) together with its tokenizer. Needs torch; only run once.
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+
+    os.makedirs(output_dir, exist_ok=True)
+    st_model = SentenceTransformer(model_name, device="cpu")
+    transformer = st_model[0].auto_model.eval()
+    tokenizer = st_model.tokenizer
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    input_names = [
+        name
+        for name in ("input_ids", "attention_mask", "token_type_ids")
+        if name in sample
+    ]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    fp32_path = os.path.join(output_dir, "model.onnx")
+    export_kwargs = dict(
+        input_names=input_names,
+        output_names=["last_hidden_state"],
+        dynamic_axes=dynamic_axes,
+        opset_version=17,
+    )
+
+    class _Encoder(torch.nn.Module):
+        # Maps positional ONNX inputs to keyword arguments of the transformer
+        def __init__(self, transformer):
+            super().__init__()
+            self.transformer = transformer
+
+        def forward(self, *inputs):
+            outputs = self.transformer(**dict(zip(input_names, inputs)))
+            return outputs.last_hidden_state
+
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        # Newer torch defaults to the dynamo exporter; keep the TorchScript one
+        export_kwargs["dynamo"] = False
+    with torch.no_grad():
+        torch.onnx.export(
+            _Encoder(transformer),
+            tuple(sample[name] for name in input_names),
+            fp32_path,
+            **export_kwargs,
+        )
+
+    model_path = fp32_path
+    if quantize:
+        model_path = os.path.join(output_dir, "model.int8.onnx")
+        quantize_dynamic(fp32_path, model_path, weight_type=QuantType.QInt8)
+
+    tokenizer.save_pretrained(output_dir)
+    with open(os.path.join(output_dir, "encoder.json"), "w") as f:
+        json.dump(
+            {
+                "model": os.path.basename(model_path),
+                "max_seq_length": st_model.max_seq_length,
+            },
+            f,
+        )
+    return output_dir
+
+
+class OnnxSentenceEncoder:
+    """
+    Mean-pooled, L2-normalized sentence embeddings from an exported ONNX
+    transformer. Matches SentenceTransformer.encode(normalize_embeddings=True)
+    for mean-pooling models, as the torch path in matcher uses.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        model_dir: Optional[str] = None,
+        quantize: bool = True,
+        intra_op_threads: int = ONNX_INTRA_OP_THREADS,
+    ):
+        variant = "int8" if quantize else "fp32"
+        model_dir = model_dir or os.path.join(
+            ONNX_MODEL_DIR, f"{os.path.basename(model_name)}-{variant}"
+        )
+        if not os.path.exists(os.path.join(model_dir, "encoder.json")):
+            export_sentence_transformer(model_name, model_dir, quantize=quantize)
+
+        with open(os.path.join(model_dir, "encoder.json")) as f:
+            config = json.load(f)
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=config["max_seq_length"])
+        self.tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.inter_op_num_threads = 1
+        if intra_op_threads > 0:
+            options.intra_op_num_threads = intra_op_threads
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, config["model"]),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        chunks = [
+            self._encode_batch(texts[i : i + batch_size])
+            for i in range(0, len(texts), batch_size)
+        ]
+        return np.vstack(chunks) if chunks else np.zeros((0, 0), dtype=np.float32)
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.array(
+                [e.type_ids for e in encodings], dtype=np.int64
+            )
+
+        hidden = self.session.run(["last_hidden_state"], feeds)[0]
+
+        # Mean pooling over real (non-padding) tokens
+        mask = attention_mask[:, :, None].astype(np.float32)
+        embeddings = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        embeddings /= np.clip(
+            np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None
+        )
+        return embeddings.astype(np.float32)
@@ -1,43 +1,252 @@
-from typing import List
-import pdfplumber
-
-# backend/utils/jd_parser.py
-
-import re
-
-# Case-insensitive, flexible matching
-SKILL_PATTERNS = {
-    "Python": r"python",
-    "TensorFlow": r"tensor\s*flow|tf",
-    "PyTorch": r"py\s*torch|torch",
-    "AWS": r"aws|amazon\s*web\s*services",
-    "Azure": r"azure|azure\s*cloud",
-    "GCP": r"gcp|google\s*cloud",
-    "NLP": r"nlp|natural\s*language|langchain|llm|large\s*language\s*model",
-    "MLOps": r"mlops|ci/cd|docker|kubernetes|model\s*deployment",
-    "SQL": r"sql|structured\s-?query\s-?language",
-    "Machine Learning": r"machine\s*learning|ml|ai",
-    "Deep Learning": r"deep\s*learning|neural\s*network|cnn|gan",
-    "PyTorch": r"py\s*torch|torch",
-    "Computer Vision": r"computer\s*vision|cv|opencv|object\s*detection|slam",
-    "Fine-tuning": r"fine\s*tuning|lora|qlora|sft|adapter",
-    "Recommendation System": r"recommendation|recommender|personalization",
-    "Anomaly Detection": r"anomaly\s*detection|outlier\s*detection",
+# backend/utils/pdf_parser.py
+
+import importlib.util
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.metrics import timed
+from utils.skill_matcher import SkillMatcher, normalize_text
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+# pdfplumber is only the fallback backend, so it is imported on first use
+HAS_PDFPLUMBER = importlib.util.find_spec("pdfplumber") is not None
+
+# Canonical skill -> aliases (matched case-insensitively on token boundaries)
+SKILL_ALIASES = {
+    "Python": ["python", "python3"],
+    "TensorFlow": ["tensorflow", "tensor flow", "tf", "keras"],
+    "PyTorch": ["pytorch", "py torch", "torch"],
+    "AWS": ["aws", "amazon web services", "sagemaker"],
+    "Azure": ["azure", "azure cloud"],
+    "GCP": ["gcp", "google cloud", "google cloud platform", "vertex ai"],
+    "NLP": [
+        "nlp",
+        "natural language",
+        "natural language processing",
+        "langchain",
+        "llm",
+        "llms",
+        "large language model",
+        "large language models",
+    ],
+    "MLOps": [
+        "mlops",
+        "ci/cd",
+        "docker",
+        "kubernetes",
+        "k8s",
+        "model deployment",
+    ],
+    "SQL": [
+        "sql",
+        "mysql",
+        "postgresql",
+        "postgres",
+        "sqlite",
+        "nosql",
+        "structured query language",
+    ],
+    "Machine Learning": ["machine learning", "ml", "ai"],
+    "Deep Learning": [
+        "deep learning",
+        "neural network",
+        "neural networks",
+        "cnn",
+        "cnns",
+        "gan",
+        "gans",
+    ],
+    "Computer Vision": [
+        "computer vision",
+        "cv",
+        "opencv",
+        "object detection",
+        "slam",
+    ],
+    "Fine-tuning": [
+        "fine tuning",
+        "fine-tuning",
+        "finetuning",
+        "fine-tuned",
+        "lora",
+        "qlora",
+        "sft",
+        "adapter",
+        "adapters",
+    ],
+    "Recommendation System": [
+        "recommendation",
+        "recommendations",
+        "recommender",
+        "recommender system",
+        "recommender systems",
+        "personalization",
+    ],
+    "Anomaly Detection": ["anomaly detection", "outlier detection"],
 }
 
+# Extra skills/aliases can be supplied as JSON: {"Canonical": ["alias", ...]}
+SKILL_TAXONOMY_PATH = os.getenv("SKILL_TAXONOMY_PATH")
+
+# Compiled once at import; scans a document in a single pass
+_skill_matcher = (
+    SkillMatcher.from_json(SKILL_TAXONOMY_PATH, base=SKILL_ALIASES)
+    if SKILL_TAXONOMY_PATH
+    else SkillMatcher(SKILL_ALIASES)
+)
+
 
 def extract_skills(text: str) -> List[str]:
-    text_lower = re.sub(r"\s+", " ", text.lower().replace("\n", " "))  # Normalize
-    found_skills = []
-    for skill, pattern in SKILL_PATTERNS.items():
-        if re.search(pattern, text_lower):
-            found_skills.append(skill)
-    return list(set(found_skills))
+    return _skill_matcher.find(text)
+
+
+def skill_categories(alias: str) -> List[str]:
+    """
+    Canonical skills that alias names exactly (whole text, not a mention)
+    """
+    return list(_skill_matcher.canonical.get(normalize_text(alias).strip(), []))
+
 
+# --- Text extraction backends ---
+# Each backend is (page_count(path), iter_pages(path, start, stop)); pages are
+# yielded lazily so extraction can stop as soon as the character budget is met.
+
+
+def _page_count_pymupdf(pdf_path: str) -> int:
+    with fitz.open(pdf_path) as doc:
+        return doc.page_count
+
+
+def _iter_pages_pymupdf(pdf_path: str, start: int = 0, stop: Optional[int] = None):
+    with fitz.open(pdf_path) as doc:
+        for page in doc.pages(start, stop if stop is not None else doc.page_count):
+            yield page.get_text()
+
+
+def _page_count_pdfplumber(pdf_path: str) -> int:
+    import pdfplumber
 
-def extract_text_from_pdf(pdf_path: str) -> str:
-    text = ""
     with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            text += page.extract_text() or ""
-    return text.strip()
+        return len(pdf.pages)
+
+
+def _iter_pages_pdfplumber(pdf_path: str, start: int = 0, stop: Optional[int] = None):
+    import pdfplumber
+
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages[start:stop]:
+            yield page.extract_text() or ""
+
+
+PDF_BACKENDS: Dict[str, Tuple[Callable, Callable]] = {}
+if fitz is not None:
+    PDF_BACKENDS["pymupdf"] = (_page_count_pymupdf, _iter_pages_pymupdf)
+if HAS_PDFPLUMBER:
+    PDF_BACKENDS["pdfplumber"] = (_page_count_pdfplumber, _iter_pages_pdfplumber)
+
+# "auto" tries PyMuPDF first and falls back to pdfplumber
+PDF_BACKEND = os.getenv("PDF_BACKEND", "auto")
+# Documents with at least this many pages are split across a process pool.
+# PyMuPDF is fast enough per page that process overhead outweighs the gain,
+# so by default only pdfplumber extraction is parallelised.
+PDF_PARALLEL_BACKENDS = os.getenv("PDF_PARALLEL_BACKENDS", "pdfplumber").split(",")
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "32"))
+PDF_PARALLEL_PAGES_PER_TASK = int(os.getenv("PDF_PARALLEL_PAGES_PER_TASK", "8"))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=PDF_WORKERS)
+    return _pool
+
+
+def _extract_page_range(backend: str, pdf_path: str, start: int, stop: int) -> list:
+    # Runs in a worker process
+    _, iter_pages = PDF_BACKENDS[backend]
+    return list(iter_pages(pdf_path, start, stop))
+
+
+def _iter_pages_parallel(backend: str, pdf_path: str, page_count: int):
+    pool = _get_pool()
+    futures = [
+        pool.submit(
+            _extract_page_range,
+            backend,
+            pdf_path,
+            start,
+            min(start + PDF_PARALLEL_PAGES_PER_TASK, page_count),
+        )
+        for start in range(0, page_count, PDF_PARALLEL_PAGES_PER_TASK)
+    ]
+    try:
+        # Yield in page order; later ranges keep running in the background
+        for future in futures:
+            yield from future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def _extract_with_backend(
+    backend: str, pdf_path: str, max_chars: Optional[int], parallel: bool
+) -> str:
+    page_count_fn, iter_pages = PDF_BACKENDS[backend]
+    pages = None
+    if parallel and backend in PDF_PARALLEL_BACKENDS:
+        page_count = page_count_fn(pdf_path)
+        if page_count >= PDF_PARALLEL_MIN_PAGES:
+            pages = _iter_pages_parallel(backend, pdf_path, page_count)
+    if pages is None:
+        pages = iter_pages(pdf_path)
+
+    parts = []
+    total = 0
+    for page_text in pages:
+        parts.append(page_text)
+        total += len(page_text) + 2
+        if max_chars is not None and total >= max_chars:
+            # Closing the generator stops further page extraction
+            pages.close()
+            break
+
+    # Blank line between pages, so chunking can cut at page breaks
+    text = "\n\n".join(parts).strip()
+    return text[:max_chars] if max_chars is not None else text
+
+
+@timed("pdf_extraction")
+def extract_text_from_pdf(
+    pdf_path: str,
+    max_chars: Optional[int] = None,
+    backend: Optional[str] = None,
+    parallel: bool = True,
+) -> str:
+    """
+    Extract text from a PDF, stopping once max_chars characters are available.
+    Uses PyMuPDF when installed and falls back to pdfplumber.
+    """
+    backend = backend or PDF_BACKEND
+    if backend == "auto":
+        candidates = [
+            name for name in ("pymupdf", "pdfplumber") if name in PDF_BACKENDS
+        ]
+    else:
+        candidates = [backend]
+    if not candidates:
+        raise RuntimeError("No PDF backend available: install pymupdf or pdfplumber")
+
+    for i, name in enumerate(candidates):
+        try:
+            return _extract_with_backend(name, pdf_path, max_chars, parallel)
+        except Exception:
+            if i == len(candidates) - 1:
+                raise
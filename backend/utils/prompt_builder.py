@@ -0,0 +1,82 @@
+# backend/utils/prompt_builder.py
+
+import json
+import textwrap
+from typing import List
+
+# Gemini averages about 4 characters per token on English text. A local
+# estimate keeps budgeting free of extra count_tokens round trips.
+CHARS_PER_TOKEN = 4
+
+# Cut points tried in order when truncating: section, line, sentence, word
+_BOUNDARIES = ("\n\n", "\n", ". ", " ")
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def drop_empty(data):
+    """
+    Recursively remove None, empty strings, lists and dicts (0 and False stay)
+    """
+    if isinstance(data, dict):
+        pruned = {key: drop_empty(value) for key, value in data.items()}
+        return {key: value for key, value in pruned.items() if not _is_empty(value)}
+    if isinstance(data, (list, tuple)):
+        pruned = [drop_empty(value) for value in data]
+        return [value for value in pruned if not _is_empty(value)]
+    if isinstance(data, str):
+        return data.strip()
+    return data
+
+
+def _is_empty(value) -> bool:
+    return value is None or (isinstance(value, (str, list, dict)) and not value)
+
+
+def compact_json(data) -> str:
+    """
+    Serialize without indentation or empty fields, to save prompt tokens
+    """
+    return json.dumps(drop_empty(data), separators=(",", ":"), ensure_ascii=False)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Shorten text to roughly max_tokens, cutting at the last section break,
+    line break, sentence end or word boundary that keeps at least half of
+    the budget, so a word or section is never cut in half
+    """
+    text = text.strip()
+    limit = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    head = text[:limit]
+    for separator in _BOUNDARIES:
+        cut = head.rfind(separator)
+        if cut >= limit // 2:
+            return head[: cut + len(separator.rstrip())].rstrip()
+    return head
+
+
+def split_to_tokens(text: str, max_tokens: int) -> List[str]:
+    """
+    Split text into consecutive chunks of roughly max_tokens each, cut at
+    the same boundaries as truncate_to_tokens
+    """
+    chunks = []
+    rest = text.strip()
+    while rest:
+        chunk = truncate_to_tokens(rest, max_tokens)
+        chunks.append(chunk)
+        rest = rest[len(chunk) :].strip()
+    return chunks
+
+
+def render_prompt(template: str, **fields) -> str:
+    """
+    Fill a str.format template, with its source indentation removed so
+    leading whitespace is not sent on every line
+    """
+    return textwrap.dedent(template).strip().format(**fields)
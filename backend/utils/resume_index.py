@@ -0,0 +1,201 @@
+# backend/utils/resume_index.py
+
+import json
+import os
+import sqlite3
+import threading
+from typing import List, Optional
+
+import numpy as np
+
+from utils.matcher import cached_encode
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+RESUME_INDEX_DIR = os.getenv("RESUME_INDEX_DIR", "data/index")
+# Switch from exact search to HNSW once the corpus is this large (needs hnswlib)
+RESUME_INDEX_ANN_MIN = int(os.getenv("RESUME_INDEX_ANN_MIN", "20000"))
+# Resumes are embedded as the mean of up to this many text chunks
+CHUNK_CHARS = 1000
+MAX_CHUNKS = 8
+
+
+def _chunks(text: str) -> List[str]:
+    words = text.split()
+    chunks, current, size = [], [], 0
+    for word in words:
+        current.append(word)
+        size += len(word) + 1
+        if size >= CHUNK_CHARS:
+            chunks.append(" ".join(current))
+            current, size = [], 0
+            if len(chunks) == MAX_CHUNKS:
+                break
+    if current and len(chunks) < MAX_CHUNKS:
+        chunks.append(" ".join(current))
+    return chunks or [text]
+
+
+def embed_document(text: str) -> np.ndarray:
+    """
+    One normalized embedding for a whole document (mean of chunk embeddings)
+    """
+    vector = cached_encode(_chunks(text)).mean(axis=0)
+    return (vector / max(np.linalg.norm(vector), 1e-12)).astype(np.float32)
+
+
+class ResumeIndex:
+    """
+    Embedding index over stored resumes. Vectors are appended to a SQLite
+    table, so every process (serve.py workers, uvicorn --workers) can add
+    resumes; each keeps a NumPy matrix (exact dot-product search) and pulls
+    in rows other processes appended before searching. Large corpora can
+    use an HNSW graph instead.
+    """
+
+    def __init__(self, directory: str = RESUME_INDEX_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._ann = None
+        os.makedirs(directory, exist_ok=True)
+
+        self._db = sqlite3.connect(
+            os.path.join(directory, "resumes.sqlite3"), check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # Re-indexing replaces the row, which gives it a new (higher) seq
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS resume_index (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                resume_id TEXT NOT NULL UNIQUE,
+                metadata TEXT NOT NULL,
+                vector BLOB NOT NULL
+            )
+            """)
+        self._db.commit()
+
+        # Rows [0, _size) of _matrix are live; capacity grows by doubling
+        self._entries: List[dict] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._size = 0
+        self._positions: dict = {}
+        self._seq = 0  # last row pulled from the table
+        with self._lock:
+            self._sync()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, resume_id: str, text: str, metadata: Optional[dict] = None) -> None:
+        """
+        Index (or re-index) one resume and persist it
+        """
+        vector = embed_document(text)
+        with self._lock:
+            self._insert(resume_id, metadata or {}, vector)
+            self._db.commit()
+            self._sync()
+
+    def search(self, query_text: str, top_k: int = 5) -> List[dict]:
+        """
+        Top-K resumes for a query (e.g. a job description), best first
+        """
+        query = embed_document(query_text)
+
+        with self._lock:
+            self._sync()
+            if not self._entries:
+                return []
+            top_k = min(top_k, len(self._entries))
+            ann = self._get_ann()
+            if ann is not None:
+                labels, distances = ann.knn_query(query, k=top_k)
+                positions, scores = labels[0], 1 - distances[0]
+            else:
+                all_scores = self._matrix[: self._size] @ query
+                positions = np.argpartition(-all_scores, top_k - 1)[:top_k]
+                positions = positions[np.argsort(-all_scores[positions])]
+                scores = all_scores[positions]
+
+            return [
+                {**self._entries[int(p)], "score": round(float(s), 4)}
+                for p, s in zip(positions, scores)
+            ]
+
+    def _insert(self, resume_id: str, metadata: dict, vector: np.ndarray) -> None:
+        # Caller holds self._lock and commits
+        self._db.execute(
+            "INSERT OR REPLACE INTO resume_index (resume_id, metadata, vector) "
+            "VALUES (?, ?, ?)",
+            (resume_id, json.dumps(metadata), vector.astype(np.float32).tobytes()),
+        )
+
+    def _sync(self) -> None:
+        # Caller holds self._lock: apply rows appended since the last sync
+        # (by any process), O(new rows)
+        rows = self._db.execute(
+            "SELECT seq, resume_id, metadata, vector FROM resume_index "
+            "WHERE seq > ? ORDER BY seq",
+            (self._seq,),
+        ).fetchall()
+        for seq, resume_id, metadata, blob in rows:
+            vector = np.frombuffer(blob, dtype=np.float32)
+            entry = {"resume_id": resume_id, **json.loads(metadata)}
+            position = self._positions.get(resume_id)
+            if position is None:
+                position = self._append_row(vector)
+                self._entries.append(entry)
+                self._positions[resume_id] = position
+            else:
+                self._matrix[position] = vector
+                self._entries[position] = entry
+            if self._ann is not None:
+                self._ann_add(vector[None, :], [position])
+            self._seq = seq
+
+    def _append_row(self, vector: np.ndarray) -> int:
+        if self._matrix is None:
+            self._matrix = np.empty((16, vector.shape[0]), dtype=np.float32)
+        elif self._size == len(self._matrix):
+            grown = np.empty((2 * len(self._matrix), self._matrix.shape[1]), np.float32)
+            grown[: self._size] = self._matrix[: self._size]
+            self._matrix = grown
+        self._matrix[self._size] = vector
+        self._size += 1
+        return self._size - 1
+
+    def _get_ann(self):
+        # Caller holds self._lock
+        if self._ann is None and hnswlib is not None:
+            if len(self._entries) >= RESUME_INDEX_ANN_MIN:
+                self._ann = hnswlib.Index(space="cosine", dim=self._matrix.shape[1])
+                self._ann.init_index(
+                    max_elements=2 * len(self._entries), ef_construction=200, M=16
+                )
+                self._ann_add(self._matrix[: self._size], list(range(self._size)))
+                self._ann.set_ef(64)
+        return self._ann
+
+    def _ann_add(self, vectors: np.ndarray, positions: List[int]) -> None:
+        if (
+            self._ann.get_current_count() + len(positions)
+            > self._ann.get_max_elements()
+        ):
+            self._ann.resize_index(2 * self._ann.get_max_elements())
+        self._ann.add_items(vectors, positions)
+
+
+_index: Optional[ResumeIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_resume_index() -> ResumeIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = ResumeIndex()
+    return _index
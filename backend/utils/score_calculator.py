@@ -1,6 +1,13 @@
 # backend/utils/score_calculator.py
 
 import re
+from functools import lru_cache
+from typing import Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from utils.pdf_parser import skill_categories
+from utils.skill_matcher import normalize_text
 
 
 def calculate_match_score_from_feedback(ai_feedback: str, years_match: bool) -> int:
@@ -53,3 +60,262 @@ def calculate_match_score_from_feedback(ai_feedback: str, years_match: bool) ->
         score = 85 if years_match else 60
 
     return int(score)
+
+
+# --- Structured scoring ---
+#
+# Scores parsed resume/JD data and the structured run_llm_match feedback
+# instead of the feedback wording. Each component is in [0, 1]:
+#   skills      share of the JD's required_skills found in technical_skills
+#   experience  resume years / required years, capped at 1
+#   education   highest resume degree vs the highest degree the JD asks for
+#   alignment   share of required skills the LLM did not report as missing
+# Components that are unavailable (skills or alignment when the JD lists no
+# skills, alignment without LLM feedback) are left out and the remaining
+# weights renormalized. A pair where either side has no data at all (no
+# skills, years or degree, e.g. a failed parse) is undecidable: every
+# component is unavailable and the score is 0, never a perfect match.
+
+SCORE_COMPONENTS = ("skills", "experience", "education", "alignment")
+SCORE_WEIGHTS = np.array([0.5, 0.25, 0.1, 0.15], dtype=np.float32)
+
+_DEGREE_LEVELS = [
+    (3, re.compile(r"\b(ph\.?\s?d|doctor(ate)?)\b")),
+    (2, re.compile(r"\b(master'?s?|m\.?sc?|m\.?eng|mba|m\.?s\.?)\b")),
+    (1, re.compile(r"\b(bachelor'?s?|b\.?sc?|b\.?eng|b\.?tech|b\.?a\.?|b\.?s\.?|undergraduate)\b")),
+]
+
+
+def _compact(text: str) -> str:
+    return re.sub(r"[\W_]+", "", text)
+
+
+def _initials(text: str) -> str:
+    return "".join(word[0] for word in re.findall(r"[a-z0-9]+", text))
+
+
+def _same_skill(alias: str, canonical: str) -> bool:
+    # Same letters ("py torch", "fine-tuning") or an abbreviation either way
+    # ("amazon web services" / AWS, "ml" / Machine Learning); "docker" is an
+    # MLOps alias but not the same skill
+    alias, canonical = alias.lower(), canonical.lower()
+    return _compact(alias) in (_compact(canonical), _initials(canonical)) or (
+        _compact(canonical) == _initials(alias)
+    )
+
+
+@lru_cache(maxsize=65536)
+def _canonical_skills(skill: str) -> Tuple[str, Optional[str]]:
+    # (identity, category): a skill whose whole text is a spelling of a
+    # taxonomy name becomes that name ("Amazon Web Services" -> AWS); any
+    # other skill keeps its normalized text, with the taxonomy skill it is
+    # an exact alias of as its category ("MySQL" -> SQL)
+    name = normalize_text(skill).strip(" .;:")
+    categories = skill_categories(name)
+    for canonical in categories:
+        if _same_skill(name, canonical):
+            return canonical, None
+    return name, categories[0] if len(categories) == 1 else None
+
+
+def skill_set(value, categories: bool = False) -> Set[str]:
+    """
+    Canonical skills from a parsed skills field: a dict of lists, a list,
+    or a comma-separated string. With categories, a skill also counts as
+    the taxonomy skill it belongs to (MySQL meets a requirement for SQL).
+    """
+    if isinstance(value, dict):
+        if not value:
+            return set()
+        return set().union(*(skill_set(v, categories) for v in value.values()))
+    if isinstance(value, str):
+        value = value.split(",")
+    if not isinstance(value, (list, tuple, set)):
+        return set()
+    skills = set()
+    for item in value:
+        if isinstance(item, str) and item.strip():
+            name, category = _canonical_skills(item.strip())
+            skills.add(name)
+            if categories and category:
+                skills.add(category)
+    return skills
+
+
+def _years(value) -> float:
+    # Accepts numbers and strings such as "5+" or "3-5 years" (lower bound)
+    if isinstance(value, str):
+        found = re.search(r"\d+(?:\.\d+)?", value)
+        value = found.group() if found else None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def degree_level(education) -> int:
+    """
+    Highest degree mentioned: 0 none/unknown, 1 bachelor, 2 master, 3 PhD
+    """
+    if isinstance(education, str):
+        education = [education]
+    if not isinstance(education, (list, tuple)):
+        return 0
+    best = 0
+    for entry in education:
+        text = str(entry).lower()
+        for level, pattern in _DEGREE_LEVELS:
+            if level > best and pattern.search(text):
+                best = level
+    return best
+
+
+def _vocabulary_matrix(skill_sets: Sequence[Set[str]], vocabulary: dict) -> np.ndarray:
+    matrix = np.zeros((len(skill_sets), len(vocabulary)), dtype=np.float32)
+    for row, skills in enumerate(skill_sets):
+        matrix[row, [vocabulary[s] for s in skills]] = 1.0
+    return matrix
+
+
+def _education_score(resume_levels: np.ndarray, required_levels: np.ndarray) -> np.ndarray:
+    # 1 when the requirement is met or absent, 0.5 for a lower degree, 0 for none
+    return np.where(
+        (required_levels == 0) | (resume_levels >= required_levels),
+        1.0,
+        np.where(resume_levels > 0, 0.5, 0.0),
+    ).astype(np.float32)
+
+
+def _combine(components: np.ndarray, available: np.ndarray) -> np.ndarray:
+    # components/available: (..., 4); weighted mean over available components,
+    # 0 when none is available
+    weights = SCORE_WEIGHTS * available
+    weight_sum = weights.sum(axis=-1)
+    total = (components * weights).sum(axis=-1) / np.maximum(weight_sum, 1e-6)
+    total = np.where(weight_sum > 0, total, 0.0)
+    return np.rint(100 * np.clip(total, 0, 1)).astype(np.int32)
+
+
+def _has_data(skills: Sequence[Set[str]], years: np.ndarray, levels: np.ndarray) -> np.ndarray:
+    # False for a side with no skills, years or degree (empty or failed parse)
+    return np.array([bool(s) for s in skills], dtype=bool) | (years > 0) | (levels > 0)
+
+
+def _resume_features(resumes: Sequence[dict]):
+    skills = [skill_set(r.get("technical_skills"), categories=True) for r in resumes]
+    years = np.array([_years(r.get("years_of_experience")) for r in resumes], np.float32)
+    levels = np.array([degree_level(r.get("education")) for r in resumes], np.int8)
+    return skills, years, levels
+
+
+def _jd_features(jds: Sequence[dict]):
+    skills = [skill_set(j.get("required_skills")) for j in jds]
+    years = np.array([_years(j.get("required_years")) for j in jds], np.float32)
+    levels = np.array([degree_level(j.get("required_education")) for j in jds], np.int8)
+    return skills, years, levels
+
+
+def score_matrix(resumes: Sequence[dict], jds: Sequence[dict]) -> np.ndarray:
+    """
+    Scores (0-100) for every resume against every JD, shape
+    (len(resumes), len(jds)), from parsed data only (no LLM feedback).
+    Skill overlap for all pairs is a single matrix product.
+    """
+    r_skills, r_years, r_levels = _resume_features(resumes)
+    j_skills, j_years, j_levels = _jd_features(jds)
+    vocabulary = {s: i for i, s in enumerate(sorted(set().union(*r_skills, *j_skills)))}
+    r_matrix = _vocabulary_matrix(r_skills, vocabulary)
+    j_matrix = _vocabulary_matrix(j_skills, vocabulary)
+
+    required = j_matrix.sum(axis=1)
+    overlap = r_matrix @ j_matrix.T
+    skills = overlap / np.maximum(required, 1)
+    experience = np.where(
+        j_years > 0, np.minimum(1.0, r_years[:, None] / np.maximum(j_years, 1e-6)), 1.0
+    )
+    education = _education_score(r_levels[:, None], j_levels[None, :])
+
+    # Weighted mean as in _combine, without materializing (n, m, 4) arrays;
+    # skills count only for JDs that list some
+    skill_weight = SCORE_WEIGHTS[0] * (required > 0)
+    total = skill_weight * skills + SCORE_WEIGHTS[1] * experience + SCORE_WEIGHTS[2] * education
+    total /= skill_weight + SCORE_WEIGHTS[1] + SCORE_WEIGHTS[2]
+    decidable = (
+        _has_data(r_skills, r_years, r_levels)[:, None]
+        & _has_data(j_skills, j_years, j_levels)[None, :]
+    )
+    total = np.where(decidable, total, 0.0)
+    return np.rint(100 * np.clip(total, 0, 1)).astype(np.int32)
+
+
+def _alignment(feedback, required: Set[str]) -> Optional[float]:
+    if not isinstance(feedback, dict):
+        return None
+    missing = skill_set(feedback.get("missing_required_skills"))
+    if not required:
+        return None
+    return max(0.0, 1.0 - len(missing & required) / len(required))
+
+
+def score_component_matrix(
+    resumes: Sequence[dict], jds: Sequence[dict], feedbacks: Optional[Sequence] = None
+) -> np.ndarray:
+    """
+    Per-pair component values (n, 4) for resumes[i] vs jds[i], with NaN for
+    unavailable components (all NaN for an undecidable pair)
+    """
+    r_skills, r_years, r_levels = _resume_features(resumes)
+    j_skills, j_years, j_levels = _jd_features(jds)
+    required = np.array([len(s) for s in j_skills], np.float32)
+    overlap = np.array([len(r & j) for r, j in zip(r_skills, j_skills)], np.float32)
+
+    skills = np.where(required > 0, overlap / np.maximum(required, 1), np.nan)
+    experience = np.where(
+        j_years > 0, np.minimum(1.0, r_years / np.maximum(j_years, 1e-6)), 1.0
+    )
+    # Without a stated requirement, fall back to the LLM's experience verdict
+    if feedbacks is not None:
+        for i, feedback in enumerate(feedbacks):
+            if j_years[i] == 0 and isinstance(feedback, dict):
+                if feedback.get("experience_met") is False:
+                    experience[i] = 0.5
+    education = _education_score(r_levels, j_levels)
+    alignment = np.full(len(jds), np.nan, dtype=np.float32)
+    for i, feedback in enumerate(feedbacks or []):
+        value = _alignment(feedback, j_skills[i])
+        if value is not None:
+            alignment[i] = value
+    components = np.stack([skills, experience, education, alignment], axis=-1)
+    decidable = _has_data(r_skills, r_years, r_levels) & _has_data(j_skills, j_years, j_levels)
+    components[~decidable] = np.nan
+    return components.astype(np.float32)
+
+
+def score_pairs(
+    resumes: Sequence[dict], jds: Sequence[dict], feedbacks: Optional[Sequence] = None
+) -> np.ndarray:
+    """
+    Scores (0-100) for resumes[i] vs jds[i]; feedbacks[i] is the structured
+    run_llm_match feedback for that pair, or None
+    """
+    components = score_component_matrix(resumes, jds, feedbacks)
+    available = ~np.isnan(components)
+    return _combine(np.nan_to_num(components), available.astype(np.float32))
+
+
+def score_match(resume_data: dict, jd_data: dict, feedback=None) -> dict:
+    """
+    Score one pair: {"overall_score": int, "breakdown": {component: 0-100}};
+    an undecidable pair (no data on one side) scores 0 with an empty breakdown
+    """
+    components = score_component_matrix([resume_data], [jd_data], [feedback])[0]
+    available = ~np.isnan(components)
+    overall = _combine(np.nan_to_num(components), available.astype(np.float32))
+    return {
+        "overall_score": int(overall),
+        "breakdown": {
+            name: int(round(100 * value))
+            for name, value, ok in zip(SCORE_COMPONENTS, components, available)
+            if ok
+        },
+    }
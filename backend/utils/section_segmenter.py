@@ -0,0 +1,213 @@
+# backend/utils/section_segmenter.py
+
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from utils.metrics import timed
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+# Text before the first recognized heading (name, contact details)
+HEADER = "header"
+
+# Section -> heading phrases (lowercase, "&" written as "and")
+SECTION_ALIASES = {
+    "summary": [
+        "summary", "professional summary", "profile", "professional profile",
+        "objective", "career objective", "about", "about me",
+    ],
+    "experience": [
+        "experience", "work experience", "professional experience",
+        "employment", "employment history", "work history", "career history",
+        "relevant experience", "industry experience",
+    ],
+    "education": [
+        "education", "academic background", "education and training",
+        "qualifications", "academic qualifications",
+    ],
+    "skills": [
+        "skills", "technical skills", "core skills", "key skills",
+        "core competencies", "competencies", "technologies", "tech stack",
+        "skills and tools", "tools and technologies",
+    ],
+    "projects": ["projects", "key projects", "selected projects", "personal projects"],
+    "certifications": ["certifications", "certificates", "licenses and certifications"],
+    "publications": ["publications", "selected publications", "papers", "patents"],
+    "awards": ["awards", "honors", "honours", "awards and honors", "achievements"],
+    "languages": ["languages", "spoken languages"],
+    "volunteering": ["volunteering", "volunteer experience", "community"],
+    "interests": ["interests", "hobbies", "hobbies and interests", "activities"],
+    "references": ["references", "referees"],
+}
+
+# Longer than this, a line is body text even if it contains a heading word
+MAX_HEADING_WORDS = 6
+# Font size (relative to the body) at which a line counts as styled
+HEADING_SIZE_RATIO = 1.15
+
+_ALIAS_TO_SECTION = {
+    alias: section for section, aliases in SECTION_ALIASES.items() for alias in aliases
+}
+
+
+def _raw_alias(alias: str) -> str:
+    # Alias as written on the page: any punctuation between words, "&" for "and"
+    words = [r"(?:and|&)" if word == "and" else re.escape(word) for word in alias.split()]
+    return r"[\W_]*".join(words)
+
+
+# A styled line opening with a heading phrase followed by nothing or a
+# separator ("Experience (2015 - now)", "Skills: ..."), not by more words
+# ("Community Manager, Acme"). Longest aliases first, so "work experience"
+# wins over "experience".
+_STYLED_HEADING = re.compile(
+    r"^[\W_]*("
+    + "|".join(_raw_alias(a) for a in sorted(_ALIAS_TO_SECTION, key=len, reverse=True))
+    + r")\s*(?:$|[:|(/\-–—])",
+    re.IGNORECASE,
+)
+
+# Line text, styled like a heading (bold, larger or all caps)
+Line = Tuple[str, bool]
+
+
+def _normalize(line: str) -> str:
+    line = line.lower().replace("&", " and ")
+    return " ".join(re.sub(r"[^a-z ]+", " ", line).split())
+
+
+def heading_section(line: str, styled: bool = False) -> Optional[str]:
+    """
+    Section a line starts, if it is a heading: the whole line is a known
+    heading, or it is styled as one and opens with a heading phrase
+    """
+    # Words counted as written, so dates and numbers make a line longer
+    if len(line.split()) > MAX_HEADING_WORDS:
+        return None
+    normalized = _normalize(line)
+    if not normalized:
+        return None
+    if normalized in _ALIAS_TO_SECTION:
+        return _ALIAS_TO_SECTION[normalized]
+    if styled:
+        match = _STYLED_HEADING.match(line.strip())
+        if match:
+            return _ALIAS_TO_SECTION[_normalize(match.group(1))]
+    return None
+
+
+def segment_lines(lines: Iterable[Line]) -> Dict[str, str]:
+    """
+    Group lines under the section of the heading above them; repeated
+    sections (e.g. two "Projects" headings) are concatenated
+    """
+    buckets: Dict[str, List[str]] = {HEADER: []}
+    current = HEADER
+    for text, styled in lines:
+        section = heading_section(text, styled)
+        if section is not None:
+            current = section
+            buckets.setdefault(current, [])
+        elif text.strip():
+            buckets[current].append(text.rstrip())
+    return {name: "\n".join(body).strip() for name, body in buckets.items() if body}
+
+
+def segment_text(text: str) -> Dict[str, str]:
+    """
+    Sections from plain extracted text; short all-caps lines count as styled
+    """
+    return segment_lines(
+        (line, line.isupper() and len(line.split()) <= MAX_HEADING_WORDS)
+        for line in text.splitlines()
+    )
+
+
+def _pdf_lines(pdf_path: str, max_chars: Optional[int]) -> List[Tuple[str, float, bool]]:
+    lines, total = [], 0
+    with fitz.open(pdf_path) as doc:
+        for page in doc:
+            for block in page.get_text("dict")["blocks"]:
+                for line in block.get("lines", []):
+                    spans = [s for s in line["spans"] if s["text"].strip()]
+                    if not spans:
+                        continue
+                    text = "".join(s["text"] for s in line["spans"])
+                    size = max(s["size"] for s in spans)
+                    # Flag bit 4 (16) marks bold text
+                    bold = all(s["flags"] & 16 or "bold" in s["font"].lower() for s in spans)
+                    lines.append((text, size, bold))
+                    total += len(text) + 1
+            if max_chars is not None and total >= max_chars:
+                break
+    return lines
+
+
+def _body_size(lines: List[Tuple[str, float, bool]]) -> float:
+    # Character-weighted median: the size most of the text is set in
+    weighted = sorted((size, len(text)) for text, size, _ in lines)
+    half, seen = sum(n for _, n in weighted) / 2, 0
+    for size, n in weighted:
+        seen += n
+        if seen >= half:
+            return size
+    return weighted[-1][0]
+
+
+def segment_pdf(pdf_path: str, max_chars: Optional[int] = None) -> Dict[str, str]:
+    """
+    Sections of a PDF using PyMuPDF layout: a line is styled when it is
+    bold, all caps, or set noticeably larger than the body text
+    """
+    lines = _pdf_lines(pdf_path, max_chars)
+    if not lines:
+        return {}
+    body_size = _body_size(lines)
+    return segment_lines(
+        (
+            text,
+            bold
+            or size >= body_size * HEADING_SIZE_RATIO
+            or (text.isupper() and len(text.split()) <= MAX_HEADING_WORDS),
+        )
+        for text, size, bold in lines
+    )
+
+
+@timed("segmentation")
+def segment_resume(
+    text: str, pdf_path: Optional[str] = None, max_chars: Optional[int] = None
+) -> Dict[str, str]:
+    """
+    Split a resume into sections (header, summary, experience, education,
+    skills, projects, ...). Uses PDF layout when PyMuPDF can read the file,
+    and the extracted text otherwise.
+    """
+    if pdf_path is not None and fitz is not None:
+        try:
+            sections = segment_pdf(pdf_path, max_chars)
+            if sections:
+                return sections
+        except Exception:
+            pass
+    return segment_text(text)
+
+
+def select_sections(
+    sections: Dict[str, str], names: Sequence[str], fallback: str = ""
+) -> str:
+    """
+    Text of the named sections in document order, each under its title.
+    Returns fallback when no heading was recognized at all, so unusual
+    layouts still send the full text.
+    """
+    if set(sections) <= {HEADER}:
+        return fallback
+    parts = []
+    for name, body in sections.items():
+        if name in names:
+            parts.append(body if name == HEADER else f"{name.title()}:\n{body}")
+    return "\n\n".join(parts) or fallback
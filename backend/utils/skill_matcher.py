@@ -0,0 +1,77 @@
+# backend/utils/skill_matcher.py
+
+import json
+import re
+from typing import Dict, Iterable, List, Optional
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Lowercase and collapse whitespace so aliases match across line breaks
+    """
+    return _WHITESPACE.sub(" ", text.lower())
+
+
+def _trie_pattern(node: dict) -> str:
+    # Turn a character trie into a regex: shared prefixes are matched once and,
+    # being greedy, longer aliases win over their prefixes
+    branches = [
+        re.escape(char) + _trie_pattern(child)
+        for char, child in sorted(node.items())
+        if char
+    ]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    return f"(?:{body})?" if "" in node else body
+
+
+class SkillMatcher:
+    """
+    Finds skills from a taxonomy (canonical name -> aliases) in one pass.
+    All aliases are compiled into a single trie-shaped regex at construction;
+    matches must start and end on token boundaries, so "tf" does not match
+    inside "platform". An alias may map to several canonical skills.
+    """
+
+    def __init__(self, taxonomy: Dict[str, Iterable[str]]):
+        self.canonical: Dict[str, List[str]] = {}
+        for skill, aliases in taxonomy.items():
+            for alias in list(aliases) + [skill]:
+                alias = normalize_text(alias).strip()
+                if alias and skill not in self.canonical.setdefault(alias, []):
+                    self.canonical[alias].append(skill)
+
+        trie: dict = {}
+        for alias in self.canonical:
+            node = trie
+            for char in alias:
+                node = node.setdefault(char, {})
+            node[""] = {}
+
+        self.pattern = re.compile(r"(?<!\w)(" + _trie_pattern(trie) + r")(?!\w)")
+
+    @classmethod
+    def from_json(cls, path: str, base: Optional[Dict[str, Iterable[str]]] = None):
+        """
+        Build from a JSON file mapping canonical skills to alias lists,
+        optionally merged on top of a base taxonomy
+        """
+        with open(path) as f:
+            extra = json.load(f)
+        taxonomy = {skill: list(aliases) for skill, aliases in (base or {}).items()}
+        for skill, aliases in extra.items():
+            taxonomy.setdefault(skill, []).extend(aliases)
+        return cls(taxonomy)
+
+    def find(self, text: str) -> List[str]:
+        """
+        Canonical skills mentioned in text, in order of first appearance
+        """
+        found: Dict[str, None] = {}
+        for match in self.pattern.finditer(normalize_text(text)):
+            for skill in self.canonical[match.group(1)]:
+                found.setdefault(skill, None)
+        return list(found)
@@ -0,0 +1,135 @@
+# backend/utils/stream_parser.py
+
+from typing import List, Tuple
+
+_ESCAPES = {
+    '"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t",
+}
+
+# (item index, decoded text)
+Delta = Tuple[int, str]
+
+
+class StreamingTextParser:
+    """
+    Incremental decoder for streamed LLM output that is a JSON string
+    ("..."), a JSON array of strings (["...", "..."]) or plain text. Feed
+    raw chunks as they arrive; each feed() returns the newly decoded text
+    per item, so partial strings can be shown before the JSON is complete.
+    Non-string array elements are skipped. A JSON object is only collected
+    (in text, with no deltas) for the caller to decode once complete.
+    """
+
+    def __init__(self):
+        # "string", "array", "object" or "text", set by the first character
+        self.mode = None
+        self.items: List[str] = []
+        self.done = False
+        self._in_string = False
+        self._escape = ""  # pending escape sequence, e.g. "\\u00"
+        self._high_surrogate = ""
+        self._skip_depth = 0  # nesting inside a skipped non-string element
+        self._skip_in_string = False
+        self._skip_escape = False
+
+    @property
+    def text(self) -> str:
+        return "".join(self.items)
+
+    def feed(self, chunk: str) -> List[Delta]:
+        deltas: List[Delta] = []
+        for char in chunk:
+            self._step(char, deltas)
+        # Merge consecutive pieces of the same item
+        merged: List[Delta] = []
+        for index, text in deltas:
+            if merged and merged[-1][0] == index:
+                merged[-1] = (index, merged[-1][1] + text)
+            else:
+                merged.append((index, text))
+        return merged
+
+    def _emit(self, text: str, deltas: List[Delta]) -> None:
+        self.items[-1] += text
+        deltas.append((len(self.items) - 1, text))
+
+    def _step(self, char: str, deltas: List[Delta]) -> None:
+        if self.done:
+            return
+        if self.mode is None:
+            if char.isspace():
+                return
+            self.mode = {'"': "string", "[": "array", "{": "object"}.get(char, "text")
+            if self.mode == "string":
+                self.items.append("")
+                self._in_string = True
+            elif self.mode == "text":
+                self.items.append("")
+                self._emit(char, deltas)
+            elif self.mode == "object":
+                self.items.append(char)
+            return
+        if self.mode == "text":
+            self._emit(char, deltas)
+        elif self.mode == "object":
+            self.items[-1] += char
+        elif self._in_string:
+            self._string_char(char, deltas)
+        elif self.mode == "array":
+            self._array_char(char)
+
+    def _array_char(self, char: str) -> None:
+        if self._skip_depth:
+            self._skip_char(char)
+        elif char == '"':
+            self.items.append("")
+            self._in_string = True
+        elif char == "]":
+            self.done = True
+        elif char in "[{":
+            self._skip_depth = 1
+
+    def _skip_char(self, char: str) -> None:
+        # Inside an object or nested array: track depth, ignoring brackets in strings
+        if self._skip_in_string:
+            if self._skip_escape:
+                self._skip_escape = False
+            elif char == "\\":
+                self._skip_escape = True
+            elif char == '"':
+                self._skip_in_string = False
+        elif char == '"':
+            self._skip_in_string = True
+        elif char in "[{":
+            self._skip_depth += 1
+        elif char in "]}":
+            self._skip_depth -= 1
+
+    def _string_char(self, char: str, deltas: List[Delta]) -> None:
+        if self._escape:
+            self._escape += char
+            if self._escape[1] != "u":
+                self._emit(_ESCAPES.get(char, char), deltas)
+                self._escape = ""
+            elif len(self._escape) == 6:
+                self._unicode(chr(int(self._escape[2:], 16)), deltas)
+                self._escape = ""
+        elif char == "\\":
+            self._escape = char
+        elif char == '"':
+            self._in_string = False
+            if self.mode == "string":
+                self.done = True
+        else:
+            self._emit(char, deltas)
+
+    def _unicode(self, char: str, deltas: List[Delta]) -> None:
+        # Characters outside the BMP arrive as two escapes (a surrogate pair)
+        if "\ud800" <= char <= "\udbff":
+            self._high_surrogate = char
+            return
+        if self._high_surrogate and "\udc00" <= char <= "\udfff":
+            pair = (self._high_surrogate + char).encode("utf-16", "surrogatepass")
+            char = pair.decode("utf-16")
+        self._high_surrogate = ""
+        self._emit(char, deltas)
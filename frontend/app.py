@@ -1,5 +1,65 @@
+import hashlib
+import json
+
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+
+BACKEND_URL = "http://127.0.0.1:8000"
+
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """
+    One pooled keep-alive session shared by all reruns and browser tabs
+    """
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+    return session
+
+
+http = get_http_session()
+
+
+def content_hash(data) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def upload_resume(resume_file) -> str:
+    """
+    Upload the PDF once per content hash; later requests send only its ID
+    """
+    pdf_hash = content_hash(resume_file.getvalue())
+    if pdf_hash not in st.session_state.resume_ids:
+        response = http.post(
+            f"{BACKEND_URL}/resumes",
+            files={
+                "file": (resume_file.name, resume_file.getvalue(), "application/pdf")
+            },
+        )
+        response.raise_for_status()
+        st.session_state.resume_ids[pdf_hash] = response.json()["resume_id"]
+    return st.session_state.resume_ids[pdf_hash]
+
+
+def iter_sse(response):
+    """
+    Yield (event, data) pairs from a server-sent-events response
+    """
+    event, data_lines = None, []
+    for line in response.iter_lines(decode_unicode=True):
+        if not line:
+            if event and data_lines:
+                yield event, json.loads("\n".join(data_lines))
+            event, data_lines = None, []
+        elif line.startswith("event:"):
+            event = line[len("event:") :].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:") :].strip())
+
 
 # -------------------------------
 # Initialize Session State
@@ -12,6 +72,18 @@ if "result" not in st.session_state:
     st.session_state.result = None
 if "show_bullet_rewriter" not in st.session_state:
     st.session_state.show_bullet_rewriter = False
+# PDF content hash -> backend resume_id
+if "resume_ids" not in st.session_state:
+    st.session_state.resume_ids = {}
+# (PDF hash, JD hash) -> /match result
+if "match_results" not in st.session_state:
+    st.session_state.match_results = {}
+# (bullet, JD, resume context) hash -> rewritten bullet
+if "rewrites" not in st.session_state:
+    st.session_state.rewrites = {}
+# (PDF hash, JD) hash -> streamed suggestions
+if "suggestions" not in st.session_state:
+    st.session_state.suggestions = {}
 
 # -------------------------------
 # Page Title & Description
@@ -53,31 +125,84 @@ if st.button("🔍 Analyze Fit"):
     if not st.session_state.jd_text.strip() or not st.session_state.resume_file:
         st.error("Please provide both job description and resume.")
     else:
-        with st.spinner("🧠 Analyzing with Gemini 2.5 Flash..."):
+        cache_key = (
+            content_hash(st.session_state.resume_file.getvalue()),
+            content_hash(st.session_state.jd_text.strip()),
+        )
+        cached = st.session_state.match_results.get(cache_key)
+        if cached is not None:
+            # Same resume and JD as an earlier analysis: no backend round-trip
+            st.session_state.result = cached
+            st.success(
+                f"✅ Analysis complete! Match Score: **{cached.get('overall_score', 'N/A')}%**"
+            )
+        else:
+            # Stream per-stage results so the parsed resume and job summary
+            # show up while the LLM match is still running
+            status = st.empty()
+            resume_preview = st.empty()
+            jd_preview = st.empty()
+            status.info("🧠 Analyzing with Gemini 2.5 Flash... extracting resume text")
+            st.session_state.result = None
             try:
-                response = requests.post(
-                    "http://127.0.0.1:8000/match",
-                    data={"jd_text": st.session_state.jd_text},
-                    files={
-                        "resume_file": (
-                            st.session_state.resume_file.name,
-                            st.session_state.resume_file.read(),
-                            "application/pdf",
-                        )
-                    },
+                resume_id = upload_resume(st.session_state.resume_file)
+                response = http.post(
+                    f"{BACKEND_URL}/match/stream",
+                    data={"jd_text": st.session_state.jd_text, "resume_id": resume_id},
+                    stream=True,
                 )
+                if response.status_code == 404:
+                    # Backend lost the stored file (e.g. fresh container): upload again
+                    response.close()
+                    st.session_state.resume_ids.clear()
+                    resume_id = upload_resume(st.session_state.resume_file)
+                    response = http.post(
+                        f"{BACKEND_URL}/match/stream",
+                        data={
+                            "jd_text": st.session_state.jd_text,
+                            "resume_id": resume_id,
+                        },
+                        stream=True,
+                    )
 
                 if response.status_code == 200:
-                    result = response.json()
-                    st.session_state.result = result
-                    st.success(
-                        f"✅ Analysis complete! Match Score: **{result.get('overall_score', 'N/A')}%**"
-                    )
+                    for event, data in iter_sse(response):
+                        if event == "extracted":
+                            status.info(
+                                f"🧠 Extracted {data['characters']} characters, parsing with Gemini..."
+                            )
+                        elif event == "resume_parsed":
+                            with resume_preview.container():
+                                st.markdown("#### 👤 Parsed Resume")
+                                st.json(data["parsed_resume"], expanded=False)
+                        elif event == "jd_parsed":
+                            with jd_preview.container():
+                                st.markdown("#### 📋 Job Requirements")
+                                st.json(data["job_summary"], expanded=False)
+                            status.info("🧠 Comparing resume to job description...")
+                        elif event == "matched":
+                            status.info("📊 Calculating match score...")
+                        elif event in ("result", "error"):
+                            st.session_state.result = data
+
+                    # Full results are rendered below
+                    status.empty()
+                    resume_preview.empty()
+                    jd_preview.empty()
+                    result = st.session_state.result
+                    if result and "error" not in result:
+                        # Only successful analyses are reused
+                        st.session_state.match_results[cache_key] = result
+                        st.success(
+                            f"✅ Analysis complete! Match Score: **{result.get('overall_score', 'N/A')}%**"
+                        )
                 else:
+                    status.empty()
                     st.error(f"❌ Analysis failed: {response.status_code}")
                     st.code(response.text)
 
             except Exception as e:
+                status.empty()
                 st.error(f"❌ Request failed: {str(e)}")
 
 # -------------------------------
@@ -95,6 +220,11 @@ if st.session_state.result:
 
         # Match Score
         st.metric("Match Score", f"{result.get('overall_score', 0)}%")
+        if result.get("tier") == "local":
+            st.caption(
+                f"⚡ Scored locally ({result.get('tier_reason', 'clear result')}); "
+                "Gemini review was not needed."
+            )
 
         # Experience
         parsed_resume = result.get("parsed_resume", {})
@@ -184,6 +314,53 @@ if st.session_state.result:
             else:
                 st.json(raw_feedback)
 
+        # -------------------------------
+        # More Suggestions (streamed)
+        # -------------------------------
+        if st.session_state.resume_file and st.button("✨ Suggest Bullet Points to Add"):
+            suggestions_key = content_hash(
+                json.dumps(
+                    [
+                        content_hash(st.session_state.resume_file.getvalue()),
+                        st.session_state.jd_text,
+                    ]
+                )
+            )
+            if suggestions_key not in st.session_state.suggestions:
+                live = st.empty()
+                live.info("✨ Writing suggestions...")
+                try:
+                    response = http.post(
+                        f"{BACKEND_URL}/suggestions/stream",
+                        data={
+                            "jd_text": st.session_state.jd_text,
+                            "resume_id": upload_resume(st.session_state.resume_file),
+                        },
+                        stream=True,
+                    )
+                    if response.status_code == 200:
+                        partial = {}
+                        for event, data in iter_sse(response):
+                            if event == "delta":
+                                index = data["index"]
+                                partial[index] = partial.get(index, "") + data["delta"]
+                                live.markdown(
+                                    "\n\n".join(partial[i] for i in sorted(partial)) + "▌"
+                                )
+                            elif event == "result":
+                                st.session_state.suggestions[suggestions_key] = data[
+                                    "suggestions"
+                                ]
+                            elif event == "error":
+                                st.error(data.get("error", "AI suggestion failed"))
+                    else:
+                        st.error(f"❌ Suggestions failed: {response.status_code}")
+                except Exception as e:
+                    st.error(f"❌ Request failed: {str(e)}")
+                live.empty()
+            for suggestion in st.session_state.suggestions.get(suggestions_key, []):
+                st.markdown(f"- {suggestion.lstrip('•').strip()}")
+
         # Debug: View parsed data
         with st.expander("🔍 View Parsed Resume (Debug)"):
             st.json(parsed_resume)
@@ -213,35 +390,59 @@ if st.session_state.show_bullet_rewriter:
         if not bullet_input.strip():
             st.warning("Please enter a bullet point.")
         else:
-            with st.spinner("🔄 Rewriting with Gemini 2.5 Flash..."):
+            # Prepare resume context
+            resume_context = ""
+            if st.session_state.result:
+                achievements = st.session_state.result.get("parsed_resume", {}).get(
+                    "key_projects_or_achievements", []
+                )
+                if achievements:
+                    resume_context = " ".join(achievements[:2])
+
+            rewrite_key = content_hash(
+                json.dumps([bullet_input, st.session_state.jd_text, resume_context])
+            )
+            rewritten = st.session_state.rewrites.get(rewrite_key)
+            if rewritten is None:
+                live = st.empty()
+                live.info("🔄 Rewriting with Gemini 2.5 Flash...")
                 try:
-                    # Prepare resume context
-                    resume_context = ""
-                    if st.session_state.result:
-                        achievements = st.session_state.result.get(
-                            "parsed_resume", {}
-                        ).get("key_projects_or_achievements", [])
-                        if achievements:
-                            resume_context = " ".join(achievements[:2])
-
-                    # Call backend
-                    response = requests.post(
-                        "http://127.0.0.1:8000/rewrite-bullet",
+                    # Stream the rewrite and show it as it is written
+                    response = http.post(
+                        f"{BACKEND_URL}/rewrite-bullet/stream",
                         data={
                             "bullet": bullet_input,
                             "jd_text": st.session_state.jd_text,
                             "resume_text": resume_context,
+                            # Context for locally scored matches (no parsed achievements)
+                            "resume_id": upload_resume(st.session_state.resume_file)
+                            if st.session_state.resume_file
+                            else None,
                         },
+                        stream=True,
                     )
 
                     if response.status_code == 200:
-                        rewritten = response.json().get("rewritten", "No suggestion")
-                        st.markdown("### ✅ Improved Bullet")
-                        st.markdown(f"{rewritten}")
-                        st.code(rewritten)  # Easy to copy
+                        partial = ""
+                        for event, data in iter_sse(response):
+                            if event == "delta":
+                                partial += data["delta"]
+                                live.markdown(f"### ✅ Improved Bullet\n\n• {partial}▌")
+                            elif event == "result":
+                                rewritten = data.get("rewritten", "No suggestion")
+                                st.session_state.rewrites[rewrite_key] = rewritten
+                            elif event == "error":
+                                st.error("Failed to rewrite bullet.")
+                                st.code(data.get("error", ""))
                     else:
                         st.error("Failed to rewrite bullet.")
                         st.code(response.text)
 
                 except Exception as e:
                     st.error(f"Error: {str(e)}")
+                live.empty()
+
+            if rewritten is not None:
+                st.markdown("### ✅ Improved Bullet")
+                st.markdown(f"{rewritten}")
+                st.code(rewritten)  # Easy to copy